@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark email extraction on large and adversarial bodies.
+
+Times company and key point extraction for each body in a synthetic corpus,
+with the compiled rule engine and (for bodies up to --legacy-max-chars) with
+the per-pattern regexes it replaced, which backtrack badly on some inputs.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_extraction.py \
+        [--sizes 2000 8000 100000] [--legacy-max-chars 8000]
+"""
+
+import argparse
+import logging
+import re
+import statistics
+import time
+
+from job_tracker.email_extraction import extract_body_key_points, extract_company
+
+REALISTIC = """Hi Sam,
+
+Thank you for your application for the Senior Backend Engineer role. Your
+interview has been scheduled for March 14th, 2026 at 10:30 AM.
+We'd like to meet on Tuesday, March 14 for a call with the team.
+Next steps will be a technical screen with two engineers.
+Please confirm your availability by replying to this email.
+
+Best,
+Jane Doe
+Acme Robotics, Inc.
+"""
+
+# The patterns extraction used before the rule engine (the invalid "(?-)"
+# group removed so they compile)
+LEGACY_COMPANY_PATTERNS = [
+    r"(?i)(?:^|\n).*?([A-Z][A-Za-z0-9\s&]+)(?:\n|$).*?"
+    r"(?:Inc\.|LLC|Ltd\.|Limited|Corp\.|Corporation)",
+    r"(?i)(?:work|working) (?:at|for|with) ([A-Z][A-Za-z0-9\s&]+)",
+    r"(?i)(?:behalf|representative) of ([A-Z][A-Za-z0-9\s&]+)",
+]
+LEGACY_KEY_POINT_PATTERNS = [
+    r"(?:interview|meeting|call|discussion)(?:.*?)(?:scheduled|planned|arranged|set up)"
+    r"(?:.*?)(?:on|for) ([A-Za-z]+\s+\d+(?:st|nd|rd|th)?(?:,?\s+\d{4})?"
+    r"(?:\s+at\s+\d+(?::\d+)?(?:\s*[AP]M)?)?)",
+    r"(\d{1,2}(?::\d{2})?\s*[AP]M\s*(?:EST|CST|MST|PST|EDT|CDT|MDT|PDT)?)(?:.*?)"
+    r"(?:interview|meeting|call|discussion)",
+    r"([A-Za-z]+day,?\s+[A-Za-z]+\s+\d+(?:st|nd|rd|th)?(?:,?\s+\d{4})?)",
+    r"(?:position|role|job)(?: for| of)? ([^.,;]+?)(?:\.|\n|,|;)",
+    r"(?:applying|application|candidacy)(?: for| to)? ([^.,;]+?)(?:\.|\n|,|;)",
+    r"(?:next steps?|follow(?:-| )up)(?: will be| is| are)? ([^.,;]+?)(?:\.|\n|,|;)",
+    r"(?:looking forward to|please|kindly) "
+    r"([^.,;]*?(?:schedule|confirm|respond|reply|review|send|submit)[^.,;]*?)"
+    r"(?:\.|\n|,|;)",
+]
+
+
+def build_corpus(size: int) -> dict:
+    """Bodies of about size characters each."""
+
+    def fill(text: str) -> str:
+        return text * max(size // len(text), 1)
+
+    return {
+        "realistic": fill(REALISTIC),
+        "capitalized lines": fill("Quarterly Update From The Team\n"),
+        "letters then day": "a" * size + "day",
+        "unterminated role": "role " + fill("word "),
+        "repeated interview": fill("interview "),
+        "repeated please": fill("please "),
+        "digits": "1" * size,
+    }
+
+
+def time_call(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run_engine(body: str):
+    extract_company(body, body[:200])
+    extract_body_key_points(body)
+
+
+def run_legacy(body: str):
+    for pattern in LEGACY_COMPANY_PATTERNS + LEGACY_KEY_POINT_PATTERNS:
+        re.findall(pattern, body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 8000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy-max-chars", type=int, default=8000)
+    args = parser.parse_args()
+    # Budget overruns are expected on the adversarial bodies
+    logging.disable(logging.WARNING)
+
+    print(f"{'body':>20} {'chars':>8} {'engine ms':>10} {'legacy ms':>10}")
+    for size in args.sizes:
+        for name, body in build_corpus(size).items():
+            engine = time_call(lambda: run_engine(body), args.repeat)
+            if len(body) <= args.legacy_max_chars:
+                legacy = (
+                    f"{time_call(lambda: run_legacy(body), args.repeat) * 1000:>10.1f}"
+                )
+            else:
+                legacy = f"{'skipped':>10}"
+            print(f"{name:>20} {len(body):>8} {engine * 1000:>10.1f} {legacy}")
+
+
+if __name__ == "__main__":
+    main()
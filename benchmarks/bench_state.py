@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark state loading and saving.
+
+Builds a state document with the given number of interactions spread over
+a fixed number of companies, then times StateManager startup (load plus one
+company lookup) and a single update for each backend, codec and load mode.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_state.py \
+        [--sizes 1000 10000 100000] [--companies 500]
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from job_tracker import state_codec
+from job_tracker.state import StateManager
+
+BACKEND_FILES = {"json": "state.json", "sqlite": "state.db", "eventlog": "state.log"}
+
+
+def build_document(interactions: int, companies: int) -> dict:
+    per_company = max(interactions // companies, 1)
+    document = {"version": "1.0", "companies": {}, "stats": {}, "settings": {}}
+    for c in range(companies):
+        document["companies"][f"Company {c}"] = {
+            "created_at": "2025-01-01T00:00:00",
+            "status": "Applied",
+            "last_interaction": "email",
+            "last_interaction_date": "2025-01-01",
+            "interactions": [
+                {
+                    "type": "email",
+                    "date": f"2025-01-{i % 28 + 1:02d}",
+                    "details": f"Subject line {i}",
+                }
+                for i in range(per_company)
+            ],
+        }
+    return document
+
+
+def open_state(state_dir: str, backend: str, lazy: bool) -> StateManager:
+    # Keep the full history hot so load time reflects the document size
+    return StateManager(
+        os.path.join(state_dir, BACKEND_FILES[backend]),
+        backend=backend,
+        max_interactions=0,
+        lazy_load=lazy,
+    )
+
+
+def bench(document: dict, backend: str, lazy: bool, repeat: int):
+    state_dir = tempfile.mkdtemp(prefix="bench-state-")
+    try:
+        with open(os.path.join(state_dir, "state.json"), "w") as f:
+            json.dump(document, f)
+        # First open migrates the JSON document into the backend's format
+        state = open_state(state_dir, backend, lazy)
+        if backend == "eventlog":
+            state.backend.compact(state.state)
+        state.close()
+
+        load_times = []
+        save_times = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            state = open_state(state_dir, backend, lazy)
+            state.get_company_state("Company 0")
+            load_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            state.update_company_state(
+                "Company 1",
+                {
+                    "last_interaction": "call",
+                    "last_interaction_date": f"2025-02-{i + 1:02d}",
+                },
+            )
+            save_times.append(time.perf_counter() - start)
+            state.close()
+        return statistics.median(load_times), statistics.median(save_times)
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    have_orjson = state_codec.orjson is not None
+    codecs = ["orjson", "json"] if have_orjson else ["json"]
+    print(
+        f"{'interactions':>12} {'backend':>9} {'codec':>7} {'mode':>6} "
+        f"{'load ms':>9} {'save ms':>9}"
+    )
+    for size in args.sizes:
+        document = build_document(size, args.companies)
+        for backend in BACKEND_FILES:
+            for codec in codecs:
+                state_codec.orjson = __import__("orjson") if codec == "orjson" else None
+                for lazy in [False, True] if backend != "json" else [False]:
+                    load, save = bench(document, backend, lazy, args.repeat)
+                    mode = "lazy" if lazy else "eager"
+                    print(
+                        f"{size:>12} {backend:>9} {codec:>7} {mode:>6} "
+                        f"{load * 1000:>9.1f} {save * 1000:>9.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -92,7 +92,8 @@ if [ ! -f .env ]; then
     cat > .env << EOF
 # Notion Configuration (REQUIRED)
 NOTION_API_TOKEN=  # REQUIRED: Your Notion API token
-NOTION_PAGE_ID=  # Optional: Parent page ID
+NOTION_PAGE_ID=  # Parent page of the job applications database (needed unless NOTION_DATABASE_ID is set)
+NOTION_DATABASE_ID=  # Optional: Job applications database (found or created under NOTION_PAGE_ID if empty)
 
 # Gmail Configuration (REQUIRED)
 GMAIL_MCP_PATH=@gongrzhe/server-gmail-autoauth-mcp
@@ -327,6 +328,7 @@ echo "--------------------------------"
 echo "Next steps:"
 echo "1. Edit the .env file to set REQUIRED values:"
 echo "   - NOTION_API_TOKEN (from Notion Integrations page)"
+echo "   - NOTION_PAGE_ID or NOTION_DATABASE_ID (where company pages are created)"
 echo "   - GMAIL_CREDENTIALS_PATH (path to your Google credentials.json)"
 echo "   - Ensure AUDIO_MCP_PATH is set correctly"
 echo "2. Run the application using Poetry:"
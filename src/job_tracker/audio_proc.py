@@ -13,67 +13,39 @@ import re
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-import whisper  # For transcription
-from mcp import ClientSession
-from mcp.client.stdio import stdio_client
-from mcp.types import Tool
+from job_tracker.mcp_client import MCPClient, MCPSessionManager
 
 logger = logging.getLogger("job-tracker.audio")
 
-class AudioProcessor:
+class AudioProcessor(MCPClient):
     """Handles audio recording and processing for job interview calls."""
     
-    def __init__(self):
-        """Initialize the audio processor."""
-        self.session = None
-        self.exit_stack = None
-        self.audio_mcp_path = os.environ.get("AUDIO_MCP_PATH", "audio-mcp-server")
+    def __init__(self, manager: Optional[MCPSessionManager] = None):
+        """
+        Initialize the audio processor.
+
+        Args:
+            manager: Shared MCP session manager (a private one is created if omitted)
+        """
+        super().__init__(manager)
+        self.server_key = "audio"
         self.transcription_model = None
         self.last_recording_path = None
         
-        # Initialize whisper model for transcription (load small model by default)
+        # Whisper model used for transcription (small by default); the model and
+        # the torch stack behind it are only imported when transcription runs
         self.model_name = os.environ.get("WHISPER_MODEL", "small")
         logger.info(f"Initializing Whisper with model: {self.model_name}")
     
-    async def connect(self):
-        """Connect to the Audio MCP server."""
-        try:
-            # Setup Audio MCP server connection
-            logger.info("Connecting to Audio MCP server...")
-            
-            # Using async with to properly handle the context manager
-            async with stdio_client(self.audio_mcp_path) as session:
-                self.session = session
-                
-                # Verify connection by listing available devices
-                devices = await self.list_audio_devices()
-                if devices:
-                    logger.info(f"Connected to Audio MCP server, found {len(devices)} audio devices")
-                    return True
-                else:
-                    logger.error("Connected to Audio MCP server but no audio devices found")
-                    return False
-                    
-        except Exception as e:
-            logger.error(f"Failed to connect to Audio MCP server: {e}")
-            return False
-    
-    async def disconnect(self):
-        """Disconnect from the Audio MCP server."""
-        if self.session:
-            await self.session.aclose()
-            self.session = None
-            logger.info("Disconnected from Audio MCP server")
-    
     async def list_audio_devices(self) -> List[Dict[str, Any]]:
         """List available audio input/output devices."""
-        if not self.session:
+        if not await self.ensure_connected():
             logger.error("Not connected to Audio MCP server")
             return []
         
         try:
             # Call the list_devices tool from the Audio MCP server
-            result = await self.session.invoke_tool("list_devices")
+            result = await self.invoke_tool("list_devices")
             return result.get("devices", [])
         except Exception as e:
             logger.error(f"Failed to list audio devices: {e}")
@@ -90,7 +62,7 @@ class AudioProcessor:
         Returns:
             bool: True if recording started successfully
         """
-        if not self.session:
+        if not await self.ensure_connected():
             logger.error("Not connected to Audio MCP server")
             return False
         
@@ -113,7 +85,7 @@ class AudioProcessor:
                 "channels": 1
             }
             
-            result = await self.session.invoke_tool("record_audio", recording_params)
+            result = await self.invoke_tool("record_audio", recording_params)
             
             # Check if recording started successfully
             if result.get("status") == "recording":
@@ -134,12 +106,12 @@ class AudioProcessor:
         Returns:
             str: Path to recording file or None if not available
         """
-        if not self.session:
+        if not await self.ensure_connected():
             logger.error("Not connected to Audio MCP server")
             return None
         
         try:
-            result = await self.session.invoke_tool("get_recording_path")
+            result = await self.invoke_tool("get_recording_path")
             self.last_recording_path = result.get("path")
             return self.last_recording_path
         except Exception as e:
@@ -168,7 +140,7 @@ class AudioProcessor:
         try:
             # Load whisper model lazily (only when needed)
             if self.transcription_model is None:
-                self.transcription_model = whisper.load_model(self.model_name)
+                self.transcription_model = self._load_transcription_model()
             
             # Perform transcription
             result = self.transcription_model.transcribe(audio_path)
@@ -186,6 +158,12 @@ class AudioProcessor:
             logger.error(f"Transcription failed: {e}")
             return f"Transcription error: {str(e)}"
     
+    def _load_transcription_model(self):
+        """Import whisper and load the configured model."""
+        import whisper  # Deferred: pulls in torch, which dominates CLI startup
+
+        return whisper.load_model(self.model_name)
+    
     async def extract_company_name(self, transcript: str) -> Optional[str]:
         """
         Attempt to extract company name from the transcript.
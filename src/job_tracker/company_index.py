@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Company index for JobTracker application.
+Maps normalized company names to Notion page IDs, with trigram fuzzy matching,
+so page lookups don't need a Notion search.
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+logger = logging.getLogger("job-tracker.company-index")
+
+# Trailing words that don't distinguish one company from another
+LEGAL_SUFFIXES = {
+    "inc",
+    "incorporated",
+    "llc",
+    "ltd",
+    "limited",
+    "corp",
+    "corporation",
+    "co",
+    "company",
+    "org",
+    "plc",
+    "gmbh",
+    "ag",
+    "sa",
+    "group",
+    "holdings",
+}
+
+# Legal forms, the only suffixes company_identity_key drops: "Acme Inc" is
+# the same company as "Acme", while "Acme Group" and "Acme Co" may not be
+LEGAL_FORM_SUFFIXES = {
+    "inc",
+    "incorporated",
+    "llc",
+    "ltd",
+    "limited",
+    "corp",
+    "corporation",
+    "plc",
+    "gmbh",
+    "ag",
+    "sa",
+}
+
+# Minimum trigram similarity for a fuzzy match
+DEFAULT_FUZZY_THRESHOLD = 0.6
+
+NON_WORD_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normalize a company name for matching.
+
+    Lowercases, drops punctuation and trailing legal suffixes, so "Acme, Inc.",
+    "Acme Org" and "acme" all normalize to "acme".
+
+    Args:
+        name: Company name as written anywhere
+
+    Returns:
+        Normalized name (empty if nothing is left)
+    """
+    return _strip_suffixes(name, LEGAL_SUFFIXES)
+
+
+def company_identity_key(name: str) -> str:
+    """
+    Normalize a company name conservatively, for deciding that two names
+    are the same company.
+
+    Like normalize_company_name, but only legal forms are dropped, so
+    "Acme, Inc." and "acme" share a key while "Acme Group" keeps its own.
+
+    Args:
+        name: Company name as written anywhere
+
+    Returns:
+        Normalized name (empty if nothing is left)
+    """
+    return _strip_suffixes(name, LEGAL_FORM_SUFFIXES)
+
+
+def _strip_suffixes(name: str, suffixes: Set[str]) -> str:
+    words = NON_WORD_PATTERN.sub(" ", name.lower().replace("&", " and ")).split()
+    while len(words) > 1 and words[-1] in suffixes:
+        words.pop()
+    return " ".join(words)
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a normalized name, padded at word boundaries."""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class CompanyPageIndex:
+    """Persistent map of normalized company names to Notion page IDs."""
+
+    def __init__(
+        self, index_file: str = None, fuzzy_threshold: float = DEFAULT_FUZZY_THRESHOLD
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            index_file: Path to the index file
+                (default: ~/.job-tracker/company_index.json)
+            fuzzy_threshold: Minimum trigram similarity for a fuzzy match
+        """
+        if not index_file:
+            index_file = os.path.join(
+                os.path.expanduser("~"), ".job-tracker", "company_index.json"
+            )
+        self.index_file = index_file
+        self.fuzzy_threshold = fuzzy_threshold
+        self.seeded_at: Optional[str] = None
+
+        # normalized name -> {"page_id": ..., "name": ...}
+        self.pages: Dict[str, Dict[str, str]] = {}
+        # raw name -> page ID, so repeat lookups skip normalization
+        self._resolved: Dict[str, str] = {}
+        # trigram -> normalized names containing it
+        self._postings: Dict[str, Set[str]] = {}
+
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading company index from {self.index_file}: {e}")
+            return
+        self.seeded_at = data.get("seeded_at")
+        for key, entry in data.get("pages", {}).items():
+            self._insert(key, entry)
+
+    def save(self):
+        """Write the index to disk."""
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            temp_file = f"{self.index_file}.tmp"
+            with open(temp_file, "w") as f:
+                json.dump({"seeded_at": self.seeded_at, "pages": self.pages}, f)
+            os.replace(temp_file, self.index_file)
+        except Exception as e:
+            logger.error(f"Error saving company index to {self.index_file}: {e}")
+
+    def _insert(self, key: str, entry: Dict[str, str]):
+        self.pages[key] = entry
+        for gram in trigrams(key):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def _remove(self, key: str):
+        self.pages.pop(key, None)
+        for gram in trigrams(key):
+            names = self._postings.get(gram)
+            if names:
+                names.discard(key)
+                if not names:
+                    del self._postings[gram]
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def lookup(self, company_name: str) -> Optional[str]:
+        """
+        Get the page ID for a company.
+
+        Args:
+            company_name: Company name in any spelling
+
+        Returns:
+            Page ID of the exact or best fuzzy match, or None
+        """
+        page_id = self._resolved.get(company_name)
+        if page_id is not None:
+            return page_id
+
+        key = normalize_company_name(company_name)
+        entry = self.pages.get(key)
+        if entry is None:
+            match = self.fuzzy_match(key)
+            if match is None:
+                return None
+            entry = self.pages[match[0]]
+            logger.info(
+                f"Fuzzy matched '{company_name}' to '{entry['name']}' ({match[1]:.2f})"
+            )
+
+        self._resolved[company_name] = entry["page_id"]
+        return entry["page_id"]
+
+    def fuzzy_match(self, key: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the indexed name most similar to a normalized name.
+
+        Args:
+            key: Normalized company name
+
+        Returns:
+            (normalized name, Jaccard similarity of trigrams) above the
+            threshold, or None
+        """
+        grams = trigrams(key)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._postings.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        best, best_score = None, 0.0
+        for candidate, count in shared.items():
+            score = count / (len(grams) + len(trigrams(candidate)) - count)
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is None or best_score < self.fuzzy_threshold:
+            return None
+        return best, best_score
+
+    def add(self, company_name: str, page_id: str, save: bool = True):
+        """
+        Record the page for a company.
+
+        Args:
+            company_name: Company name
+            page_id: Notion page ID
+            save: Write the index to disk immediately
+        """
+        key = normalize_company_name(company_name)
+        if not key:
+            return
+        if key in self.pages:
+            self._remove(key)
+        self._insert(key, {"page_id": page_id, "name": company_name})
+        # Drop memoized lookups that may now resolve differently
+        self._resolved.clear()
+        if save:
+            self.save()
+
+    def remove(self, company_name: str):
+        """
+        Forget a company (e.g. after its page was deleted).
+
+        Args:
+            company_name: Company name
+        """
+        self._remove(normalize_company_name(company_name))
+        self._resolved.clear()
+        self.save()
+
+    def mark_seeded(self):
+        """Record that the index was seeded from the Notion database and save it."""
+        self.seeded_at = datetime.now().isoformat()
+        self.save()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Email cache for JobTracker application.
+Keeps fetched Gmail messages on disk keyed by message ID, so messages that
+were already seen are never downloaded again. Next to each message it keeps
+a status marker recording what sync did with it ("processed", "skipped",
+or "rejected" by triage), separately from whether the body is cached.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("job-tracker.email-cache")
+
+# Messages kept in memory in addition to the disk cache
+DEFAULT_MEMORY_SIZE = 256
+
+UNSAFE_ID_PATTERN = re.compile(r"[^A-Za-z0-9_-]")
+
+
+class EmailCache:
+    """Disk-backed cache of full messages keyed by Gmail message ID."""
+
+    def __init__(self, cache_dir: str = None, memory_size: int = DEFAULT_MEMORY_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache files (default: ~/.job-tracker/email_cache)
+            memory_size: Number of recently used messages kept in memory
+        """
+        if not cache_dir:
+            cache_dir = os.path.join(
+                os.path.expanduser("~"), ".job-tracker", "email_cache"
+            )
+        self.cache_dir = cache_dir
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _path(self, message_id: str, suffix: str = ".json") -> str:
+        safe_id = UNSAFE_ID_PATTERN.sub("_", message_id)
+        # Shard by prefix so a large mailbox doesn't put everything in one directory
+        return os.path.join(self.cache_dir, safe_id[:2], f"{safe_id}{suffix}")
+
+    def _remember(self, message_id: str, email: Dict[str, Any]):
+        self._memory[message_id] = email
+        self._memory.move_to_end(message_id)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached message.
+
+        Args:
+            message_id: Gmail message ID
+
+        Returns:
+            The message, or None if it isn't cached
+        """
+        email = self._memory.get(message_id)
+        if email is not None:
+            self._memory.move_to_end(message_id)
+            return email
+
+        try:
+            with open(self._path(message_id), "r") as f:
+                email = json.load(f).get("email")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable email cache entry {message_id}: {e}")
+            return None
+        if email is not None:
+            self._remember(message_id, email)
+        return email
+
+    def __contains__(self, message_id: str) -> bool:
+        return message_id in self._memory or os.path.exists(self._path(message_id))
+
+    def put(self, message_id: str, email: Dict[str, Any]):
+        """
+        Store a message in memory and on disk.
+
+        Args:
+            message_id: Gmail message ID
+            email: Message data
+        """
+        self._remember(message_id, email)
+        path = self._path(message_id)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_file = f"{path}.tmp"
+            with open(temp_file, "w") as f:
+                json.dump({"fetched_at": time.time(), "email": email}, f)
+            os.replace(temp_file, path)
+        except Exception as e:
+            logger.error(f"Error writing email cache entry {message_id}: {e}")
+
+    def status(self, message_id: str) -> Optional[str]:
+        """
+        Get what sync did with a message.
+
+        Args:
+            message_id: Gmail message ID
+
+        Returns:
+            The marker set with mark(), or None if the message wasn't handled
+        """
+        try:
+            with open(self._path(message_id, ".status"), "r") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable status marker {message_id}: {e}")
+            return None
+
+    def mark(self, message_id: str, status: str):
+        """
+        Record what sync did with a message: "processed", "skipped" (handled
+        but not job mail) or "rejected" (triaged out without downloading).
+
+        Args:
+            message_id: Gmail message ID
+            status: Marker to store
+        """
+        path = self._path(message_id, ".status")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_file = f"{path}.tmp"
+            with open(temp_file, "w") as f:
+                f.write(status)
+            os.replace(temp_file, path)
+        except Exception as e:
+            logger.error(f"Error writing status marker {message_id}: {e}")
+
+    def discard(self, message_id: str):
+        """
+        Drop a cached message but keep its status marker (e.g. after its
+        labels changed on the server).
+
+        Args:
+            message_id: Gmail message ID
+        """
+        self._memory.pop(message_id, None)
+        try:
+            os.remove(self._path(message_id))
+        except FileNotFoundError:
+            pass
+
+    def invalidate(self, message_id: str):
+        """
+        Drop a message and its status marker, so sync handles it again.
+
+        Args:
+            message_id: Gmail message ID
+        """
+        self.discard(message_id)
+        try:
+            os.remove(self._path(message_id, ".status"))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Rule-based extraction of company names and key points from emails.
+
+All rules are compiled once, at import. A scan runs every rule over the
+body chunk by chunk, each rule independently, so one rule's match never
+hides another's inside the same text. Every rule is bounded (no unbounded
+wildcards between literals), which keeps matching linear in the body
+length, and a scan stops once its time budget is spent.
+"""
+
+import logging
+import os
+import re
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger("job-tracker.extraction")
+
+# Seconds one message may spend in a scan before extraction stops early
+DEFAULT_TIME_BUDGET = (
+    float(os.environ.get("JOB_TRACKER_EXTRACTION_BUDGET_MS", "50")) / 1000
+)
+
+# Longest stretch of a body that is scanned (key points sit near the top)
+MAX_SCAN_CHARS = 100_000
+
+# Scans run in chunks so the time budget is checked regularly; each chunk
+# looks ahead further than any rule can match
+SCAN_CHUNK_CHARS = 4096
+MAX_MATCH_CHARS = 512
+
+# Longest captured phrase (a position title, a next step)
+PHRASE = r"[^.,;\n]{1,120}"
+
+# A company name: up to five capitalized words
+COMPANY = r"[A-Z][A-Za-z0-9&'-]{0,30}(?:[ \t]{1,3}(?:&|[A-Z][A-Za-z0-9&'-]{0,30})){0,4}"
+
+MONTH_DATE = r"[A-Za-z]{3,9}\s{1,3}\d{1,2}(?:st|nd|rd|th)?(?:,?\s{1,3}\d{4})?"
+CLOCK_TIME = r"\d{1,2}(?::\d{2})?\s{0,3}[AP]M"
+TIME_ZONE = r"(?:EST|CST|MST|PST|EDT|CDT|MDT|PDT)"
+MEETING = r"(?i:interview|meeting|call|discussion)"
+SUBJECT_TOPIC = r"(?i:position|role|opportunity|application|interview)"
+
+
+class Rule(NamedTuple):
+    """
+    An extraction rule.
+
+    The pattern captures the extracted value in the group named "value";
+    min_length drops captures that are too short to be useful.
+    """
+
+    name: str
+    label: str
+    pattern: str
+    min_length: int = 0
+
+
+class RuleSet:
+    """Precompiled rules scanned together, chunk by chunk."""
+
+    def __init__(self, rules: List[Rule], flags: int = 0):
+        self.rules = {rule.name: rule for rule in rules}
+        self.patterns = [(rule, re.compile(rule.pattern, flags)) for rule in rules]
+
+    def scan(
+        self, text: str, budget: float = DEFAULT_TIME_BUDGET
+    ) -> Iterator[Tuple[Rule, str]]:
+        """
+        Find the matches of every rule, chunk by chunk.
+
+        Each rule matches independently (the same text can match several
+        rules); within a chunk, matches come in rule order.
+
+        Args:
+            text: Text to scan (only its first MAX_SCAN_CHARS characters)
+            budget: Seconds after which the scan stops
+
+        Yields:
+            (rule, stripped value) for each match long enough to keep
+        """
+        deadline = time.perf_counter() + budget
+        end = min(len(text), MAX_SCAN_CHARS)
+        # Where each rule resumes; a match may run past the chunk it started in
+        positions = [0] * len(self.patterns)
+        chunk_start = 0
+        while chunk_start < end:
+            chunk_end = min(chunk_start + SCAN_CHUNK_CHARS, end)
+            window_end = min(chunk_end + MAX_MATCH_CHARS, end)
+            for i, (rule, pattern) in enumerate(self.patterns):
+                next_start = max(positions[i], chunk_end)
+                for match in pattern.finditer(text, positions[i], window_end):
+                    if match.start() >= chunk_end:
+                        # The next chunk finds it again
+                        break
+                    value = match.group("value").strip()
+                    if len(value) > rule.min_length:
+                        yield rule, value
+                    next_start = max(next_start, match.end())
+                positions[i] = next_start
+            chunk_start = chunk_end
+            if chunk_start < end and time.perf_counter() > deadline:
+                logger.warning(
+                    f"Extraction stopped after {budget * 1000:.0f} ms "
+                    f"at offset {chunk_start}"
+                )
+                return
+
+
+KEY_POINT_RULES = RuleSet(
+    [
+        Rule(
+            "scheduled_on",
+            "Scheduled",
+            rf"{MEETING}[^.\n]{{0,80}}?(?i:scheduled|planned|arranged|set up)"
+            rf"[^.\n]{{0,80}}?\b(?:on|for) "
+            rf"(?P<value>{MONTH_DATE}"
+            rf"(?:\s{{1,3}}at\s{{1,3}}\d{{1,2}}(?::\d{{2}})?(?:\s{{0,3}}[AP]M)?)?)",
+        ),
+        Rule(
+            "scheduled_at",
+            "Scheduled",
+            rf"(?P<value>{CLOCK_TIME}(?:\s{{0,3}}{TIME_ZONE})?)[^\n]{{0,80}}?{MEETING}",
+        ),
+        Rule(
+            "scheduled_day",
+            "Scheduled",
+            r"\b(?P<value>(?:Mon|Tues|Wednes|Thurs|Fri|Satur|Sun)day,?"
+            rf"\s{{1,3}}{MONTH_DATE})",
+        ),
+        Rule(
+            "position",
+            "Position",
+            rf"(?i:position|role|job)(?: for| of)? (?P<value>{PHRASE})[.,;\n]",
+            3,
+        ),
+        Rule(
+            "applied_for",
+            "Position",
+            r"(?i:applying|application|candidacy)(?: for| to)? "
+            rf"(?P<value>{PHRASE})[.,;\n]",
+            3,
+        ),
+        Rule(
+            "next_steps",
+            "Next steps",
+            r"(?i:next steps?|follow[- ]up)(?: will be| is| are)? "
+            rf"(?P<value>{PHRASE})[.,;\n]",
+            10,
+        ),
+        Rule(
+            "requested",
+            "Next steps",
+            r"(?i:looking forward to|please|kindly) "
+            r"(?=[^.,;\n]{0,120}?(?:schedule|confirm|respond|reply|review|send|submit))"
+            rf"(?P<value>{PHRASE})[.,;\n]",
+            10,
+        ),
+    ]
+)
+
+# Body rules in order of preference
+COMPANY_BODY_RULES = RuleSet(
+    [
+        Rule(
+            "signature",
+            "Company",
+            rf"^[ \t]{{0,8}}(?P<value>{COMPANY}),?[ \t]{{1,3}}"
+            r"(?:Inc\.?|LLC|Ltd\.?|Limited|Corp\.?|Corporation)[ \t]{0,8}$",
+        ),
+        Rule(
+            "works_at",
+            "Company",
+            rf"(?i:work|working) (?i:at|for|with) (?P<value>{COMPANY})",
+        ),
+        Rule(
+            "on_behalf",
+            "Company",
+            rf"(?i:behalf|representative) of (?P<value>{COMPANY})",
+        ),
+    ],
+    re.MULTILINE,
+)
+
+COMPANY_SUBJECT_RULES = RuleSet(
+    [
+        Rule(
+            "subject_at",
+            "Company",
+            rf"{SUBJECT_TOPIC} (?i:at|with) (?P<value>{COMPANY})",
+        ),
+        Rule(
+            "subject_prefix",
+            "Company",
+            rf"(?P<value>{COMPANY}) {SUBJECT_TOPIC}",
+        ),
+    ]
+)
+
+KEY_POINT_LABELS = ("Scheduled", "Position", "Next steps")
+
+
+def _first_by_preference(rules: RuleSet, text: str, budget: float) -> Optional[str]:
+    found: Dict[str, str] = {}
+    for rule, value in rules.scan(text, budget):
+        found.setdefault(rule.name, value)
+    return next((found[name] for name in rules.rules if name in found), None)
+
+
+def extract_company(
+    body: str, subject: str, budget: float = DEFAULT_TIME_BUDGET
+) -> Optional[str]:
+    """
+    Find a company name in an email's body (signature, "working at ...")
+    or, failing that, its subject.
+
+    Args:
+        body: Email body
+        subject: Email subject
+        budget: Seconds extraction may take
+
+    Returns:
+        Company name or None
+    """
+    start = time.perf_counter()
+    company = _first_by_preference(COMPANY_BODY_RULES, body, budget)
+    if company:
+        return company
+    # The subject gets whatever the body scan left of the budget
+    return _first_by_preference(
+        COMPANY_SUBJECT_RULES, subject, max(budget - (time.perf_counter() - start), 0.0)
+    )
+
+
+def extract_body_key_points(
+    body: str, budget: float = DEFAULT_TIME_BUDGET
+) -> List[str]:
+    """
+    Find scheduled times, positions and next steps in an email body.
+
+    Args:
+        body: Email body
+        budget: Seconds extraction may take
+
+    Returns:
+        Key points like "Position: Senior Engineer", grouped by label
+    """
+    grouped: Dict[str, Dict[str, None]] = {label: {} for label in KEY_POINT_LABELS}
+    for rule, value in KEY_POINT_RULES.scan(body, budget):
+        grouped[rule.label][f"{rule.label}: {value}"] = None
+    return [point for label in KEY_POINT_LABELS for point in grouped[label]]
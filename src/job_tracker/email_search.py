@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Query planning for company email searches in JobTracker application.
+Splits a company search into several compact Gmail queries (keyword groups,
+sender domains) and merges their results into one ranked list.
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Job keywords per query; Gmail slows down on long OR groups
+DEFAULT_KEYWORDS_PER_QUERY = int(os.environ.get("GMAIL_KEYWORDS_PER_QUERY", "7"))
+
+# Search window applied to every planned query
+DEFAULT_SEARCH_WINDOW = "newer_than:3m"
+
+# Ranking weight of a match from each kind of query. The sender query has
+# no keywords, so on its own (e.g. a newsletter from the company) it ranks
+# below any keyword match; together with one it ranks above it
+KEYWORD_QUERY_WEIGHT = 1.0
+SENDER_QUERY_WEIGHT = 0.5
+
+PlannedQuery = Tuple[str, float]
+
+
+def _quote(term: str) -> str:
+    return f'"{term}"' if " " in term or "-" in term else term
+
+
+def _any_of(terms: Iterable[str]) -> str:
+    terms = list(dict.fromkeys(terms))
+    if len(terms) == 1:
+        return terms[0]
+    return "{" + " ".join(terms) + "}"
+
+
+def plan_company_queries(
+    company_names: List[str],
+    keywords: List[str],
+    domains: Iterable[str] = (),
+    keywords_per_query: int = DEFAULT_KEYWORDS_PER_QUERY,
+    window: str = DEFAULT_SEARCH_WINDOW,
+) -> List[PlannedQuery]:
+    """
+    Plan the Gmail queries for a company search.
+
+    Every keyword is covered by one of the keyword queries, each combining
+    the company's names with a group of keywords. Messages from the company
+    (by sender domain or name) are matched without keywords; that match
+    alone ranks below a keyword match, but lifts a keyword match above
+    others.
+
+    Args:
+        company_names: Company name and its aliases
+        keywords: Job keywords
+        domains: Known sender domains of the company
+        keywords_per_query: Keywords per keyword query
+        window: Date restriction added to every query (may be empty)
+
+    Returns:
+        (query, ranking weight) pairs
+    """
+    names = _any_of(_quote(name) for name in company_names if name)
+    suffix = f" {window}" if window else ""
+    queries: List[PlannedQuery] = []
+
+    step = max(keywords_per_query, 1)
+    for start in range(0, len(keywords), step):
+        group = _any_of(_quote(keyword) for keyword in keywords[start : start + step])
+        queries.append((f"{names} {group}{suffix}", KEYWORD_QUERY_WEIGHT))
+
+    senders = [f"@{domain.lstrip('@')}" for domain in domains if domain]
+    senders.extend(_quote(name) for name in company_names if name)
+    queries.append((f"from:{_any_of(senders)}{suffix}", SENDER_QUERY_WEIGHT))
+    return queries
+
+
+def merge_ranked(
+    results: List[Tuple[List[Dict[str, Any]], float]], limit: int
+) -> List[Dict[str, Any]]:
+    """
+    Merge the results of several queries by message ID.
+
+    Messages score the summed weight of the queries that found them; ties
+    keep the best position any query gave them (queries return newest first).
+
+    Args:
+        results: (emails, query weight) per query
+        limit: Maximum number of emails to return
+
+    Returns:
+        Deduplicated emails, best first
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for emails, weight in results:
+        for position, email in enumerate(emails):
+            key = email.get("id") or id(email)
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = {"email": email, "score": weight, "position": position}
+            else:
+                entry["score"] += weight
+                entry["position"] = min(entry["position"], position)
+    ranked = sorted(
+        merged.values(), key=lambda entry: (-entry["score"], entry["position"])
+    )
+    return [entry["email"] for entry in ranked[:limit]]
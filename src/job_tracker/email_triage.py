@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Email triage for JobTracker application.
+Scores a message from its headers and snippet alone, so full bodies are only
+downloaded for messages that look job-related.
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from job_tracker.company_index import normalize_company_name
+
+# Minimum score a message needs for its full body to be fetched
+DEFAULT_TRIAGE_THRESHOLD = float(os.environ.get("GMAIL_TRIAGE_THRESHOLD", "1"))
+
+# Fields a metadata fetch returns
+METADATA_FIELDS = ("id", "from", "subject", "date", "labels", "snippet")
+
+# Score contributions
+SUBJECT_KEYWORD_SCORE = 2.0
+SNIPPET_KEYWORD_SCORE = 1.0
+KNOWN_COMPANY_SCORE = 3.0
+JUNK_LABEL_SCORE = -3.0
+
+# Gmail labels of mail that is almost never about an application
+JUNK_LABELS = frozenset(
+    {"SPAM", "TRASH", "CATEGORY_PROMOTIONS", "CATEGORY_SOCIAL", "CATEGORY_FORUMS"}
+)
+
+SENDER_PATTERN = re.compile(r'^\s*"?([^"<@]*?)"?\s*<?[^<>@\s]*@([^<>\s]+?)>?\s*$')
+
+
+def has_metadata(email_data: Dict[str, Any]) -> bool:
+    """Whether a message summary already carries the headers triage needs."""
+    return bool(email_data.get("subject") or email_data.get("from"))
+
+
+class EmailTriage:
+    """Scores messages for job relevance from metadata."""
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        is_known_company: Optional[Callable[[str], bool]] = None,
+        threshold: float = DEFAULT_TRIAGE_THRESHOLD,
+    ):
+        """
+        Initialize the triage.
+
+        Args:
+            keywords: Job keywords (matched as whole words, ignoring case)
+            is_known_company: Tells whether a name refers to a tracked company
+            threshold: Minimum score for a message to pass
+        """
+        terms = sorted({keyword.lower() for keyword in keywords}, key=len, reverse=True)
+        self.keyword_pattern = (
+            re.compile(
+                r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b",
+                re.IGNORECASE,
+            )
+            if terms
+            else None
+        )
+        self.is_known_company = is_known_company
+        self.threshold = threshold
+
+    def _keyword_hits(self, text: str) -> int:
+        if not text or self.keyword_pattern is None:
+            return 0
+        return len({match.lower() for match in self.keyword_pattern.findall(text)})
+
+    def _sender_names(self, sender: str) -> Iterable[str]:
+        """Display name and domain name of a sender, e.g. "Acme Careers" and "acme"."""
+        match = SENDER_PATTERN.match(sender or "")
+        if not match:
+            return []
+        display_name, domain = match.groups()
+        parts = domain.lower().split(".")
+        # careers.acme.com -> acme; acme.co.uk -> acme
+        while len(parts) > 2 and len(parts[-1]) <= 3 and len(parts[-2]) <= 3:
+            parts.pop()
+        names = [parts[-2] if len(parts) > 1 else parts[0]]
+        if display_name.strip():
+            names.append(display_name.strip())
+        return names
+
+    def score(self, metadata: Dict[str, Any]) -> float:
+        """
+        Score a message from its metadata.
+
+        Args:
+            metadata: Message summary with any of METADATA_FIELDS
+
+        Returns:
+            Relevance score (higher is more likely job-related)
+        """
+        score = SUBJECT_KEYWORD_SCORE * self._keyword_hits(metadata.get("subject", ""))
+        score += SNIPPET_KEYWORD_SCORE * self._keyword_hits(metadata.get("snippet", ""))
+
+        if self.is_known_company is not None:
+            for name in self._sender_names(metadata.get("from", "")):
+                if self.is_known_company(name) or self.is_known_company(
+                    normalize_company_name(name)
+                ):
+                    score += KNOWN_COMPANY_SCORE
+                    break
+
+        labels = metadata.get("labels") or metadata.get("labelIds") or []
+        if any(label in JUNK_LABELS for label in labels):
+            score += JUNK_LABEL_SCORE
+        return score
+
+    def passes(self, metadata: Dict[str, Any]) -> bool:
+        """Whether a message's full body should be fetched."""
+        return self.score(metadata) >= self.threshold
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Inter-process file lock for JobTracker application.
+Uses flock on POSIX and msvcrt.locking on Windows; elsewhere it only
+serializes within the process.
+"""
+
+import logging
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+logger = logging.getLogger("job-tracker.file-lock")
+
+if fcntl is None and msvcrt is None:
+    logger.warning("No inter-process file locking available on this platform")
+
+
+class FileLock:
+    """Exclusive lock on a lock file, reentrant within the owning thread."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the lock.
+
+        Args:
+            path: Path to the lock file (created if missing)
+        """
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._file = None
+        self._depth = 0
+
+    def acquire(self):
+        """Block until the lock is held."""
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a+")
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                elif msvcrt is not None:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        """Release one level of the lock."""
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            finally:
+                self._file.close()
+                self._file = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -8,25 +8,125 @@ import os
 import logging
 import asyncio
 import json
-import re
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
-from mcp import ClientSession
-from mcp.client.stdio import stdio_client
-from mcp.types import Tool
+from job_tracker.company_index import company_identity_key, normalize_company_name
+from job_tracker.email_cache import EmailCache
+from job_tracker.email_extraction import extract_body_key_points, extract_company
+from job_tracker.email_search import merge_ranked, plan_company_queries
+from job_tracker.email_triage import METADATA_FIELDS, EmailTriage, has_metadata
+from job_tracker.mcp_client import MCPClient, MCPSessionManager
 
 logger = logging.getLogger("job-tracker.gmail")
 
-class GmailClient:
+# State setting holding the incremental sync cursor
+SYNC_SETTING = "gmail_sync"
+
+# Tools a Gmail server may offer for reading the mailbox history since a cursor
+HISTORY_TOOLS = ("list_history", "get_history")
+
+# History record fields listing changes to existing messages
+HISTORY_CHANGE_FIELDS = ("labelsAdded", "labelsRemoved", "messagesDeleted")
+
+# Maximum messages a search-based sync asks for
+DEFAULT_SYNC_LIMIT = int(os.environ.get("GMAIL_SYNC_LIMIT", "500"))
+
+# Messages fetched concurrently by get_emails
+DEFAULT_FETCH_CONCURRENCY = int(os.environ.get("GMAIL_FETCH_CONCURRENCY", "8"))
+
+# Seconds a search-based sync reaches back before the last sync, to cover
+# delivery delays and clock skew (already processed messages are skipped)
+SYNC_OVERLAP = 10 * 60
+
+# Syncs that retry a message left unprocessed before giving up on it
+DEFAULT_SYNC_RETRIES = int(os.environ.get("GMAIL_SYNC_RETRIES", "5"))
+
+# Seconds a company search result is reused
+DEFAULT_SEARCH_CACHE_TTL = float(os.environ.get("GMAIL_SEARCH_CACHE_TTL", "300"))
+
+# Free mail providers, which say nothing about the sender's company
+COMMON_EMAIL_DOMAINS = (
+    "gmail.com",
+    "yahoo.com",
+    "hotmail.com",
+    "outlook.com",
+    "aol.com",
+    "icloud.com",
+)
+
+
+def history_changes(
+    result: Dict[str, Any],
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Split a mailbox history result into added and otherwise changed messages.
+
+    Records that say what happened (Gmail's "messagesAdded", "labelsAdded",
+    ...) only count their added messages as new; records that don't are
+    taken to list new messages.
+
+    Args:
+        result: Result of a history tool
+
+    Returns:
+        (added messages by ID, IDs of existing messages that changed)
+    """
+    added: Dict[str, Dict[str, Any]] = {}
+    changed: List[str] = []
+    for record in result.get("history", result.get("messages", [])):
+        if "messagesAdded" in record or any(
+            field in record for field in HISTORY_CHANGE_FIELDS
+        ):
+            for entry in record.get("messagesAdded", []):
+                message = entry.get("message", entry)
+                if message.get("id"):
+                    added[message["id"]] = message
+            for field in HISTORY_CHANGE_FIELDS:
+                for entry in record.get(field, []):
+                    message_id = entry.get("message", entry).get("id")
+                    if message_id:
+                        changed.append(message_id)
+            continue
+        for message in record.get("messages", [record]):
+            if message.get("id"):
+                added[message["id"]] = message
+    return added, [message_id for message_id in changed if message_id not in added]
+
+
+class GmailClient(MCPClient):
     """Client for interacting with Gmail through MCP."""
-    
-    def __init__(self):
-        """Initialize the Gmail client."""
-        self.session = None
-        self.exit_stack = None
-        self.gmail_mcp_path = os.environ.get("GMAIL_MCP_PATH", "gmail-mcp-server")
-        
+
+    def __init__(
+        self,
+        manager: Optional[MCPSessionManager] = None,
+        state: Any = None,
+        cache: Optional[EmailCache] = None,
+    ):
+        """
+        Initialize the Gmail client.
+
+        Args:
+            manager: Shared MCP session manager (a private one is created if omitted)
+            state: StateManager that keeps the sync cursor (kept in memory if omitted)
+            cache: Message cache (default: ~/.job-tracker/email_cache)
+        """
+        super().__init__(manager)
+        self.server_key = "gmail"
+        self.state = state
+        self.cache = cache or EmailCache()
+        self._sync_cursor: Dict[str, Any] = {}
+        # Cursor the next finish_sync() saves, and the messages of the current
+        # sync not yet marked processed (ID -> attempts so far)
+        self._next_cursor: Optional[Dict[str, Any]] = None
+        self._unfinished: Dict[str, int] = {}
+        # (canonical company, limit) -> (time, search terms, ranked results)
+        self._search_cache: Dict[
+            Tuple[str, int], Tuple[float, Any, List[Dict[str, Any]]]
+        ] = {}
+        self.search_cache_ttl = DEFAULT_SEARCH_CACHE_TTL
+
         # Configure keywords to identify job-related emails
         self.job_keywords = [
             "interview", "application", "job opportunity", "position", 
@@ -35,53 +135,26 @@ class GmailClient:
             "follow-up", "follow up", "thank you", "offer", "salary",
             "job posting", "job listing"
         ]
-        
+
+        # Metadata scoring that decides which messages are downloaded in full
+        self.triage = EmailTriage(self.job_keywords, self._is_known_company)
+
         logger.info("Gmail client initialized")
-    
-    async def connect(self):
-        """Connect to the Gmail MCP server."""
-        try:
-            # Setup Gmail MCP server connection
-            logger.info("Connecting to Gmail MCP server...")
-            
-            # Using async with to properly handle the context manager
-            async with stdio_client(self.gmail_mcp_path) as session:
-                self.session = session
-                
-                # Verify connection by listing labels
-                labels = await self.get_labels()
-                if labels:
-                    logger.info(f"Connected to Gmail MCP server, found {len(labels)} labels")
-                    return True
-                else:
-                    logger.error("Connected to Gmail MCP server but no labels found")
-                    return False
-                    
-        except Exception as e:
-            logger.error(f"Failed to connect to Gmail MCP server: {e}")
-            return False
-    
-    async def disconnect(self):
-        """Disconnect from the Gmail MCP server."""
-        if self.session:
-            await self.session.aclose()
-            self.session = None
-            logger.info("Disconnected from Gmail MCP server")
-    
+
     async def get_labels(self) -> List[Dict[str, Any]]:
         """Get all Gmail labels."""
-        if not self.session:
+        if not await self.ensure_connected():
             logger.error("Not connected to Gmail MCP server")
             return []
-        
+
         try:
             # Call the list_labels tool from the Gmail MCP server
-            result = await self.session.invoke_tool("list_labels")
+            result = await self.invoke_tool("list_labels")
             return result.get("labels", [])
         except Exception as e:
             logger.error(f"Failed to list Gmail labels: {e}")
             return []
-    
+
     async def search_emails(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Search for emails using Gmail's search syntax.
@@ -93,85 +166,486 @@ class GmailClient:
         Returns:
             List of email data dictionaries
         """
-        if not self.session:
+        if not await self.ensure_connected():
             logger.error("Not connected to Gmail MCP server")
             return []
-        
+
         try:
             # Prepare search parameters
             search_params = {
                 "query": query,
                 "max_results": limit
             }
-            
+
             # Call the search_emails tool
-            result = await self.session.invoke_tool("search_emails", search_params)
+            result = await self.invoke_tool("search_emails", search_params)
             emails = result.get("emails", [])
-            
+
             logger.info(f"Found {len(emails)} emails matching query: {query}")
             return emails
         except Exception as e:
             logger.error(f"Failed to search emails: {e}")
             return []
-    
+
     async def get_email(self, email_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get a specific email by ID.
-        
+        Get a specific email by ID, from the message cache when possible.
+
         Args:
             email_id: Gmail message ID
-            
+
         Returns:
             Email data or None if not found/error
         """
-        if not self.session:
+        cached = self.cache.get(email_id)
+        if cached is not None:
+            return cached
+
+        if not await self.ensure_connected():
             logger.error("Not connected to Gmail MCP server")
             return None
-        
+
         try:
-            # Parameters for getting a specific email
-            params = {
-                "message_id": email_id
-            }
-            
-            # Call the get_email tool
-            result = await self.session.invoke_tool("get_email", params)
-            
-            if "error" in result:
-                logger.error(f"Error retrieving email: {result['error']}")
-                return None
-                
-            return result
+            return await self._fetch_email(email_id)
         except Exception as e:
             logger.error(f"Failed to get email {email_id}: {e}")
             return None
-    
+
+    async def _fetch_email(self, email_id: str) -> Dict[str, Any]:
+        """Fetch a message from the server and cache it; raises on errors."""
+        # Parameters for getting a specific email
+        params = {"message_id": email_id}
+
+        # Call the get_email tool
+        result = await self.invoke_tool("get_email", params)
+
+        if "error" in result:
+            raise RuntimeError(f"Error retrieving email: {result['error']}")
+
+        self.cache.put(email_id, result)
+        return result
+
+    async def get_emails(
+        self, email_ids: Iterable[str], concurrency: int = DEFAULT_FETCH_CONCURRENCY
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Fetch several emails concurrently, yielding each as soon as it arrives.
+
+        Cached messages come first; the rest are fetched with at most
+        ``concurrency`` requests in flight. A failed message is reported and
+        doesn't stop the others.
+
+        Args:
+            email_ids: Gmail message IDs
+            concurrency: Maximum number of concurrent fetches
+
+        Yields:
+            (email_id, email data, None) on success or (email_id, None, error message)
+        """
+        missing = []
+        for email_id in dict.fromkeys(email_ids):
+            cached = self.cache.get(email_id)
+            if cached is not None:
+                yield email_id, cached, None
+            else:
+                missing.append(email_id)
+        if not missing:
+            return
+
+        if not await self.ensure_connected():
+            for email_id in missing:
+                yield email_id, None, "Not connected to Gmail MCP server"
+            return
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def fetch(email_id):
+            async with semaphore:
+                try:
+                    return email_id, await self._fetch_email(email_id), None
+                except Exception as e:
+                    logger.error(f"Failed to get email {email_id}: {e}")
+                    return email_id, None, str(e)
+
+        tasks = [asyncio.create_task(fetch(email_id)) for email_id in missing]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The consumer may stop early; don't leave fetches running
+            for task in tasks:
+                task.cancel()
+
+    def get_sync_cursor(self) -> Dict[str, Any]:
+        """
+        Get the incremental sync cursor.
+
+        Returns:
+            Dict with the mailbox "history_id" and/or "synced_at" (epoch
+            seconds) of the last finished sync, and the "pending" messages it
+            left unprocessed (ID -> attempts); empty before the first sync
+        """
+        if self.state is not None:
+            return dict(self.state.get_setting(SYNC_SETTING) or {})
+        return dict(self._sync_cursor)
+
+    async def _save_sync_cursor(self, cursor: Dict[str, Any]):
+        if self.state is not None:
+            await self.state.aupdate_setting(SYNC_SETTING, cursor)
+        else:
+            self._sync_cursor = cursor
+
+    async def _history_tool(self) -> Optional[str]:
+        """Name of the server's history tool, if it has one."""
+        names = {tool["name"] for tool in await self.get_tools()}
+        return next((name for name in HISTORY_TOOLS if name in names), None)
+
+    async def sync_messages(
+        self, query: str = "", limit: int = DEFAULT_SYNC_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the messages that arrived since the last sync, plus those an
+        earlier sync left unprocessed.
+
+        Uses the server's mailbox history when it offers a history tool;
+        otherwise searches for messages received after the last sync. The
+        first sync covers the last three months.
+
+        The cursor doesn't move yet: mark each message handled with
+        mark_processed(), then call finish_sync(). Messages not marked by
+        then are returned again by the next sync.
+
+        Args:
+            query: Gmail search query restricting the messages (search-based sync only)
+            limit: Maximum number of messages a search-based sync looks at
+
+        Returns:
+            Summaries (at least the "id") of messages not marked processed
+            (messages whose labels changed only lose their cached copy)
+        """
+        if not await self.ensure_connected():
+            logger.error("Not connected to Gmail MCP server")
+            return []
+
+        cursor = self.get_sync_cursor()
+        started_at = time.time()
+        messages = None
+        history_id = cursor.get("history_id")
+
+        history_tool = await self._history_tool() if history_id else None
+        if history_tool:
+            try:
+                result = await self.invoke_tool(
+                    history_tool, {"start_history_id": history_id}
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Gmail history lookup failed, falling back to search: {e}"
+                )
+                result = {"error": str(e)}
+            if "error" not in result:
+                added, changed = history_changes(result)
+                messages = list(added.values())
+                history_id = result.get(
+                    "history_id", result.get("historyId", history_id)
+                )
+                # Label changes and deletions don't make a message new again;
+                # only the cached copy (with its old labels) goes
+                for message_id in changed:
+                    self.cache.discard(message_id)
+
+        if messages is None:
+            if cursor.get("synced_at"):
+                window = f"after:{int(cursor['synced_at'] - SYNC_OVERLAP)}"
+            else:
+                window = "newer_than:3m"
+            emails = await self.search_emails(f"{query} {window}".strip(), limit)
+            if len(emails) >= limit:
+                logger.warning(
+                    f"Sync found {limit}+ messages; "
+                    "older ones in the window were skipped"
+                )
+            messages = [email for email in emails if email.get("id")]
+            history_ids = [
+                int(email["historyId"])
+                for email in emails
+                if str(email.get("historyId", "")).isdigit()
+            ]
+            if history_ids:
+                history_id = str(max(history_ids + [int(history_id or 0)]))
+
+        # Messages an earlier sync couldn't finish come first
+        pending = cursor.get("pending", {})
+        candidates = {message_id: {"id": message_id} for message_id in pending}
+        candidates.update((message["id"], message) for message in messages)
+        new_messages = [
+            message
+            for message in candidates.values()
+            if self.cache.status(message["id"]) is None
+        ]
+        if new_messages:
+            # New mail may belong in any company's search results
+            self._search_cache.clear()
+
+        self._next_cursor = {"history_id": history_id, "synced_at": started_at}
+        self._unfinished = {
+            message["id"]: pending.get(message["id"], 0) + 1 for message in new_messages
+        }
+        logger.info(f"Gmail sync: {len(new_messages)} new or pending messages")
+        return new_messages
+
+    def mark_processed(self, email_id: str, status: str = "processed"):
+        """
+        Record that a synced message was handled, so no later sync returns it.
+
+        Args:
+            email_id: Gmail message ID
+            status: Marker stored in the message cache (e.g. "skipped")
+        """
+        self.cache.mark(email_id, status)
+        self._unfinished.pop(email_id, None)
+
+    async def finish_sync(self):
+        """
+        Advance the sync cursor past the last sync_messages() call.
+
+        Messages it returned that weren't marked processed are kept as
+        pending and retried by later syncs, up to DEFAULT_SYNC_RETRIES times.
+        """
+        if self._next_cursor is None:
+            return
+        pending = {}
+        for message_id, attempts in self._unfinished.items():
+            if attempts < DEFAULT_SYNC_RETRIES:
+                pending[message_id] = attempts
+            else:
+                logger.warning(
+                    f"Giving up on email {message_id} after {attempts} syncs"
+                )
+        await self._save_sync_cursor({**self._next_cursor, "pending": pending})
+        self._next_cursor = None
+        self._unfinished = {}
+
+    async def sync_message_ids(
+        self, query: str = "", limit: int = DEFAULT_SYNC_LIMIT
+    ) -> List[str]:
+        """
+        Get the IDs of messages that arrived since the last sync
+        (see sync_messages).
+
+        Returns:
+            Message IDs not marked processed
+        """
+        return [message["id"] for message in await self.sync_messages(query, limit)]
+
+    def _is_known_company(self, name: str) -> bool:
+        """Whether a name refers to a company in the application state."""
+        if self.state is None or not name:
+            return False
+        return self.state.resolve_company(name) in self.state.state["companies"]
+
+    async def get_email_metadata(self, email_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a message's headers and snippet without its body.
+
+        Args:
+            email_id: Gmail message ID
+
+        Returns:
+            Dict with METADATA_FIELDS (those the server returns), or None on error
+        """
+        cached = self.cache.get(email_id)
+        if cached is not None:
+            return cached
+
+        if not await self.ensure_connected():
+            logger.error("Not connected to Gmail MCP server")
+            return None
+
+        try:
+            result = await self.invoke_tool(
+                "get_email", {"message_id": email_id, "format": "metadata"}
+            )
+        except Exception as e:
+            logger.error(f"Failed to get metadata of email {email_id}: {e}")
+            return None
+        if "error" in result:
+            logger.error(
+                f"Error retrieving metadata of email {email_id}: {result['error']}"
+            )
+            return None
+        return {field: result[field] for field in METADATA_FIELDS if field in result}
+
+    async def triage_emails(
+        self,
+        messages: Iterable[Dict[str, Any]],
+        concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    ) -> List[str]:
+        """
+        Pick the messages worth downloading in full.
+
+        Each message is scored from its headers and snippet against the job
+        keywords and the tracked companies. Summaries that already carry
+        headers (e.g. search results) are scored as they are; for the rest
+        only the metadata is fetched.
+
+        Args:
+            messages: Message summaries with at least an "id"
+            concurrency: Maximum number of concurrent metadata fetches
+
+        Returns:
+            IDs of the messages that pass triage, in the given order
+        """
+        verdicts = await self._triage_verdicts(messages, concurrency)
+        return [message_id for message_id, passed in verdicts if passed]
+
+    async def _triage_verdicts(
+        self, messages: Iterable[Dict[str, Any]], concurrency: int
+    ) -> List[Tuple[str, Optional[bool]]]:
+        """
+        (ID, whether it passes triage) per message; the verdict is None if
+        the message's metadata couldn't be fetched.
+        """
+        messages = list(messages)
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def metadata(message):
+            if has_metadata(message):
+                return message
+            async with semaphore:
+                return await self.get_email_metadata(message["id"])
+
+        results = await asyncio.gather(*(metadata(message) for message in messages))
+        verdicts = [
+            (message["id"], None if found is None else self.triage.passes(found))
+            for message, found in zip(messages, results)
+        ]
+        passed = sum(1 for _, verdict in verdicts if verdict)
+        logger.info(
+            f"Email triage: {passed} of {len(messages)} messages look job-related"
+        )
+        return verdicts
+
+    async def sync_emails(
+        self, query: str = "", limit: int = DEFAULT_SYNC_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the job-related messages that arrived since the last sync.
+
+        Messages are triaged on their metadata first; only those that pass
+        are downloaded in full, and those that don't are marked "rejected"
+        so no later sync looks at them again. As with sync_messages(), mark
+        each returned message processed and call finish_sync() once they are
+        handled; messages whose metadata or body failed to download are
+        retried by the next sync.
+
+        Args:
+            query: Gmail search query restricting the messages (search-based sync only)
+            limit: Maximum number of messages a search-based sync looks at
+
+        Returns:
+            List of email data dictionaries
+        """
+        verdicts = await self._triage_verdicts(
+            await self.sync_messages(query, limit), DEFAULT_FETCH_CONCURRENCY
+        )
+        email_ids = []
+        for message_id, passed in verdicts:
+            if passed:
+                email_ids.append(message_id)
+            elif passed is not None:
+                self.mark_processed(message_id, "rejected")
+        emails = []
+        async for _, email, _ in self.get_emails(email_ids):
+            if email is not None:
+                emails.append(email)
+        return emails
+
+    def job_query(self) -> str:
+        """Gmail query matching any of the job keywords."""
+        return "{" + " ".join(f'"{keyword}"' for keyword in self.job_keywords) + "}"
+
+    def sender_domain(self, email_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the sender's domain unless it is a free mail provider.
+
+        Args:
+            email_data: Email data dictionary
+
+        Returns:
+            Lowercase domain or None
+        """
+        sender = email_data.get("from", "")
+        if "@" not in sender:
+            return None
+        domain = sender.split("@")[1].strip(" >").lower()
+        if not domain or domain in COMMON_EMAIL_DOMAINS:
+            return None
+        return domain
+
+    def _company_search_terms(self, company_name: str) -> Tuple[List[str], List[str]]:
+        """Names (with aliases) and known sender domains to search a company by."""
+        names = [company_name]
+        domains: List[str] = []
+        if self.state is not None:
+            canonical = self.state.resolve_company(company_name)
+            names.append(canonical)
+            names.extend(self.state.company_aliases(canonical))
+            domains = list(
+                self.state.get_company_state(canonical).get("email_domains", [])
+            )
+        names.append(normalize_company_name(company_name))
+
+        # One spelling per name; Gmail search ignores case
+        unique = {}
+        for name in names:
+            if name:
+                unique.setdefault(name.lower(), name)
+        return list(unique.values()), domains
+
     async def search_company_emails(self, company_name: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Search for emails related to a specific company.
-        
+
+        Runs several compact queries concurrently (the company's names with
+        groups of job keywords, plus mail from the company's known domains)
+        and ranks the merged results. Results are reused for a few minutes,
+        until a sync finds new mail or the company's names or sender domains
+        change (e.g. a new alias).
+
         Args:
             company_name: Company name to search for
             limit: Maximum number of emails to return
-            
+
         Returns:
-            List of email data dictionaries
+            List of email data dictionaries, best match first
         """
-        # Create a search query that looks for the company name
-        # and job-related keywords in the email
-        query = f"({company_name})"
-        
-        # Add job keywords to search to filter for relevant emails
-        job_terms = " OR ".join([f"\"{keyword}\"" for keyword in self.job_keywords[:5]])
-        if job_terms:
-            query += f" AND ({job_terms})"
-        
-        # Search for recent emails first
-        query += " newer_than:3m"
-        
-        # Perform the search
-        return await self.search_emails(query, limit)
-    
+        if self.state is not None:
+            canonical = self.state.resolve_company(company_name)
+        else:
+            canonical = company_identity_key(company_name) or company_name
+        cache_key = (canonical, limit)
+        names, domains = self._company_search_terms(company_name)
+        terms = (sorted(name.lower() for name in names), sorted(domains))
+        cached = self._search_cache.get(cache_key)
+        if (
+            cached
+            and cached[1] == terms
+            and time.monotonic() - cached[0] < self.search_cache_ttl
+        ):
+            return list(cached[2])
+
+        queries = plan_company_queries(names, self.job_keywords, domains)
+        results = await asyncio.gather(
+            *(self.search_emails(query, limit) for query, _ in queries)
+        )
+        emails = merge_ranked(
+            [(found, weight) for found, (_, weight) in zip(results, queries)], limit
+        )
+
+        self._search_cache[cache_key] = (time.monotonic(), terms, emails)
+        return list(emails)
+
     async def extract_company_from_email(self, email_data: Dict[str, Any]) -> Optional[str]:
         """
         Extract company name from email data.
@@ -185,52 +659,28 @@ class GmailClient:
         """
         if not email_data:
             return None
-            
+
         # Try various methods to extract company name
-        
+
         # Method 1: Check the sender's email domain (excluding common providers)
-        common_domains = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "aol.com", "icloud.com"]
-        sender = email_data.get("from", "")
-        if "@" in sender:
-            domain = sender.split("@")[1].lower()
-            if domain not in common_domains:
-                # Convert domain to company name format (remove .com, .org, etc. and capitalize)
-                company = domain.split(".")[0].title()
-                logger.info(f"Extracted company from email domain: {company}")
-                return company
-        
-        # Method 2: Look for common signature patterns in email body
-        body = email_data.get("body", "")
-        signature_patterns = [
-            r"(?i)(?:^|\n).*?([A-Z][A-Za-z0-9\s&]+)(?:\n|$).*?(?:Inc\.|LLC|Ltd\.|Limited|Corp\.|Corporation)",
-            r"(?i)(?:work|working) (?:at|for|with) ([A-Z][A-Za-z0-9\s&]+)",
-            r"(?i)(?:behalf|representative) of ([A-Z][A-Za-z0-9\s&]+)"
-        ]
-        
-        for pattern in signature_patterns:
-            matches = re.findall(pattern, body)
-            if matches:
-                company = matches[0].strip()
-                logger.info(f"Extracted company from email body: {company}")
-                return company
-        
-        # Method 3: Look for company name in subject
-        subject = email_data.get("subject", "")
-        subject_patterns = [
-            r"(?i)(?:position|role|opportunity|application|interview) (?:at|with) ([A-Z][A-Za-z0-9\s&]+)",
-            r"(?i)([A-Z][A-Za-z0-9\s&]+) (?:position|role|opportunity|application|interview)"
-        ]
-        
-        for pattern in subject_patterns:
-            matches = re.findall(pattern, subject)
-            if matches:
-                company = matches[0].strip()
-                logger.info(f"Extracted company from email subject: {company}")
-                return company
-        
+        domain = self.sender_domain(email_data)
+        if domain:
+            # Convert domain to company name format (remove .com, .org, etc. and capitalize)
+            company = domain.split(".")[0].title()
+            logger.info(f"Extracted company from email domain: {company}")
+            return company
+
+        # Method 2: Look for signature patterns in the body, then the subject
+        company = extract_company(
+            email_data.get("body", ""), email_data.get("subject", "")
+        )
+        if company:
+            logger.info(f"Extracted company from email text: {company}")
+            return company
+
         logger.warning("Could not extract company name from email")
         return None
-    
+
     async def extract_key_points(self, email_data: Dict[str, Any]) -> List[str]:
         """
         Extract key points from the email body.
@@ -244,62 +694,27 @@ class GmailClient:
         """
         if not email_data:
             return []
-            
+
         body = email_data.get("body", "")
         if not body:
             return []
-            
-        key_points = []
-        
-        # Extract potential interview times/dates
-        date_patterns = [
-            r"(?:interview|meeting|call|discussion)(?:.*?)(?:scheduled|planned|arranged|set up)(?:.*?)(?:on|for) ([A-Za-z]+\s+\d+(?:st|nd|rd|th)?(?:,?\s+\d{4})?(?:\s+at\s+\d+(?::\d+)?(?:\s*[AP]M)?)?)",
-            r"(\d{1,2}(?::\d{2})?\s*[AP]M\s*(?:EST|CST|MST|PST|EDT|CDT|MDT|PDT)?)(?:.*?)(?:interview|meeting|call|discussion)",
-            r"([A-Za-z]+day,?\s+[A-Za-z]+\s+\d+(?:st|nd|rd|th)?(?:,?\s+\d{4})?)"
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, body)
-            for match in matches:
-                key_points.append(f"Scheduled: {match.strip()}")
-        
-        # Extract position information
-        position_patterns = [
-            r"(?:position|role|job)(?: for| of)? ([^.,;]+?)(?:\.|\n|,|;)",
-            r"(?:applying|application|candidacy)(?: for| to)? ([^.,;]+?)(?:\.|\n|,|;)"
-        ]
-        
-        for pattern in position_patterns:
-            matches = re.findall(pattern, body)
-            for match in matches:
-                if len(match.strip()) > 3:  # Avoid very short matches
-                    key_points.append(f"Position: {match.strip()}")
-        
-        # Extract next steps
-        next_step_patterns = [
-            r"(?:next steps?|follow(?:-| )up)(?: will be| is| are)? ([^.,;]+?)(?:\.|\n|,|;)",
-            r"(?:looking forward to|please|kindly) ([^.,;]*?(?:schedule|confirm|respond|reply|review|send|submit)(?-)[^.,;]*?)(?:\.|\n|,|;)"
-        ]
-        
-        for pattern in next_step_patterns:
-            matches = re.findall(pattern, body)
-            for match in matches:
-                if len(match.strip()) > 10:  # Avoid very short matches
-                    key_points.append(f"Next steps: {match.strip()}")
-        
+
+        # Scheduled times, positions and next steps, in one scan of the body
+        key_points = extract_body_key_points(body)
+
         # Add subject line as a key point if it's informative
         subject = email_data.get("subject", "")
         if len(subject) > 10 and not subject.startswith("Re:") and not subject.startswith("Fwd:"):
             key_points.append(f"Subject: {subject}")
-        
+
         # Add sender information
         sender = email_data.get("from", "")
         if sender:
             key_points.append(f"From: {sender}")
-        
+
         # Add date information
         date = email_data.get("date", "")
         if date:
             key_points.append(f"Date: {date}")
-        
-        return key_points
\ No newline at end of file
+
+        return key_points
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Interaction archive for the JobTracker state manager.
+
+Interactions that fall out of a company's hot history are appended to a
+gzip-compressed JSON-lines file per company. Each record carries its
+position in the company's full history, so a record written twice (e.g.
+when state was not saved after archiving) is read back only once.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+from typing import Any, Dict, Iterator, List
+
+logger = logging.getLogger("job-tracker.state")
+
+SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+class InteractionArchive:
+    """Per-company compressed archive files of old interactions."""
+
+    def __init__(self, archive_dir: str):
+        """
+        Initialize the archive.
+
+        Args:
+            archive_dir: Directory holding the archive files
+        """
+        self.archive_dir = archive_dir
+
+    def path_for(self, company_name: str) -> str:
+        """Archive file of a company: a readable slug plus a hash of the name."""
+        slug = SLUG_PATTERN.sub("-", company_name.lower()).strip("-")[:50]
+        digest = hashlib.sha1(company_name.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.archive_dir, f"{slug}-{digest}.jsonl.gz")
+
+    def append(self, company_name: str, start: int, interactions: List[Dict[str, Any]]):
+        """
+        Archive interactions.
+
+        Args:
+            company_name: Company name
+            start: Position of the first interaction in the company's full history
+            interactions: Interactions to archive, oldest first
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        lines = "".join(
+            json.dumps({"n": start + offset, "interaction": interaction}) + "\n"
+            for offset, interaction in enumerate(interactions)
+        )
+        # Each append adds a gzip member; readers see one continuous stream
+        with gzip.open(self.path_for(company_name), "at", encoding="utf-8") as f:
+            f.write(lines)
+        logger.debug(f"Archived {len(interactions)} interactions for {company_name}")
+
+    def rewrite(self, company_name: str, interactions: List[Dict[str, Any]]):
+        """
+        Replace a company's archive.
+
+        Args:
+            company_name: Company name
+            interactions: The company's whole archived history, oldest first
+        """
+        if not interactions:
+            self.remove(company_name)
+            return
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = self.path_for(company_name)
+        temp_file = f"{path}.tmp"
+        with gzip.open(temp_file, "wt", encoding="utf-8") as f:
+            for n, interaction in enumerate(interactions):
+                f.write(json.dumps({"n": n, "interaction": interaction}) + "\n")
+        os.replace(temp_file, path)
+        logger.debug(
+            f"Rewrote the archive of {company_name} "
+            f"with {len(interactions)} interactions"
+        )
+
+    def iter_interactions(
+        self, company_name: str, count: int
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Read archived interactions, oldest first.
+
+        Args:
+            company_name: Company name
+            count: Number of interactions the company has archived; records
+                at or past this position are ignored
+
+        Yields:
+            Interaction dicts
+        """
+        path = self.path_for(company_name)
+        if not count or not os.path.exists(path):
+            return
+        expected = 0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["n"] != expected:
+                    continue
+                yield record["interaction"]
+                expected += 1
+                if expected >= count:
+                    return
+        if expected < count:
+            logger.warning(
+                f"Archive for {company_name} has {expected} of {count} interactions"
+            )
+
+    def remove(self, company_name: str):
+        """Delete a company's archive file."""
+        try:
+            os.remove(self.path_for(company_name))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Delete every archive file."""
+        shutil.rmtree(self.archive_dir, ignore_errors=True)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+LLM client for JobTracker application.
+Holds one async Anthropic client with a pooled keep-alive HTTP connection per app.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger("job-tracker.llm")
+
+DEFAULT_MODEL = os.environ.get("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
+
+# HTTP connection pool limits for the Anthropic API
+MAX_CONNECTIONS = int(os.environ.get("ANTHROPIC_MAX_CONNECTIONS", "10"))
+KEEPALIVE_EXPIRY = 60.0
+
+
+class SharedAnthropicClient:
+    """
+    Lazily created ``AsyncAnthropic`` client shared by everything in the app.
+
+    The SDK is imported on first use so commands that never call the model
+    don't pay for it at startup.
+    """
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS):
+        """
+        Initialize the holder.
+
+        Args:
+            max_connections: Maximum number of concurrent HTTP connections
+        """
+        self.max_connections = max_connections
+        self._client = None
+
+    @property
+    def client(self):
+        """The ``AsyncAnthropic`` client, created on first access."""
+        if self._client is None:
+            import httpx
+            from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+            from dotenv import load_dotenv
+
+            load_dotenv()
+
+            http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                )
+            )
+            self._client = AsyncAnthropic(http_client=http_client)
+            logger.info("Created Anthropic client")
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP connections."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
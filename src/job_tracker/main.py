@@ -6,15 +6,18 @@ to integrate with Notion and Gmail.
 
 import os
 import sys
+import signal
 import asyncio
 import argparse
 import logging
+import time
 from dotenv import load_dotenv
 
 # Import our client modules
 from job_tracker.notion_client import NotionClient
 from job_tracker.gmail_client import GmailClient
-from job_tracker.audio_proc import AudioProcessor
+from job_tracker.llm import SharedAnthropicClient
+from job_tracker.mcp_client import MCPSessionManager
 from job_tracker.state import StateManager
 
 # Configure logging
@@ -24,81 +27,164 @@ logging.basicConfig(
 )
 logger = logging.getLogger("job-tracker")
 
+# Per-server connect timeout in seconds
+DEFAULT_CONNECT_TIMEOUT = float(os.environ.get("MCP_CONNECT_TIMEOUT", "30"))
+
+# MCP servers each command needs; anything else is connected lazily on first use
+COMMAND_SERVERS = {
+    "call": ("notion", "audio"),
+    "email": ("notion", "gmail"),
+    "search": ("notion",),
+    "status": ("notion",),
+    "test-connections": ("notion", "gmail", "audio"),
+}
+
 class JobTrackerApp:
     """Main application class for the JobTracker MCP application."""
-    
+
     def __init__(self):
         # Load environment variables
         load_dotenv()
-        
+
         # Initialize state manager
         self.state = StateManager()
-        
+
+        # Shared manager that owns the MCP server processes for the app lifetime
+        self.mcp = MCPSessionManager()
+
+        # One Anthropic client (and HTTP connection pool) for the whole app
+        self.llm = SharedAnthropicClient()
+
         # Initialize clients
-        self.notion = NotionClient()
-        self.gmail = GmailClient()
-        self.audio = AudioProcessor()
-        
+        self.notion = NotionClient(self.mcp, self.llm)
+        self.gmail = GmailClient(self.mcp, state=self.state)
+        self._audio = None  # created on first use, see the audio property
+
+        # Connection status and startup time (seconds) per server
+        self.connections = {}
+        self.connect_times = {}
+
         logger.info("JobTracker MCP initialized")
-    
-    async def connect(self):
-        """Connect to all MCP servers."""
+
+    @property
+    def audio(self):
+        """Audio processor, imported on first use so other commands never load it."""
+        if self._audio is None:
+            from job_tracker.audio_proc import AudioProcessor
+
+            self._audio = AudioProcessor(self.mcp)
+        return self._audio
+
+    def get_client(self, name):
+        """Return the MCP client for a server name (clients are named after it)."""
+        return getattr(self, name)
+
+    async def connect(
+        self, servers=("notion", "gmail", "audio"), timeout=DEFAULT_CONNECT_TIMEOUT
+    ):
+        """
+        Connect to MCP servers concurrently.
+
+        Each server gets its own timeout, so a slow or broken server only
+        degrades the commands that need it.
+
+        Args:
+            servers: Names of the servers to connect
+            timeout: Maximum time in seconds to wait for each server
+
+        Returns:
+            True if at least one server is connected
+        """
+        clients = {name: self.get_client(name) for name in servers}
+        results = await asyncio.gather(
+            *(
+                self._connect_client(name, client, timeout)
+                for name, client in clients.items()
+            )
+        )
+        self.connections.update(zip(clients, results))
+
+        failed = [name for name in clients if not self.connections[name]]
+        if failed:
+            logger.warning(f"MCP servers unavailable: {', '.join(failed)}")
+        else:
+            logger.info(f"Connected to MCP servers: {', '.join(clients)}")
+        return any(results)
+
+    async def _connect_client(self, name, client, timeout):
+        """Connect a single client, recording how long the server took to come up."""
+        start = time.perf_counter()
         try:
-            await self.notion.connect()
-            await self.gmail.connect()
-            await self.audio.connect()
-            logger.info("Connected to all MCP servers")
-            return True
+            connected = await asyncio.wait_for(client.connect(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Timed out after {timeout:.0f}s connecting to {name} MCP server"
+            )
+            # Otherwise the next use of the client would wait on the same startup
+            await self.mcp.abort(name)
+            connected = False
         except Exception as e:
-            logger.error(f"Error connecting to MCP servers: {e}")
-            return False
-    
+            logger.error(f"Error connecting to {name} MCP server: {e}")
+            connected = False
+        self.connect_times[name] = time.perf_counter() - start
+        if connected:
+            logger.info(
+                f"Connected to {name} MCP server in {self.connect_times[name]:.2f}s"
+            )
+        return connected
+
     async def process_call_recording(self, file_path, company_name=None, transcript=None):
         """Process a call recording and update Notion."""
         logger.info(f"Processing call recording: {file_path if file_path else 'from live recording'}")
-        
+
         # If transcript is provided, use it directly (from live recording)
         if not transcript and file_path:
             # Transcribe the audio file
             transcript = await self.audio.transcribe(file_path)
-        
+
         if not transcript:
             logger.error("No transcript available")
             return None
-        
+
         # If company name not provided, try to extract it from the transcript
         if not company_name:
             company_name = await self.audio.extract_company_name(transcript)
             if not company_name:
                 logger.warning("Could not extract company name from transcript")
                 company_name = input("Please enter the company name: ")
-        
+
         # Get or create company page in Notion
         company_page = await self.notion.get_or_create_company(company_name)
-        
+        if not company_page:
+            logger.error(f"Could not find or create a Notion page for {company_name}")
+            return None
+
         # Extract key points from transcript
         key_points = await self.audio.extract_key_points(transcript)
-        
+
         # Update the company page with the call notes
         call_date = self.audio.extract_date_from_filename(file_path) if file_path else self.audio.get_current_date()
-        
+
         await self.notion.add_call_notes(
             company_page,
             transcript=transcript,
             key_points=key_points,
             call_date=call_date
         )
-        
+
         # Update application state
-        self.state.update_company_state(company_name, {
-            "last_interaction": "call",
-            "last_interaction_date": call_date,
-            "has_calls": True
-        })
-        
+        await self.state.aupdate_company_state(
+            company_name,
+            {
+                "last_interaction": "call",
+                "last_interaction_date": call_date,
+                "has_calls": True,
+            },
+        )
+
         logger.info(f"Successfully processed call for {company_name}")
         return company_page
-    
+
     async def process_email(self, email_id=None, company_name=None):
         """Process an email and update Notion."""
         if email_id:
@@ -109,98 +195,133 @@ class JobTrackerApp:
             if not company_name:
                 logger.error("Either email_id or company_name must be provided")
                 return None
-            
+
             email_data = await self.gmail.search_company_emails(company_name, limit=1)
             if not email_data:
                 logger.warning(f"No emails found for company: {company_name}")
                 return None
-            
-            email_data = email_data[0]  # Get the most recent email
-        
+
+            # Search results only carry metadata; download the best match in full
+            email_data = (
+                await self.gmail.get_email(email_data[0]["id"]) or email_data[0]
+            )
+
         # Extract company name from email if not provided
         if not company_name:
             company_name = await self.gmail.extract_company_from_email(email_data)
             if not company_name:
                 logger.warning("Could not extract company name from email")
                 company_name = input("Please enter the company name: ")
-        
+
         # Get or create company page in Notion
         company_page = await self.notion.get_or_create_company(company_name)
-        
+        if not company_page:
+            logger.error(f"Could not find or create a Notion page for {company_name}")
+            return None
+
         # Extract key information from email
         key_points = await self.gmail.extract_key_points(email_data)
-        
+
         # Update the company page with the email information
         await self.notion.add_email_notes(
             company_page,
             email_data=email_data,
             key_points=key_points
         )
-        
-        # Update application state
-        self.state.update_company_state(company_name, {
+
+        # Update application state; the sender's domain helps later company searches
+        updates = {
             "last_interaction": "email",
             "last_interaction_date": email_data.get("date"),
-            "has_emails": True
-        })
-        
+            "has_emails": True,
+        }
+        domain = self.gmail.sender_domain(email_data)
+        domains = self.state.get_company_state(company_name).get("email_domains", [])
+        if domain and domain not in domains:
+            updates["email_domains"] = domains + [domain]
+        await self.state.aupdate_company_state(company_name, updates)
+
         logger.info(f"Successfully processed email for {company_name}")
         return company_page
-    
+
+    async def sync_emails(self):
+        """
+        Process the job-related emails received since the last sync.
+
+        Emails whose company can't be determined are skipped rather than
+        prompting for each one. Emails that fail to process are retried by
+        the next sync.
+
+        Returns:
+            Number of emails processed
+        """
+        emails = await self.gmail.sync_emails(self.gmail.job_query())
+        processed = 0
+        try:
+            for email_data in emails:
+                email_id = email_data.get("id")
+                company_name = await self.gmail.extract_company_from_email(email_data)
+                if not company_name:
+                    logger.info(f"Skipping email {email_id}: no company found")
+                    self.gmail.mark_processed(email_id, "skipped")
+                    continue
+                if await self.process_email(email_id, company_name):
+                    self.gmail.mark_processed(email_id)
+                    processed += 1
+        finally:
+            # Emails that failed stay pending and are retried by the next sync
+            await self.gmail.finish_sync()
+        logger.info(f"Processed {processed} of {len(emails)} new emails")
+        return processed
+
     async def search_companies(self, query):
         """Search for companies in Notion."""
         companies = await self.notion.search_companies(query)
         return companies
-    
+
     async def get_company_status(self, company_name):
         """Get the current status of a company application."""
         # Check Notion for company info
         company_page = await self.notion.get_company(company_name)
-        
+
         # Get state information
-        state_info = self.state.get_company_state(company_name)
-        
+        state_info = await self.state.aget_company_state(company_name)
+
         # Combine information
         status = {
             "company_name": company_name,
             "notion_page": company_page,
             "state": state_info,
         }
-        
+
         return status
-    
+
     async def test_connections(self):
         """Test connections to all MCP servers."""
-        results = {}
-        
-        try:
-            notion_connected = await self.notion.connect()
-            results["notion"] = notion_connected
-        except Exception as e:
-            logger.error(f"Error connecting to Notion: {e}")
-            results["notion"] = False
-        
-        try:
-            gmail_connected = await self.gmail.connect()
-            results["gmail"] = gmail_connected
-        except Exception as e:
-            logger.error(f"Error connecting to Gmail: {e}")
-            results["gmail"] = False
-        
-        try:
-            audio_connected = await self.audio.connect()
-            results["audio"] = audio_connected
-        except Exception as e:
-            logger.error(f"Error connecting to Audio: {e}")
-            results["audio"] = False
-        
-        return results
-    
+        missing = [
+            name
+            for name in ("notion", "gmail", "audio")
+            if name not in self.connections
+        ]
+        if missing:
+            await self.connect(missing)
+        return dict(self.connections)
+
+    def handle_signal(self, sig, task):
+        """Flush state immediately and cancel the running command so cleanup runs."""
+        logger.warning(f"Received {sig.name}, flushing state and shutting down")
+        self.state.flush()
+        task.cancel()
+
     async def cleanup(self):
         """Clean up and close connections."""
-        await self.notion.disconnect()
-        await self.gmail.disconnect()
-        await self.audio.disconnect()
+        await self.notion.cleanup()
+        await self.gmail.cleanup()
+        if self._audio is not None:
+            await self._audio.cleanup()
+        await self.mcp.aclose()
+        await self.llm.aclose()
+        await self.state.aclose()
         logger.info("Disconnected from all MCP servers")
 
 
@@ -208,7 +329,7 @@ async def main():
     """Main entry point for the application."""
     parser = argparse.ArgumentParser(description="JobTracker MCP Application")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
-    
+
     # Add call command
     call_parser = subparsers.add_parser("call", help="Process a call recording or record a new one")
     call_parser.add_argument("file", nargs="?", help="Path to the audio file (optional if --record is used)")
@@ -216,26 +337,40 @@ async def main():
     call_parser.add_argument("--company", help="Company name (optional)")
     call_parser.add_argument("--device", help="Audio device ID (optional)")
     call_parser.add_argument("--list-devices", action="store_true", help="List available audio devices")
-    
+
     # Add email command
     email_parser = subparsers.add_parser("email", help="Process an email")
     email_parser.add_argument("--id", help="Email ID (optional)")
     email_parser.add_argument("--company", help="Company name (optional)")
-    
+    email_parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Process job-related emails received since the last sync",
+    )
+
     # Add test-connections command
     test_parser = subparsers.add_parser("test-connections", help="Test connections to MCP servers")
-    
+
     # Parse arguments
     args = parser.parse_args()
-    
+
     # Create app
     app = JobTrackerApp()
-    
-    # Connect to MCP servers
-    if not await app.connect():
+
+    # Make sure write-behind state reaches disk on Ctrl-C / termination
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, app.handle_signal, sig, asyncio.current_task())
+        except (NotImplementedError, RuntimeError):
+            pass  # Not supported on this platform (e.g. Windows)
+
+    # Connect only the MCP servers this command needs
+    servers = COMMAND_SERVERS.get(args.command, ())
+    if servers and not await app.connect(servers):
         print("Failed to connect to MCP servers. Exiting.")
         return 1
-    
+
     try:
         if args.command == "call":
             # List devices if requested
@@ -245,7 +380,7 @@ async def main():
                 for i, device in enumerate(devices):
                     print(f"  {i+1}. {device.get('name', 'Unknown')} (ID: {device.get('id', 'Unknown')})")
                 return 0
-                
+
             # Handle recording
             if args.record:
                 print(f"Recording audio for {args.record} seconds...")
@@ -253,7 +388,7 @@ async def main():
                 if not transcript:
                     print("Failed to record or transcribe audio")
                     return 1
-                
+
                 # Process the transcript
                 result = await app.process_call_recording(None, args.company, transcript=transcript)
                 if result:
@@ -262,28 +397,32 @@ async def main():
                 else:
                     print("Failed to process recording")
                 return 0
-                    
+
             # Process existing audio file
             if not args.file:
                 print("Error: Either file path or --record must be specified")
                 call_parser.print_help()
                 return 1
-                
+
             result = await app.process_call_recording(args.file, args.company)
             if result:
                 print(f"Call processed successfully for company: {result.get('title', args.company)}")
                 print(f"View in Notion: {result.get('url', 'Unknown URL')}")
             else:
                 print("Failed to process call recording")
-                
+
         elif args.command == "email":
+            if args.sync:
+                processed = await app.sync_emails()
+                print(f"Processed {processed} new emails")
+                return 0
             result = await app.process_email(args.id, args.company)
             if result:
                 print(f"Email processed successfully for company: {result.get('title', args.company)}")
                 print(f"View in Notion: {result.get('url', 'Unknown URL')}")
             else:
                 print("Failed to process email")
-                
+
         elif args.command == "search":
             companies = await app.search_companies(args.query)
             print(f"Found {len(companies)} companies matching '{args.query}':")
@@ -291,7 +430,7 @@ async def main():
                 title = company.get('title', 'Unknown')
                 url = company.get('url', 'No URL')
                 print(f"- {title} ({url})")
-                
+
         elif args.command == "status":
             status = await app.get_company_status(args.company)
             print(f"Status for {args.company}:")
@@ -299,32 +438,37 @@ async def main():
                 print(f"Notion Page: {status['notion_page'].get('url', 'No URL')}")
             else:
                 print("Notion Page: Not created")
-                
+
             print(f"Last Interaction: {status['state'].get('last_interaction', 'None')}")
             print(f"Last Interaction Date: {status['state'].get('last_interaction_date', 'Unknown')}")
             print(f"Has Calls: {status['state'].get('has_calls', False)}")
             print(f"Has Emails: {status['state'].get('has_emails', False)}")
-        
+
         elif args.command == "test-connections":
             results = await app.test_connections()
             print("Connection test results:")
             for server, connected in results.items():
                 status = "Connected" if connected else "Failed"
-                print(f"- {server.capitalize()}: {status}")
-            
+                elapsed = app.connect_times.get(server, 0.0)
+                print(f"- {server.capitalize()}: {status} ({elapsed:.2f}s)")
+
         else:
             parser.print_help()
-            
+
     finally:
         await app.cleanup()
-    
+
     return 0
 
 
 def run_main():
     """Entry point for the application that handles the asyncio event loop."""
-    return asyncio.run(main())
+    try:
+        return asyncio.run(main())
+    except asyncio.CancelledError:
+        # Interrupted by a signal; state was flushed in cleanup
+        return 1
 
 
 if __name__ == "__main__":
-    sys.exit(run_main())
\ No newline at end of file
+    sys.exit(run_main())
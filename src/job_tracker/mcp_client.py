@@ -2,33 +2,69 @@ import asyncio
 import json
 import logging
 import os
-from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional
+
 from mcp import ClientSession, StdioServerParameters, stdio_client
 
+from job_tracker.tool_cache import ToolSchemaCache
+from job_tracker.tool_selector import ToolSelector
+
 logger = logging.getLogger("job-tracker.mcp")
 
-class MCPClient:
-    def __init__(self) -> None:
-        self.session = None
-        self.exit_stack = AsyncExitStack()
-        self.server_key = ""  # Derived classes should set this
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "../../mcp_config.json"
+)
 
-    async def connect(self) -> bool:
-        config_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)),
-            "../../mcp_config.json"
-        )
-        try:
-            with open(config_path, 'r') as config_file:
-                mcp_config = json.load(config_file)
-        except Exception as e:
-            logger.error("Error reading MCP config: %s", e)
-            return False
+# Number of tools sent to the LLM per request
+DEFAULT_TOOL_TOP_K = int(os.environ.get("MCP_TOOL_TOP_K", "5"))
 
-        server_config = mcp_config.get("mcpServers", {}).get(self.server_key, {})
+# Seconds a server may take to start before its startup is abandoned
+DEFAULT_STARTUP_TIMEOUT = float(os.environ.get("MCP_CONNECT_TIMEOUT", "30"))
+
+
+class MCPSessionManager:
+    """
+    Owns the MCP server subprocesses for the lifetime of the application.
+
+    Each server runs inside its own long-lived task so the stdio transport and
+    the client session stay open until ``aclose()`` is called. Clients ask the
+    manager for a session and share the same live connection, so every node
+    server is spawned at most once per process.
+    """
+
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        tool_cache: Optional[ToolSchemaCache] = None,
+        startup_timeout: float = DEFAULT_STARTUP_TIMEOUT,
+    ) -> None:
+        self.config_path = config_path or DEFAULT_CONFIG_PATH
+        self.tool_cache = tool_cache or ToolSchemaCache()
+        self.startup_timeout = startup_timeout
+        self._config: Optional[Dict[str, Any]] = None
+        self._sessions: Dict[str, ClientSession] = {}
+        self._server_info: Dict[str, Any] = {}
+        self._ready: Dict[str, asyncio.Future] = {}
+        self._stop_events: Dict[str, asyncio.Event] = {}
+        self._runners: Dict[str, asyncio.Task] = {}
+
+    def load_config(self) -> Dict[str, Any]:
+        """Read the ``mcpServers`` section of the MCP config file once."""
+        if self._config is None:
+            try:
+                with open(self.config_path, "r") as config_file:
+                    self._config = json.load(config_file).get("mcpServers", {})
+            except Exception as e:
+                logger.error("Error reading MCP config: %s", e)
+                return {}
+        return self._config
+
+    def server_params(self, server_key: str) -> Optional[StdioServerParameters]:
+        """Build the stdio parameters for a configured server."""
+        server_config = self.load_config().get(server_key, {})
         if not server_config:
-            logger.error("No MCP configuration for %s found", self.server_key)
-            return False
+            logger.error("No MCP configuration for %s found", server_key)
+            return None
 
         params = {
             "command": server_config.get("command"),
@@ -38,36 +74,279 @@ class MCPClient:
             "encoding": server_config.get("encoding", "utf-8"),
             "encoding_error_handler": server_config.get("encoding_error_handler", "strict"),
         }
+        return StdioServerParameters(**params)
+
+    def is_running(self, server_key: str) -> bool:
+        return server_key in self._sessions
+
+    def server_info(self, server_key: str) -> Optional[Any]:
+        """Return the ``serverInfo`` reported by the server during initialize."""
+        return self._server_info.get(server_key)
+
+    def tool_cache_key(self, server_key: str) -> Optional[str]:
+        """Key of the server's tool cache entry: its command plus reported version."""
+        info = self._server_info.get(server_key)
+        if info is None:
+            return None
+        server_config = self.load_config().get(server_key, {})
+        return ToolSchemaCache.make_key(
+            server_config.get("command"),
+            server_config.get("args", []),
+            info.name,
+            info.version,
+        )
+
+    async def get_session(self, server_key: str) -> Optional[ClientSession]:
+        """
+        Return a live session for the server, starting it on first use.
+
+        Concurrent callers for the same server wait on the same startup. A
+        startup that takes longer than startup_timeout is abandoned, so the
+        next call starts the server afresh.
+
+        Args:
+            server_key: Key of the server in the MCP config.
+
+        Returns:
+            The initialized session, or None if the server could not start.
+        """
+        session = self._sessions.get(server_key)
+        if session is not None:
+            return session
+
+        ready = self._ready.get(server_key)
+        if ready is None:
+            params = self.server_params(server_key)
+            if params is None:
+                return None
+            ready = asyncio.get_running_loop().create_future()
+            stop_event = asyncio.Event()
+            self._ready[server_key] = ready
+            self._stop_events[server_key] = stop_event
+            self._runners[server_key] = asyncio.create_task(
+                self._run_server(server_key, params, ready, stop_event),
+                name=f"mcp-{server_key}",
+            )
 
         try:
-            mcp_params = StdioServerParameters(**params)
-            streams_cm = stdio_client(mcp_params)
-            transport = await self.exit_stack.enter_async_context(streams_cm)
-            read, write = transport
-            session = await self.exit_stack.enter_async_context(ClientSession(read, write))
-            await session.initialize()
-            self.session = session
-            return True
+            return await asyncio.wait_for(
+                asyncio.shield(ready), self.startup_timeout or None
+            )
+        except asyncio.TimeoutError:
+            logger.error(
+                "Timed out after %.0fs starting %s MCP server",
+                self.startup_timeout,
+                server_key,
+            )
+            if self._ready.get(server_key) is ready:
+                await self.abort(server_key)
+            return None
+        except Exception as e:
+            logger.error("Error connecting to %s MCP server: %s", server_key, e)
+            return None
+
+    async def _run_server(
+        self,
+        server_key: str,
+        params: StdioServerParameters,
+        ready: asyncio.Future,
+        stop_event: asyncio.Event,
+    ) -> None:
+        """
+        Hold the transport and session open until the server is stopped.
+
+        The runner owns its stop event: ``stop()`` may remove it from the
+        manager at any time, even before the session is ready.
+        """
+        try:
+            async with stdio_client(params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    init_result = await session.initialize()
+                    self._sessions[server_key] = session
+                    self._server_info[server_key] = init_result.serverInfo
+                    logger.info("Started %s MCP server", server_key)
+                    ready.set_result(session)
+                    await stop_event.wait()
         except Exception as e:
-            logger.error("Error connecting to %s MCP server: %s", self.server_key, e)
-            await self.cleanup()
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.error("%s MCP server exited: %s", server_key, e)
+        finally:
+            if not ready.done():
+                ready.set_exception(ConnectionError(f"{server_key} MCP server stopped"))
+            self._sessions.pop(server_key, None)
+            if self._ready.get(server_key) is ready:
+                del self._ready[server_key]
+            # After a crash, the next get_session() starts a fresh runner
+            if self._stop_events.get(server_key) is stop_event:
+                del self._stop_events[server_key]
+                self._runners.pop(server_key, None)
+
+    async def stop(self, server_key: str) -> None:
+        """Stop a single server and wait for its subprocess to exit."""
+        stop_event = self._stop_events.pop(server_key, None)
+        runner = self._runners.pop(server_key, None)
+        if stop_event is not None:
+            stop_event.set()
+        if runner is not None:
+            await asyncio.gather(runner, return_exceptions=True)
+
+    async def abort(self, server_key: str) -> None:
+        """
+        Cancel a server that is still starting (e.g. one that hangs during
+        initialize); a server that already started is left running.
+        """
+        ready = self._ready.get(server_key)
+        runner = self._runners.get(server_key)
+        if ready is None or ready.done() or runner is None:
+            return
+        self._stop_events.pop(server_key, None)
+        self._runners.pop(server_key, None)
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        # Waiters get the error; without any it would be reported as unretrieved
+        if ready.done() and not ready.cancelled():
+            ready.exception()
+
+    async def aclose(self) -> None:
+        """Stop every server owned by the manager."""
+        await asyncio.gather(*(self.stop(key) for key in list(self._runners)))
+        self._server_info.clear()
+
+
+def parse_tool_result(result: Any) -> Dict[str, Any]:
+    """
+    Decode a ``CallToolResult`` into a dictionary.
+
+    Servers return their payload as text content; JSON payloads are decoded,
+    anything else is returned under ``"text"``. Tool errors are reported under
+    ``"error"``.
+    """
+    text = "".join(
+        getattr(item, "text", "") for item in getattr(result, "content", None) or []
+    )
+    if getattr(result, "isError", False):
+        return {"error": text or "Tool call failed"}
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return {"text": text}
+    if isinstance(payload, dict):
+        return payload
+    return {"items": payload}
+
+
+class MCPClient:
+    # (pattern, tool names, boost) rules used by filter_tools; derived classes
+    # list the tools their usual tasks need
+    TOOL_RULES = ()
+
+    def __init__(self, manager: Optional[MCPSessionManager] = None) -> None:
+        self.session = None
+        self.manager = manager
+        self._owns_manager = manager is None
+        self.server_key = ""  # Derived classes should set this
+        self.tool_selector = ToolSelector(self.TOOL_RULES)
+
+    async def connect(self) -> bool:
+        if self.manager is None:
+            self.manager = MCPSessionManager()
+        session = await self.manager.get_session(self.server_key)
+        if session is None:
             return False
+        self.session = session
+        return True
+
+    async def ensure_connected(self) -> bool:
+        """
+        Make sure the client has a live session, connecting on first use.
+
+        Returns:
+            True if a session is available.
+        """
+        if self.session is not None and self.manager.is_running(self.server_key):
+            return True
+        self.session = None
+        return await self.connect()
 
     async def cleanup(self):
-        await self.exit_stack.aclose()
         self.session = None
-    
-    def filter_tools(self, tools: list[str]) -> list[str]:
+        # A shared manager is closed by whoever created it
+        if self._owns_manager and self.manager is not None:
+            await self.manager.aclose()
+
+    async def invoke_tool(
+        self, tool_name: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Call a tool on the server and decode its result.
+
+        Args:
+            tool_name: Name of the MCP tool.
+            arguments: Tool arguments.
+
+        Returns:
+            The decoded tool result (see ``parse_tool_result``).
+        """
+        result = await self.session.call_tool(tool_name, arguments or {})
+        return parse_tool_result(result)
+
+    async def get_tools(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get the server's tools as an Anthropic tool payload.
+
+        The payload is built once per server build and cached on disk, so tool
+        loops reuse it instead of listing tools on every call.
+
+        Args:
+            refresh: Ignore the cache and list tools from the server.
+
+        Returns:
+            List of tool definitions with name, description and input_schema.
+        """
+        if not await self.ensure_connected():
+            return []
+        key = self.manager.tool_cache_key(self.server_key)
+        if key and not refresh:
+            tools = self.manager.tool_cache.get(key)
+            if tools is not None:
+                return tools
+
+        tools_list = await self.session.list_tools()
+        tools = [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "input_schema": tool.inputSchema,
+            }
+            for tool in tools_list.tools
+        ]
+        if key:
+            self.manager.tool_cache.put(key, tools)
+        return tools
+
+    def invalidate_tools(self):
+        """Drop the cached tool payload for this server."""
+        key = self.manager.tool_cache_key(self.server_key) if self.manager else None
+        if key:
+            self.manager.tool_cache.invalidate(key)
+
+    def filter_tools(
+        self, task: str, tools: List[Dict[str, Any]], top_k: int = DEFAULT_TOOL_TOP_K
+    ) -> List[Dict[str, Any]]:
         """
         Filter the tools to only include those that are relevant to the current task. Reduces context and tokens for LLM
 
+        Tools are ranked by the client's keyword/regex rules plus the similarity
+        of a local embedding of the task to a cached embedding of each tool.
+
         Args:
-            tools: List of tool names to filter.
+            task: The task or prompt the tools will be used for.
+            tools: Anthropic tool payload, as returned by ``get_tools``.
+            top_k: Maximum number of tools to keep.
 
         Returns:
-            List of available tool names.
+            The top-k tools, most relevant first.
         """
-        # This is a placeholder implementation. The actual filtering logic should be defined based on your requirements.
-        # possibility with regex matching or embeddings; cache tools and embeddings for lower latency
-        # For now, it returns all tools.
-        return [tool for tool in tools if tool in self.session.tools]
+        return self.tool_selector.select(task, tools, top_k)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Section routing for Notion notes in JobTracker application.
+Builds an outline of a page's headings, picks the section a note belongs to
+with a cheap local scorer, and converts notes to Notion blocks.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+HEADING_TYPES = {"heading_1": 1, "heading_2": 2, "heading_3": 3}
+
+# Notion limits for a single text object and a single append request
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT_ITEMS = 100
+MAX_CHILDREN_PER_REQUEST = 100
+
+TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+# Words that identify the kind of note and the headings that suit it
+NOTE_KIND_WORDS = {
+    "call": {
+        "call",
+        "calls",
+        "phone",
+        "interview",
+        "interviews",
+        "screen",
+        "screens",
+        "conversation",
+        "conversations",
+        "meeting",
+        "meetings",
+    },
+    "email": {
+        "email",
+        "emails",
+        "mail",
+        "correspondence",
+        "message",
+        "messages",
+        "inbox",
+    },
+}
+# Headings that can hold any kind of interaction
+GENERIC_SECTION_WORDS = {
+    "interaction",
+    "interactions",
+    "notes",
+    "log",
+    "activity",
+    "timeline",
+    "history",
+    "updates",
+}
+
+KIND_MATCH_SCORE = 1.0
+GENERIC_MATCH_SCORE = 0.6
+OVERLAP_WEIGHT = 0.5
+
+
+def _tokens(text: str) -> set:
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def block_text(block: Dict[str, Any]) -> str:
+    """Plain text of a block's rich_text."""
+    content = block.get(block.get("type", ""), {}) or {}
+    return "".join(
+        item.get("plain_text") or item.get("text", {}).get("content", "")
+        for item in content.get("rich_text", [])
+    )
+
+
+class PageOutline:
+    """Top-level headings of a page and the last block of each heading's section."""
+
+    def __init__(self, blocks: List[Dict[str, Any]]):
+        """
+        Build the outline from a page's top-level blocks.
+
+        Args:
+            blocks: Top-level child blocks of the page, in order
+        """
+        # Each section: {"heading", "level", "heading_id", "last_block_id"}
+        self.sections: List[Dict[str, Any]] = []
+        open_sections: List[Dict[str, Any]] = []
+        for block in blocks:
+            level = HEADING_TYPES.get(block.get("type"))
+            if level is not None:
+                # A heading closes every open section of the same or a deeper level
+                open_sections = [
+                    section for section in open_sections if section["level"] < level
+                ]
+                section = {
+                    "heading": block_text(block),
+                    "level": level,
+                    "heading_id": block["id"],
+                    "last_block_id": block["id"],
+                }
+                self.sections.append(section)
+                open_sections.append(section)
+            for section in open_sections:
+                section["last_block_id"] = block["id"]
+
+    def headings(self) -> List[str]:
+        return [section["heading"] for section in self.sections]
+
+    def section_end(self, heading: str) -> Optional[str]:
+        """ID of the block new content should be inserted after for a section."""
+        for section in self.sections:
+            if section["heading"] == heading:
+                return section["last_block_id"]
+        return None
+
+    def record_append(self, heading: str, block_id: str):
+        """
+        Move a section's end, and the end of its enclosing sections, to a
+        newly appended block.
+        """
+        previous_end = self.section_end(heading)
+        for section in self.sections:
+            if section["last_block_id"] == previous_end:
+                section["last_block_id"] = block_id
+
+
+def note_kind(note: str) -> Optional[str]:
+    """Kind of note ("call" or "email") from its title line."""
+    title = _tokens(note.strip().split("\n", 1)[0])
+    for kind, words in NOTE_KIND_WORDS.items():
+        if title & words:
+            return kind
+    return None
+
+
+def classify_section(note: str, headings: List[str]) -> Tuple[Optional[str], float]:
+    """
+    Pick the heading a note belongs under.
+
+    Headings naming the note's kind ("Calls" for call notes) score highest,
+    generic interaction headings next, plus a bonus for words shared with the note.
+
+    Args:
+        note: Note text; its first line is the title (e.g. "Call Notes - 2025-01-01")
+        headings: Section headings on the page
+
+    Returns:
+        The best heading and a confidence between 0 and 1, or (None, 0.0)
+    """
+    kind = note_kind(note)
+    kind_words = NOTE_KIND_WORDS.get(kind, set())
+    note_tokens = _tokens(note)
+
+    best_heading, best_score = None, 0.0
+    for heading in headings:
+        heading_tokens = _tokens(heading)
+        if not heading_tokens:
+            continue
+        if heading_tokens & kind_words:
+            score = KIND_MATCH_SCORE
+        elif heading_tokens & GENERIC_SECTION_WORDS:
+            score = GENERIC_MATCH_SCORE
+        else:
+            score = (
+                OVERLAP_WEIGHT * len(heading_tokens & note_tokens) / len(heading_tokens)
+            )
+        if score > best_score:
+            best_heading, best_score = heading, score
+    return best_heading, min(best_score, 1.0)
+
+
+def _rich_text(text: str) -> List[Dict[str, Any]]:
+    chunks = [
+        text[i : i + MAX_TEXT_LENGTH] for i in range(0, len(text), MAX_TEXT_LENGTH)
+    ]
+    return [
+        {"type": "text", "text": {"content": chunk}}
+        for chunk in chunks[:MAX_RICH_TEXT_ITEMS]
+    ]
+
+
+def note_to_blocks(note: str) -> List[Dict[str, Any]]:
+    """
+    Convert a note to Notion blocks.
+
+    The title line becomes a bold paragraph (not a heading, so notes don't
+    show up as sections), "- " lines become bullets and every other
+    non-empty line a paragraph.
+
+    Args:
+        note: Note text
+
+    Returns:
+        List of block objects
+    """
+    lines = [line.rstrip() for line in note.strip().split("\n")]
+    blocks = []
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        rich_text = _rich_text(
+            line.lstrip()[2:] if line.lstrip().startswith("- ") else line
+        )
+        if index == 0:
+            block_type = "paragraph"
+            for item in rich_text:
+                item["annotations"] = {"bold": True}
+        elif line.lstrip().startswith("- "):
+            block_type = "bulleted_list_item"
+        else:
+            block_type = "paragraph"
+        blocks.append(
+            {
+                "object": "block",
+                "type": block_type,
+                block_type: {"rich_text": rich_text},
+            }
+        )
+    return blocks
@@ -7,29 +7,162 @@ import asyncio
 import json
 import logging
 import os
+import re
 from datetime import datetime
-from dotenv import load_dotenv
 from typing import Any, Dict, Optional, List
 
-#from openai import OpenAI, pydantic_function_tool
-from anthropic import Anthropic
+# from openai import OpenAI, pydantic_function_tool
 
 from mcp import StdioServerParameters, stdio_client, ClientSession
-from job_tracker.mcp_client import MCPClient
+from job_tracker.company_index import CompanyPageIndex, normalize_company_name
+from job_tracker.llm import DEFAULT_MODEL, SharedAnthropicClient
+from job_tracker.mcp_client import MCPClient, MCPSessionManager
+from job_tracker.notion_templates import APPLICATIONS_DATABASE, build_company_page
+from job_tracker.singleflight import SingleFlight
+from job_tracker.note_sections import (
+    MAX_CHILDREN_PER_REQUEST,
+    PageOutline,
+    classify_section,
+    note_to_blocks,
+)
 
 # configure logging
 logger = logging.getLogger("job-tracker.notion")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Minimum section-classifier confidence for appending without the LLM
+FAST_PATH_CONFIDENCE = float(os.environ.get("NOTION_FAST_PATH_CONFIDENCE", "0.5"))
+
+# Error text of a Notion request for a page that no longer exists
+MISSING_PAGE_PATTERN = re.compile(
+    r"object_not_found|could not find|not found|404", re.IGNORECASE
+)
+
+
+def page_title(page: Dict[str, Any]) -> str:
+    """Plain text of a page's title property."""
+    for prop in page.get("properties", {}).values():
+        if prop.get("type") == "title":
+            return rich_text_plain(prop.get("title", []))
+    return ""
+
+
+class PageNotFoundError(LookupError):
+    """A Notion page (e.g. an indexed company page) no longer exists."""
+
+
+def rich_text_plain(items: List[Dict[str, Any]]) -> str:
+    """Plain text of a rich text array."""
+    return "".join(
+        item.get("plain_text") or item.get("text", {}).get("content", "")
+        for item in items
+    )
+
+
+def property_type(prop: Dict[str, Any]) -> Optional[str]:
+    """Type of a database property, e.g. "select"."""
+    return prop.get("type") or next(iter(prop), None)
+
+
+def page_url(page_id: str) -> str:
+    """Notion URL of a page."""
+    return f"https://www.notion.so/{page_id.replace('-', '')}"
+
 
 class NotionClient(MCPClient):
-    def __init__(self) -> None:
-        super().__init__()
+    TOOL_RULES = (
+        (
+            r"\b(add|append|insert|write|notes?|content)\b",
+            ("notion_append_block_children",),
+            1.0,
+        ),
+        (
+            r"\b(sections?|headers?|headings?|existing)\b",
+            ("notion_retrieve_block_children",),
+            1.0,
+        ),
+        (r"\bpage\b", ("notion_retrieve_page",), 0.3),
+        (r"\b(search|find|look up)\b", ("notion_search",), 0.5),
+        (r"\b(status|propert(y|ies))\b", ("notion_update_page_properties",), 0.5),
+        (r"\bdatabase\b", ("notion_query_database",), 0.5),
+    )
+
+    def __init__(
+        self,
+        manager: Optional[MCPSessionManager] = None,
+        llm: Optional[SharedAnthropicClient] = None,
+        company_index: Optional[CompanyPageIndex] = None,
+    ) -> None:
+        super().__init__(manager)
         self.server_key = "notion"
+        self.llm = llm or SharedAnthropicClient()
+        self._owns_llm = llm is None
+        self.company_index = (
+            company_index if company_index is not None else CompanyPageIndex()
+        )
+        # Coalesces concurrent get_or_create_company calls per company
+        self._company_flights = SingleFlight()
+        # Job applications database found or created under NOTION_PAGE_ID
+        self._database_id: Optional[str] = None
+        self._database_flight = SingleFlight()
+        self._database_schemas: Dict[str, Dict[str, Any]] = {}
+        # page_id -> PageOutline, fetched once per page
+        self._outlines: Dict[str, PageOutline] = {}
+
+    async def cleanup(self):
+        if self._owns_llm:
+            await self.llm.aclose()
+        await super().cleanup()
+
+    async def seed_company_index(self) -> bool:
+        """
+        Seed the company index from the job applications database.
+
+        Returns:
+            True if the index was seeded.
+        """
+        if not await self.ensure_connected():
+            return False
+        database_id = await self.get_applications_database_id()
+        if not database_id:
+            return False
+
+        params = {"database_id": database_id}
+        count = 0
+        while True:
+            try:
+                result = await self.invoke_tool("notion_query_database", params)
+            except Exception as e:
+                logger.error("Error querying database %s: %s", database_id, e)
+                return False
+            if "error" in result:
+                logger.error(
+                    "Error querying database %s: %s", database_id, result["error"]
+                )
+                return False
+            for page in result.get("results", []):
+                title = page_title(page)
+                if title:
+                    self.company_index.add(title, page["id"], save=False)
+                    count += 1
+            if not result.get("has_more"):
+                break
+            params = {**params, "start_cursor": result.get("next_cursor")}
+
+        self.company_index.mark_seeded()
+        logger.info("Seeded company index with %d pages", count)
+        return True
 
     async def get_company_page_id(self, company_name: str, timeout: float = 10.0) -> Optional[str]:
         """
-        Retrieve the page ID for a given company by searching its name using the Notion API search endpoint.
+        Retrieve the page ID for a given company.
+
+        Looks the company up in the local index first (seeding it from the
+        database on first use) and only searches Notion on a miss. Indexed
+        pages are returned without a request: a page that turns out to be
+        deleted when content is appended is dropped from the index and
+        looked up again (see append_company_content). Search results only
+        count when a page title is the company name.
 
         Args:
             company_name: The company name to search.
@@ -38,19 +171,30 @@ class NotionClient(MCPClient):
         Returns:
             The page ID if found, or None otherwise.
         """
-        if not self.session:
+        page_id = self.company_index.lookup(company_name)
+        if page_id:
+            return page_id
+
+        if not await self.ensure_connected():
             logger.error("Session is not initialized.")
             return None
 
+        if not self.company_index.seeded_at and await self.seed_company_index():
+            page_id = self.company_index.lookup(company_name)
+            if page_id:
+                return page_id
+
         # Prepare the search parameters.
-        search_params = {"query": company_name}
+        search_params = {
+            "query": company_name,
+            "filter": {"property": "object", "value": "page"},
+        }
 
         try:
             # Call the tool 'notion_search' which proxies the Notion /search endpoint.
             search_result = await asyncio.wait_for(
-                self.session.call_tool("notion_search", search_params), timeout=timeout
+                self.invoke_tool("notion_search", search_params), timeout=timeout
             )
-            logger.info("Search result: %s", search_result)
         except asyncio.TimeoutError:
             logger.error("Timeout occurred during notion_search for company: %s", company_name)
             return None
@@ -58,27 +202,437 @@ class NotionClient(MCPClient):
             logger.error("Error calling notion_search: %s", e)
             return None
 
-        if not getattr(search_result, "content", None):
-            logger.error("No page found for company: %s", company_name)
+        # Only a page titled with the company name is the company's page; other
+        # hits merely mention it
+        key = normalize_company_name(company_name)
+        page = next(
+            (
+                page
+                for page in search_result.get("results", [])
+                if page.get("id")
+                and not page.get("archived")
+                and normalize_company_name(page_title(page)) == key
+            ),
+            None,
+        )
+        if page is None:
+            logger.info("No page titled %s found", company_name)
+            return None
+
+        self.company_index.add(page_title(page), page["id"], save=False)
+        self.company_index.add(company_name, page["id"])
+        return page["id"]
+
+    def forget_page(self, page_id: str):
+        """
+        Drop every company name mapped to a page from the index.
+
+        Args:
+            page_id: The ID of the Notion page (e.g. one that was deleted).
+        """
+        names = [
+            entry["name"]
+            for entry in self.company_index.pages.values()
+            if entry["page_id"] == page_id
+        ]
+        for name in names:
+            logger.info(
+                "Removing deleted page %s of %s from the company index", page_id, name
+            )
+            self.company_index.remove(name)
+        self._outlines.pop(page_id, None)
+
+    async def get_or_create_company(
+        self, company_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get an existing company page or create a new one.
+
+        Concurrent calls for the same company share one lookup-or-create, so
+        ingesting many emails at once never creates duplicate pages.
+
+        Args:
+            company_name: Name of the company
+
+        Returns:
+            Company page data ("id", "title", "url"), or None on failure
+        """
+        key = normalize_company_name(company_name) or company_name
+        return await self._company_flights.do(
+            key, self._get_or_create_company, company_name
+        )
+
+    async def _get_or_create_company(
+        self, company_name: str
+    ) -> Optional[Dict[str, Any]]:
+        page_id = await self.get_company_page_id(company_name)
+        if page_id:
+            return {"id": page_id, "title": company_name, "url": page_url(page_id)}
+        return await self.create_company_page(company_name)
+
+    async def get_applications_database_id(self, create: bool = False) -> Optional[str]:
+        """
+        ID of the job applications database: NOTION_DATABASE_ID, or else the
+        database titled APPLICATIONS_DATABASE["title"] under NOTION_PAGE_ID.
+
+        Args:
+            create: Create the database under NOTION_PAGE_ID if it is missing
+
+        Returns:
+            The database ID, or None if there is none (or it can't be found)
+        """
+        database_id = os.environ.get("NOTION_DATABASE_ID") or self._database_id
+        if database_id:
+            return database_id
+        parent_id = os.environ.get("NOTION_PAGE_ID")
+        if not parent_id:
+            return None
+        return await self._database_flight.do(
+            create, self._find_or_create_database, parent_id, create
+        )
+
+    async def _find_or_create_database(
+        self, parent_id: str, create: bool
+    ) -> Optional[str]:
+        title = APPLICATIONS_DATABASE["title"]
+        try:
+            result = await self.invoke_tool(
+                "notion_search",
+                {
+                    "query": title,
+                    "filter": {"property": "object", "value": "database"},
+                },
+            )
+        except Exception as e:
+            result = {"error": str(e)}
+        if "error" in result:
+            logger.error(
+                "Error searching for the %s database: %s", title, result["error"]
+            )
+            return None
+
+        parent_key = parent_id.replace("-", "")
+        for database in result.get("results", []):
+            parent = database.get("parent", {}).get("page_id") or ""
+            if (
+                database.get("id")
+                and not database.get("archived")
+                and rich_text_plain(database.get("title", [])) == title
+                and parent.replace("-", "") == parent_key
+            ):
+                self._database_id = database["id"]
+                return self._database_id
+        if not create:
             return None
 
         try:
-            return search_result.content[0]
-        except (KeyError, IndexError) as e:
-            logger.error("Error parsing search result: %s", e)
+            result = await self.invoke_tool(
+                "notion_create_database",
+                {
+                    "parent": {"type": "page_id", "page_id": parent_id},
+                    "title": [{"type": "text", "text": {"content": title}}],
+                    "properties": APPLICATIONS_DATABASE["properties"],
+                },
+            )
+        except Exception as e:
+            result = {"error": str(e)}
+        if "error" in result or not result.get("id"):
+            logger.error(
+                "Error creating the %s database under page %s: %s",
+                title,
+                parent_id,
+                result.get("error", result),
+            )
             return None
-    
-    async def get_or_create_company(self, company_name: str) -> Dict[str, Any]:
+        self._database_id = result["id"]
+        if result.get("properties"):
+            self._database_schemas[self._database_id] = result["properties"]
+        logger.info(
+            "Created the %s database %s under page %s "
+            "(set NOTION_DATABASE_ID to use it directly)",
+            title,
+            self._database_id,
+            parent_id,
+        )
+        return self._database_id
+
+    async def _get_database_schema(self, database_id: str) -> Dict[str, Any]:
+        """Property schema of a database, fetched once."""
+        schema = self._database_schemas.get(database_id)
+        if schema is None:
+            result = await self.invoke_tool(
+                "notion_retrieve_database", {"database_id": database_id}
+            )
+            if "error" in result:
+                logger.error(
+                    "Error retrieving database %s: %s", database_id, result["error"]
+                )
+                return {}
+            schema = result.get("properties", {})
+            self._database_schemas[database_id] = schema
+        return schema
+
+    async def create_company_page(self, company_name: str) -> Optional[Dict[str, Any]]:
         """
-        Get an existing company page or create a new one.
-        
+        Create a company page in the job applications database from
+        COMPANY_TEMPLATE. Without NOTION_DATABASE_ID the database is found or
+        created under NOTION_PAGE_ID.
+
         Args:
             company_name: Name of the company
-            
+
         Returns:
-            Company page data
+            Company page data ("id", "title", "url", and "template_error",
+            set if the page was created without its template sections), or
+            None on failure
         """
-        pass
+        if not await self.ensure_connected():
+            logger.error("Not connected to Notion MCP server")
+            return None
+        database_id = await self.get_applications_database_id(create=True)
+        if not database_id:
+            logger.error(
+                "No job applications database (set NOTION_DATABASE_ID or "
+                "NOTION_PAGE_ID); cannot create page for %s",
+                company_name,
+            )
+            return None
+
+        template = build_company_page(company_name)
+        schema = await self._get_database_schema(database_id)
+        title_property = next(
+            (name for name, prop in schema.items() if prop.get("type") == "title"),
+            "Name",
+        )
+        # The company name is the page title; template properties the database
+        # doesn't have (or has with another type) would make Notion reject the page
+        properties = {
+            name: value
+            for name, value in template["properties"].items()
+            if name in schema
+            and name != title_property
+            and property_type(schema[name]) in value
+        }
+        properties[title_property] = {
+            "title": [{"text": {"content": template["title"]}}]
+        }
+
+        try:
+            result = await self.invoke_tool(
+                "notion_create_database_item",
+                {"database_id": database_id, "properties": properties},
+            )
+            if "error" in result or not result.get("id"):
+                logger.error(
+                    "Error creating page for %s: %s",
+                    company_name,
+                    result.get("error", result),
+                )
+                return None
+        except Exception as e:
+            logger.error("Error creating page for %s: %s", company_name, e)
+            return None
+        page_id = result["id"]
+
+        # The page exists either way; without the template it just has no sections
+        try:
+            template_result = await self.invoke_tool(
+                "notion_append_block_children",
+                {"block_id": page_id, "children": template["children"]},
+            )
+        except Exception as e:
+            template_result = {"error": str(e)}
+        if "error" in template_result:
+            logger.error(
+                "Created page for %s (%s) but could not add the template: %s",
+                company_name,
+                page_id,
+                template_result["error"],
+            )
+        else:
+            logger.info("Created Notion page for %s: %s", company_name, page_id)
+
+        self.company_index.add(company_name, page_id)
+        return {
+            "id": page_id,
+            "title": company_name,
+            "url": result.get("url") or page_url(page_id),
+            "template_error": template_result.get("error"),
+        }
+
+    async def get_page_outline(self, page_id: str) -> Optional[PageOutline]:
+        """
+        Get the section outline of a page, fetching its top-level blocks once.
+
+        Args:
+            page_id: The ID of the Notion page.
+
+        Returns:
+            The page outline, or None if the blocks could not be fetched.
+
+        Raises:
+            PageNotFoundError: If the page no longer exists.
+        """
+        outline = self._outlines.get(page_id)
+        if outline is not None:
+            return outline
+
+        blocks = []
+        params = {"block_id": page_id, "page_size": 100}
+        while True:
+            try:
+                result = await self.invoke_tool(
+                    "notion_retrieve_block_children", params
+                )
+            except Exception as e:
+                logger.error("Error retrieving blocks for page %s: %s", page_id, e)
+                return None
+            if "error" in result:
+                if MISSING_PAGE_PATTERN.search(str(result["error"])):
+                    raise PageNotFoundError(page_id)
+                logger.error(
+                    "Error retrieving blocks for page %s: %s", page_id, result["error"]
+                )
+                return None
+            blocks.extend(result.get("results", []))
+            if not result.get("has_more"):
+                break
+            params = {**params, "start_cursor": result.get("next_cursor")}
+
+        outline = PageOutline(blocks)
+        self._outlines[page_id] = outline
+        return outline
+
+    async def fast_append_content(
+        self, page_id: str, text_content: str
+    ) -> Optional[str]:
+        """
+        Append content under the best matching section without calling the LLM.
+
+        Args:
+            page_id: The ID of the Notion page.
+            text_content: The content to append; its first line is the title.
+
+        Returns:
+            A short description of what was appended, or None when nothing
+            was appended because no section matched with enough confidence or
+            the first request failed (the caller should fall back to the LLM).
+            If a later request fails twice, the description says how many
+            blocks were appended.
+
+        Raises:
+            PageNotFoundError: If the page no longer exists.
+        """
+        if not await self.ensure_connected():
+            return None
+        outline = await self.get_page_outline(page_id)
+        if outline is None:
+            return None
+        heading, confidence = classify_section(text_content, outline.headings())
+        if heading is None or confidence < FAST_PATH_CONFIDENCE:
+            logger.info(
+                "No confident section match (%.2f) for page %s", confidence, page_id
+            )
+            return None
+
+        blocks = note_to_blocks(text_content)
+        for start in range(0, len(blocks), MAX_CHILDREN_PER_REQUEST):
+            # Once part of the note is on the page, retry rather than hand the
+            # whole note to the LLM again
+            for attempt in range(1 if start == 0 else 2):
+                params = {
+                    "block_id": page_id,
+                    "children": blocks[start : start + MAX_CHILDREN_PER_REQUEST],
+                    "after": outline.section_end(heading),
+                }
+                try:
+                    result = await self.invoke_tool(
+                        "notion_append_block_children", params
+                    )
+                except Exception as e:
+                    result = {"error": str(e)}
+                if "error" not in result:
+                    break
+                if MISSING_PAGE_PATTERN.search(str(result["error"])):
+                    self._outlines.pop(page_id, None)
+                    raise PageNotFoundError(page_id)
+                logger.error("Error appending to page %s: %s", page_id, result["error"])
+            if "error" in result:
+                # The outline may be stale; refetch it next time
+                self._outlines.pop(page_id, None)
+                if start == 0:
+                    return None
+                return (
+                    f"Appended {start} of {len(blocks)} blocks "
+                    f"under section '{heading}'; the rest failed: {result['error']}"
+                )
+            appended = result.get("results", [])
+            if appended:
+                outline.record_append(heading, appended[-1]["id"])
+
+        logger.info(
+            "Appended %d blocks under '%s' (confidence %.2f)",
+            len(blocks),
+            heading,
+            confidence,
+        )
+        return f"Appended {len(blocks)} blocks under section '{heading}'"
+
+    async def append_content(self, page_id: str, text_content: str) -> str:
+        """
+        Append content to a page, using the LLM only when the local section
+        match is unsure.
+
+        Args:
+            page_id: The ID of the Notion page.
+            text_content: The content to append.
+
+        Returns:
+            Description of the append.
+
+        Raises:
+            PageNotFoundError: If the page no longer exists.
+        """
+        result = await self.fast_append_content(page_id, text_content)
+        if result is not None:
+            return result
+        result = await self.dynamic_append_content(page_id, text_content)
+        # The LLM may have added sections; refetch the outline next time
+        self._outlines.pop(page_id, None)
+        return result
+
+    async def append_company_content(
+        self, company_name: str, page_id: str, text_content: str
+    ) -> Optional[str]:
+        """
+        Append content to a company's page. If the page turns out to be
+        deleted, it is dropped from the index and the company's page is
+        looked up (or created) again, once.
+
+        Args:
+            company_name: Name of the company.
+            page_id: The ID of the company's page, as last known.
+            text_content: The content to append.
+
+        Returns:
+            Description of the append, or None if there is no page to append to.
+        """
+        try:
+            return await self.append_content(page_id, text_content)
+        except PageNotFoundError:
+            logger.info("Page %s of %s no longer exists", page_id, company_name)
+            self.forget_page(page_id)
+            if not company_name:
+                return None
+        page = await self.get_or_create_company(company_name)
+        if not page:
+            return None
+        try:
+            return await self.append_content(page["id"], text_content)
+        except PageNotFoundError:
+            logger.error("Page %s of %s does not exist", page["id"], company_name)
+            self.forget_page(page["id"])
+            return None
 
     async def dynamic_append_content(self, page_id: str, text_content: str) -> str:
         """
@@ -91,75 +645,87 @@ class NotionClient(MCPClient):
         Returns:
             The final accumulated text.
         """
-        load_dotenv()
-        anthropic = Anthropic()
+        anthropic = self.llm.client
         prompt = (
             f"Add the following content to the page: {text_content}. "
             f"The company's page ID is {page_id}. "
             "Decide whether to append this content to an existing section or new one on the page."
-            "Do not just blindly append the content to the end of the page. Consider the different section headers and add to the correct one if applicable."
+            "Do not just blindly append the content to the end of the page. "
+            "Consider the different section headers and add to the correct one "
+            "if applicable. "
+            "Make independent tool calls in the same turn so they run together."
         )
         messages = [{"role": "user", "content": prompt}]
-        tools_list = await self.session.list_tools()  # cache tools
-        tools_serializable = [{
-            "name": tool.name,
-            "description": tool.description,
-            "input_schema": tool.inputSchema
-        } for tool in tools_list.tools]
-        llm_response = anthropic.messages.create(
-            model='claude-3-5-sonnet-20241022',
+        tools_serializable = self.filter_tools(prompt, await self.get_tools())
+        llm_response = await anthropic.messages.create(
+            model=DEFAULT_MODEL,
             messages=messages,
             max_tokens=1000,
             tools=tools_serializable,
         )
         final_text = []
         while True:
-            assistant_message_content = []
+            tool_uses = []
             for content in llm_response.content:
                 if content.type == 'text':
                     final_text.append(content.text)
-                    assistant_message_content.append(content)
                 elif content.type == 'tool_use':
-                    tool_name = content.name
-                    tool_args = content.input
-                    result = await self.session.call_tool(tool_name, tool_args)
-                    final_text.append(f"[Calling tool {tool_name} with args {tool_args}]")
-                    
-                    # Append assistant's message (including tool_use)
-                    assistant_message_content.append(content)                   
-
-                    messages.append({
-                        "role": "assistant",
-                        "content": assistant_message_content
-                    })
-
-                    # Append tool result
-                    messages.append({
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "tool_result",
-                                "tool_use_id": content.id,
-                                "content": result.content
-                            }
-                        ]
-                    })
-
-                    # Call Claude again after tool execution
-                    llm_response = anthropic.messages.create(
-                        model="claude-3-5-sonnet-20241022",
-                        max_tokens=1000,
-                        messages=messages,
-                        tools=tools_serializable
+                    tool_uses.append(content)
+                    final_text.append(
+                        f"[Calling tool {content.name} with args {content.input}]"
                     )
-
-                    # Break inner loop to process next response
-                    break
-            else:
+            if not tool_uses:
                 # No tool use found, exit loop
                 break
+
+            # Run every tool call of this turn concurrently and return all the
+            # results in a single user message
+            tool_results = await asyncio.gather(
+                *(self._run_tool_use(block) for block in tool_uses)
+            )
+            messages.append({"role": "assistant", "content": llm_response.content})
+            messages.append({"role": "user", "content": list(tool_results)})
+
+            # Call Claude again after tool execution
+            llm_response = await anthropic.messages.create(
+                model=DEFAULT_MODEL,
+                max_tokens=1000,
+                messages=messages,
+                tools=tools_serializable,
+            )
         return "\n".join(final_text)
 
+    async def _run_tool_use(self, block: Any) -> Dict[str, Any]:
+        """
+        Execute one tool_use block and build its tool_result block.
+
+        Args:
+            block: The tool_use content block from the model.
+
+        Returns:
+            A tool_result content block.
+        """
+        try:
+            result = await self.session.call_tool(block.name, block.input)
+        except Exception as e:
+            logger.error("Error calling tool %s: %s", block.name, e)
+            return {
+                "type": "tool_result",
+                "tool_use_id": block.id,
+                "content": str(e),
+                "is_error": True,
+            }
+        return {
+            "type": "tool_result",
+            "tool_use_id": block.id,
+            "content": [
+                {"type": "text", "text": item.text}
+                for item in result.content
+                if getattr(item, "text", None)
+            ],
+            "is_error": result.isError,
+        }
+
     async def add_content_to_company_page(self, company_name: str, content: str):
         """
         Adds content to a company's Notion page.
@@ -176,9 +742,33 @@ class NotionClient(MCPClient):
             logger.error(f"Page ID not found for company: {company_name}")
             return False
         logger.info(f"Page ID for {company_name}: {page_id}")
-        result_text = await self.dynamic_append_content(page_id, content)
+        result_text = await self.append_company_content(company_name, page_id, content)
         return result_text
 
+    async def add_content_to_company_pages(
+        self, contents: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Adds content to several company pages concurrently.
+
+        Args:
+            contents: Mapping of company name to the content to add.
+
+        Returns:
+            Mapping of company name to the result of ``add_content_to_company_page``.
+        """
+        results = await asyncio.gather(
+            *(
+                self.add_content_to_company_page(name, content)
+                for name, content in contents.items()
+            ),
+            return_exceptions=True,
+        )
+        for name, result in zip(contents, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error adding content for {name}: {result}")
+        return dict(zip(contents, results))
+
     async def add_call_notes(
         self, 
         company_page: Dict[str, Any], 
@@ -198,7 +788,7 @@ class NotionClient(MCPClient):
         Returns:
             Updated company page data.
         """
-        if not self.session:
+        if not await self.ensure_connected():
             logger.error("Not connected to Notion MCP server")
             return company_page
         page_id = company_page.get("id")
@@ -210,7 +800,9 @@ class NotionClient(MCPClient):
         for point in key_points:
             notes_text += f"- {point}\n"
         notes_text += "\nTranscript:\n" + transcript.strip()
-        llm_result = await self.dynamic_append_content(page_id, notes_text)
+        llm_result = await self.append_company_content(
+            company_page.get("title"), page_id, notes_text
+        )
         logger.info("Added call notes to company page")
         return llm_result
 
@@ -231,7 +823,7 @@ class NotionClient(MCPClient):
         Returns:
             Updated company page data.
         """
-        if not self.session:
+        if not await self.ensure_connected():
             logger.error("Not connected to Notion MCP server")
             return company_page
         page_id = company_page.get("id")
@@ -252,6 +844,8 @@ class NotionClient(MCPClient):
         for point in key_points:
             notes_text += f"- {point}\n"
         notes_text += "\nEmail Content:\n" + email_data.get("body", "").strip()
-        llm_result = await self.dynamic_append_content(page_id, notes_text)
+        llm_result = await self.append_company_content(
+            company_page.get("title"), page_id, notes_text
+        )
         # TODO: any properties to update?
-        return llm_result
\ No newline at end of file
+        return llm_result
@@ -1,3 +1,4 @@
+import copy
 from datetime import datetime
 
 # Template for company pages
@@ -6,7 +7,7 @@ COMPANY_TEMPLATE = {
     "properties": {
         "Status": {"select": {"name": "Applied"}},
         "Application Date": {"date": {"start": datetime.now().isoformat()}},
-        "Position": {"title": [{"text": {"content": "Unknown"}}]},
+        "Position": {"rich_text": [{"text": {"content": "Unknown"}}]},
         "Contact": {"rich_text": [{"text": {"content": ""}}]},
         "Next Step": {"select": {"name": "Follow Up"}},
         "Priority": {"select": {"name": "Medium"}},
@@ -17,14 +18,44 @@ COMPANY_TEMPLATE = {
             "type": "heading_1",
             "heading_1": {
                 "rich_text": [{"type": "text", "text": {"content": "Interactions"}}]
-            }
+            },
         },
         {
             "object": "block",
             "type": "paragraph",
             "paragraph": {
-                "rich_text": [{"type": "text", "text": {"content": "Record of interactions with the company."}}]
-            }
-        }
-    ]
-}
\ No newline at end of file
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": "Record of interactions with the company."},
+                    }
+                ]
+            },
+        },
+    ],
+}
+
+# Job applications database, created under NOTION_PAGE_ID when
+# NOTION_DATABASE_ID is not set
+APPLICATIONS_DATABASE = {
+    "title": "Job Applications",
+    "properties": {
+        "Name": {"title": {}},
+        "Status": {"select": {}},
+        "Application Date": {"date": {}},
+        "Position": {"rich_text": {}},
+        "Contact": {"rich_text": {}},
+        "Next Step": {"select": {}},
+        "Priority": {"select": {}},
+    },
+}
+
+
+def build_company_page(company_name):
+    """Return a filled-in copy of COMPANY_TEMPLATE for a company."""
+    page = copy.deepcopy(COMPANY_TEMPLATE)
+    page["title"] = company_name
+    page["properties"]["Application Date"] = {
+        "date": {"start": datetime.now().isoformat()}
+    }
+    return page
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Single-flight call coalescing for JobTracker application.
+Concurrent calls that share a key wait on one in-flight call instead of
+each doing the same work.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent async calls with the same key."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(
+        self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        """
+        Run ``func(*args, **kwargs)`` unless a call with the same key is
+        already running.
+
+        Args:
+            key: Identifies equivalent calls
+            func: Coroutine function to run
+
+        Returns:
+            The result of the shared call (its exception is raised to every waiter)
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # Shield so one cancelled waiter doesn't cancel the call for everyone
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
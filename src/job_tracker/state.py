@@ -5,180 +5,807 @@ Maintains the state of job applications across sessions.
 """
 
 import os
-import json
+import copy
+import atexit
+import itertools
+import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 import threading
 
+from job_tracker.company_index import company_identity_key
+from job_tracker.file_lock import FileLock
+from job_tracker.interaction_archive import InteractionArchive
+from job_tracker.state_backends import create_backend
+from job_tracker.state_events import empty_stats, funnel_merge, funnel_transition
+from job_tracker.state_index import StateIndexes, date_key
+
 logger = logging.getLogger("job-tracker.state")
 
+# Storage backend used when none is passed explicitly ("json" or "sqlite")
+DEFAULT_BACKEND = os.environ.get("JOB_TRACKER_STATE_BACKEND", "json")
+
+# Write-behind defaults: flush pending changes after this many seconds or this
+# many dirty writes, whichever comes first (0 disables write-behind)
+DEFAULT_FLUSH_INTERVAL = float(os.environ.get("JOB_TRACKER_STATE_FLUSH_INTERVAL", "0"))
+DEFAULT_FLUSH_THRESHOLD = int(os.environ.get("JOB_TRACKER_STATE_FLUSH_THRESHOLD", "0"))
+
+# Interactions kept per company in the main state; older ones are archived.
+# Off by default (0 keeps every interaction in the main state)
+DEFAULT_MAX_INTERACTIONS = int(os.environ.get("JOB_TRACKER_MAX_INTERACTIONS", "0"))
+
+# Decode stored companies only when they are first accessed (SQLite and
+# event log backends)
+DEFAULT_LAZY_LOAD = os.environ.get("JOB_TRACKER_STATE_LAZY", "0").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Page size for iter_interactions
+DEFAULT_INTERACTION_PAGE_SIZE = 50
+
 class StateManager:
     """Manages application state for job search tracking."""
-    
-    def __init__(self, state_file: str = None):
+
+    def __init__(
+        self,
+        state_file: str = None,
+        backend: Any = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_threshold: int = DEFAULT_FLUSH_THRESHOLD,
+        max_interactions: int = DEFAULT_MAX_INTERACTIONS,
+        archive_dir: str = None,
+        lazy_load: bool = DEFAULT_LAZY_LOAD,
+    ):
         """
         Initialize the state manager.
-        
+
         Args:
-            state_file: Path to the state file (default: ~/.job-tracker/state.json)
+            state_file: Path to the state file (default: ~/.job-tracker/state.json,
+                or ~/.job-tracker/state.db for the SQLite backend)
+            backend: "json", "sqlite", "eventlog" or a backend instance
+                (default: JOB_TRACKER_STATE_BACKEND, else "json")
+            flush_interval: Write-behind mode; seconds after the first unsaved
+                change before it is flushed (0: no timer)
+            flush_threshold: Write-behind mode; number of unsaved writes that
+                triggers a flush (0: no threshold)
+            max_interactions: Interactions kept per company in the main state;
+                older ones move to the archive (0: keep all)
+            archive_dir: Directory for archived interactions
+                (default: "archive" next to the state file)
+            lazy_load: Decode each company only when it is first accessed, and
+                build the query indexes on the first query (ignored for a
+                backend instance, and by the JSON backend)
+
+        With neither flush_interval nor flush_threshold set, every update is
+        saved immediately.
         """
-        # Use default path if not provided
-        if not state_file:
-            home_dir = os.path.expanduser("~")
-            state_dir = os.path.join(home_dir, ".job-tracker")
-            if not os.path.exists(state_dir):
-                os.makedirs(state_dir)
-            self.state_file = os.path.join(state_dir, "state.json")
-        else:
-            self.state_file = state_file
-        
+        home_dir = os.path.expanduser("~")
+        state_dir = os.path.join(home_dir, ".job-tracker")
+        if not state_file and not os.path.exists(state_dir):
+            os.makedirs(state_dir)
+
+        if backend is None or isinstance(backend, str):
+            backend = create_backend(
+                backend or DEFAULT_BACKEND, state_dir, state_file, lazy=lazy_load
+            )
+        self.backend = backend
+        self.state_file = backend.path
+
+        # Other processes may share the store: writes take an inter-process
+        # lock and bump a version stamp, and a writer that finds the stamp
+        # changed since it last loaded merges its changes into the stored state
+        self.file_lock = FileLock(f"{self.state_file}.lock")
+        self.version_file = f"{self.state_file}.version"
+        self.version = 0
+        # (open version file, stamp) we last read or wrote
+        self._version_seen = None
+
+        # Bounded hot history; the rest lives in compressed per-company archives
+        self.max_interactions = max_interactions
+        self.archive = InteractionArchive(
+            archive_dir
+            or os.path.join(os.path.dirname(self.state_file) or ".", "archive")
+        )
+
         # Initialize state
         self.state = {
             "version": "1.0",
             "last_updated": datetime.now().isoformat(),
             "companies": {},
-            "stats": {
-                "applications_sent": 0,
-                "interviews_scheduled": 0,
-                "offers_received": 0,
-                "rejections": 0
-            },
-            "settings": {}
+            "stats": empty_stats(),
+            "settings": {},
+            # Explicit aliases: normalized name -> canonical company name
+            "aliases": {},
         }
-        
-        # Thread lock for thread safety
-        self.lock = threading.Lock()
-        
+
+        # Serializes writers (reentrant, so nested mutations can't deadlock).
+        # Readers never take it: they read the current immutable snapshot.
+        self.lock = threading.RLock()
+
+        # Writer task for the async API, created on first use per event loop
+        self._writer: Optional[asyncio.Task] = None
+        self._writer_loop = None
+        self._writer_queue: Optional[asyncio.Queue] = None
+
+        # Secondary indexes for the query methods, maintained by writers
+        self.indexes = StateIndexes()
+
+        # Company identity: records are keyed by a canonical name (the first
+        # spelling seen); every normalized spelling and explicit alias maps to it
+        self._aliases: Dict[str, str] = {}
+        # Raw name -> canonical name, so repeat lookups skip normalization
+        self._resolved: Dict[str, str] = {}
+
+        # Write-behind bookkeeping
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.write_behind = bool(flush_interval or flush_threshold)
+        self._pending_changes: List[tuple] = []
+        self._dirty_writes = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self.write_stats = {
+            "writes": 0,
+            "flushes": 0,
+            "coalesced_writes": 0,
+            "merges": 0,
+        }
+        if self.write_behind:
+            atexit.register(self.flush)
+
         # Load existing state if it exists
         self._load_state()
-        
+
         logger.info(f"State manager initialized with state file: {self.state_file}")
-    
+
     def _load_state(self):
-        """Load state from file if it exists."""
-        if os.path.exists(self.state_file):
-            try:
-                with open(self.state_file, 'r') as f:
-                    loaded_state = json.load(f)
-                    # Update our state with loaded state
-                    self.state.update(loaded_state)
-                logger.info(f"Loaded state from {self.state_file}")
-            except Exception as e:
-                logger.error(f"Error loading state from {self.state_file}: {e}")
-                # Create backup of corrupted state file
-                if os.path.exists(self.state_file):
-                    backup_file = f"{self.state_file}.bak.{datetime.now().strftime('%Y%m%d%H%M%S')}"
-                    try:
-                        with open(self.state_file, 'r') as src, open(backup_file, 'w') as dst:
-                            dst.write(src.read())
-                        logger.info(f"Created backup of corrupted state file: {backup_file}")
-                    except Exception as backup_err:
-                        logger.error(f"Failed to backup corrupted state file: {backup_err}")
-    
-    def _save_state(self):
-        """Save current state to file."""
+        """Load state from the backend if it has any."""
+        with self.file_lock:
+            loaded_state = self.backend.load()
+            self.version = self._read_version()
+        if loaded_state:
+            # Update our state with loaded state
+            self.state.update(loaded_state)
+        self._report_duplicate_companies()
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """Rebuild the query and alias indexes from the current snapshot."""
+        companies = self.state["companies"]
+        self.indexes.rebuild(companies)
+        aliases = {}
+        for name in companies:
+            aliases.setdefault(company_identity_key(name) or name, name)
+        for alias, name in self.state.get("aliases", {}).items():
+            if name in companies:
+                aliases[alias] = name
+        self._aliases = aliases
+        self._resolved = {}
+
+    def _report_duplicate_companies(self):
+        """
+        Log records whose names look like one company; merging them is left
+        to merge_companies().
+        """
+        groups: Dict[str, List[str]] = {}
+        for name in self.state["companies"]:
+            groups.setdefault(company_identity_key(name) or name, []).append(name)
+        for names in groups.values():
+            if len(names) > 1:
+                logger.warning(
+                    f"Company records {names} may be one company; "
+                    "merge them with merge_companies()"
+                )
+
+    def merge_companies(self, other: str, company_name: str):
+        """
+        Merge another company record into a company's record. Records are
+        only ever merged on request: names that merely normalize alike may
+        belong to different companies.
+
+        The merged record's interactions (hot and archived) are interleaved
+        with the company's by date, funnel steps both records counted are
+        counted once, and the other name becomes an alias of the company.
+
+        Args:
+            other: Name of the record to merge (any spelling or alias)
+            company_name: Name (or alias) of the company that absorbs it
+        """
+        self.add_company_alias(other, company_name)
+
+    def _fold_company(
+        self,
+        companies: Dict[str, Any],
+        stats: Dict[str, int],
+        canonical: str,
+        other: str,
+    ) -> List[tuple]:
+        """
+        Merge another record for the same company into the canonical one.
+        Callers must hold the lock; companies and stats are dicts they own.
+
+        Returns:
+            Change records for the merge
+        """
+        target = dict(companies[canonical])
+        source = companies.pop(other)
+        funnel_merge(stats, target.get("status"), source.get("status"))
+
+        # Interleave both histories by date. The hot part keeps as many
+        # interactions as both records had hot (up to the limit); the rest
+        # is the canonical archive.
+        archived = list(
+            self.archive.iter_interactions(
+                canonical, target.get("archived_interactions", 0)
+            )
+        )
+        archived += self.archive.iter_interactions(
+            other, source.get("archived_interactions", 0)
+        )
+        hot = target.get("interactions", []) + source.get("interactions", [])
+        history = sorted(
+            archived + hot,
+            key=lambda interaction: date_key(interaction.get("date")) or 0.0,
+        )
+        hot_count = (
+            min(len(hot), self.max_interactions) if self.max_interactions else len(hot)
+        )
+        split = len(history) - hot_count
+        if split or archived:
+            self.archive.rewrite(canonical, history[:split])
+            target["archived_interactions"] = split
+        self.archive.remove(other)
+
+        # Canonical fields win, except the most recent interaction
+        for key, value in source.items():
+            target.setdefault(key, value)
+        if (date_key(source.get("last_interaction_date")) or 0.0) > (
+            date_key(target.get("last_interaction_date")) or 0.0
+        ):
+            for key in ("last_interaction", "last_interaction_date"):
+                if key in source:
+                    target[key] = source[key]
+        target["interactions"] = history[split:]
+        companies[canonical] = target
+        logger.info(f"Merged company record '{other}' into '{canonical}'")
+
+        fields = tuple(sorted(key for key in target if key != "interactions"))
+        return [
+            ("rename", other, canonical),
+            ("company", canonical, fields),
+            ("stats",),
+        ]
+
+    def resolve_company(self, company_name: str) -> str:
+        """
+        Get the canonical name for a company.
+
+        Args:
+            company_name: Company name in any spelling, or an alias
+
+        Returns:
+            Name of the existing record it refers to, else company_name itself
+        """
+        canonical = self._resolved.get(company_name)
+        if canonical is not None:
+            return canonical
+        canonical = self._aliases.get(
+            company_identity_key(company_name) or company_name
+        )
+        if canonical is None:
+            return company_name
+        self._resolved[company_name] = canonical
+        return canonical
+
+    def add_company_alias(self, alias: str, company_name: str):
+        """
+        Make another name refer to a company (e.g. a product or old name).
+        A separate record already stored under the alias is merged in
+        (see merge_companies).
+
+        Args:
+            alias: Alternative name
+            company_name: Name (or alias) of the company
+        """
+        key = company_identity_key(alias) or alias
+        # A merge rewrites archives; they change under the same inter-process
+        # lock as the state that refers to them
+        with self.lock, self.file_lock:
+            canonical = self.resolve_company(company_name)
+            changes = []
+            aliases = dict(self.state.get("aliases", {}))
+            # An exact record name wins over a spelling that resolves elsewhere
+            other = (
+                alias if alias in self.state["companies"] else self._aliases.get(key)
+            )
+            if (
+                other is not None
+                and other != canonical
+                and canonical in self.state["companies"]
+            ):
+                companies = self.state["companies"].copy()
+                stats = dict(self.state["stats"])
+                changes.extend(self._fold_company(companies, stats, canonical, other))
+                self._publish(companies=companies, stats=stats)
+                # Aliases of the merged record now refer to the company
+                for existing, name in aliases.items():
+                    if name == other:
+                        aliases[existing] = canonical
+                        changes.append(("alias", existing))
+            aliases[key] = canonical
+            self._publish(aliases=aliases)
+            changes.append(("alias", key))
+            self._rebuild_indexes()
+            self._save_state(changes)
+
+    def company_aliases(self, company_name: str) -> List[str]:
+        """
+        Get the explicit aliases of a company.
+
+        Args:
+            company_name: Name (or alias) of the company
+
+        Returns:
+            Normalized aliases referring to the company's record
+        """
+        canonical = self.resolve_company(company_name)
+        return [
+            alias
+            for alias, name in self.state.get("aliases", {}).items()
+            if name == canonical
+        ]
+
+    def _read_version(self) -> int:
+        """
+        Version stamp of the stored state. Callers must hold the file lock.
+
+        Every write replaces the version file. We keep the file we last read
+        or wrote open (so its inode can't be reused); while the path still
+        refers to it, the stamp is unchanged and isn't read again.
+        """
+        try:
+            stat = os.stat(self.version_file)
+        except OSError:
+            return 0
+        seen = self._version_seen
+        if seen is not None and os.path.samestat(stat, os.fstat(seen[0].fileno())):
+            return seen[1]
+        try:
+            f = open(self.version_file, "r")
+        except OSError:
+            return 0
+        try:
+            version = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            f.close()
+            return 0
+        self._remember_version(f, version)
+        return version
+
+    def _write_version(self, version: int):
+        """Store a new version stamp. Callers must hold the file lock."""
+        temp_file = f"{self.version_file}.tmp"
+        f = open(temp_file, "w")
+        try:
+            f.write(str(version))
+            f.flush()
+            os.replace(temp_file, self.version_file)
+        except BaseException:
+            f.close()
+            raise
+        self._remember_version(f, version)
+
+    def _remember_version(self, handle, version: int):
+        if self._version_seen is not None:
+            self._version_seen[0].close()
+        self._version_seen = (handle, version)
+
+    def _persist(self, changes: List[tuple]) -> bool:
+        """
+        Write changes through the backend under the inter-process lock,
+        merging first if another process wrote since we last loaded.
+        Callers must hold the lock.
+
+        Returns:
+            True if the backend saved the changes
+        """
+        with self.file_lock:
+            version = self._read_version()
+            if version != self.version:
+                self._merge_stored(changes)
+            if not self.backend.save(self.state, changes):
+                return False
+            self.version = version + 1
+            self._write_version(self.version)
+            return True
+
+    def _merge_stored(self, changes: List[tuple]):
+        """
+        Reload the stored state and re-apply our changes on top of it.
+        Callers must hold both locks.
+
+        The fields we updated, our settings and explicit stats win;
+        interactions and status transitions from both sides are kept.
+        """
+        stored = self.backend.load() or {}
+        companies = (stored.get("companies") or {}).copy()
+        stats = dict(stored.get("stats") or empty_stats())
+        settings = dict(stored.get("settings", {}))
+        aliases = dict(stored.get("aliases", {}))
+
+        for change in changes:
+            kind = change[0]
+            if kind == "company":
+                ours = self.state["companies"].get(change[1])
+                theirs = companies.get(change[1])
+                if ours is None:
+                    companies.pop(change[1], None)
+                elif theirs is None:
+                    # Our interactions are re-applied from their own records
+                    companies[change[1]] = {**ours, "interactions": []}
+                else:
+                    fields = change[2] if len(change) > 2 else ours.keys()
+                    companies[change[1]] = {
+                        **theirs,
+                        **{
+                            key: ours[key]
+                            for key in fields
+                            if key in ours and key != "interactions"
+                        },
+                    }
+            elif kind == "interaction":
+                company = dict(companies.get(change[1]) or {"interactions": []})
+                company["interactions"] = company.get("interactions", []) + [change[2]]
+                companies[change[1]] = company
+            elif kind == "rename":
+                companies.pop(change[1], None)
+                merged = self.state["companies"].get(change[2], {})
+                company = dict(companies.get(change[2]) or {})
+                company["interactions"] = list(merged.get("interactions", []))
+                companies[change[2]] = company
+            elif kind == "alias":
+                if change[1] in self.state["aliases"]:
+                    aliases[change[1]] = self.state["aliases"][change[1]]
+                else:
+                    aliases.pop(change[1], None)
+            elif kind == "trim":
+                company = dict(companies.get(change[1]) or {"interactions": []})
+                company["interactions"] = company.get("interactions", [])[-change[2] :]
+                companies[change[1]] = company
+            elif kind == "status":
+                funnel_transition(stats, change[2], change[3])
+            elif kind == "stats":
+                stats = dict(self.state["stats"])
+            elif kind == "setting":
+                if change[1] in self.state["settings"]:
+                    settings[change[1]] = self.state["settings"][change[1]]
+                else:
+                    settings.pop(change[1], None)
+            elif kind == "clear":
+                companies, stats, settings, aliases = {}, empty_stats(), {}, {}
+
+        self._publish(
+            companies=companies, stats=stats, settings=settings, aliases=aliases
+        )
+        self._rebuild_indexes()
+        self.write_stats["merges"] += 1
+        logger.info(f"Merged changes from another process into {self.state_file}")
+
+    def refresh(self) -> bool:
+        """
+        Pick up changes written by other processes.
+
+        Returns:
+            True if the stored state had changed and was reloaded
+        """
         with self.lock:
-            # Update last updated timestamp
-            self.state["last_updated"] = datetime.now().isoformat()
-            
-            try:
-                # Ensure directory exists
-                os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-                
-                # Write to temp file first to avoid corruption on crash
-                temp_file = f"{self.state_file}.tmp"
-                with open(temp_file, 'w') as f:
-                    json.dump(self.state, f, indent=2)
-                
-                # Replace the actual file with the temp file
-                os.replace(temp_file, self.state_file)
-                
-                logger.info(f"Saved state to {self.state_file}")
-            except Exception as e:
-                logger.error(f"Error saving state to {self.state_file}: {e}")
-    
+            with self.file_lock:
+                version = self._read_version()
+                if version == self.version:
+                    return False
+                if self._dirty_writes:
+                    # Flushing merges the stored state with our pending changes
+                    self._flush_locked()
+                    return True
+                stored = self.backend.load() or {}
+                self.version = version
+            self._publish(
+                companies=stored.get("companies", {}),
+                stats=stored.get("stats") or empty_stats(),
+                settings=stored.get("settings", {}),
+                aliases=stored.get("aliases", {}),
+            )
+            self._rebuild_indexes()
+            return True
+
+    def _save_state(self, changes: List[tuple]):
+        """
+        Persist changes through the backend, or queue them in write-behind mode.
+        Callers must hold the lock.
+
+        Args:
+            changes: Change records (see state_backends)
+        """
+        self.write_stats["writes"] += 1
+        # Mark dirty; changes stay pending until a backend save succeeds
+        self._pending_changes.extend(changes)
+        self._dirty_writes += 1
+        if not self.write_behind or (
+            self.flush_threshold and self._dirty_writes >= self.flush_threshold
+        ):
+            self._flush_locked()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self.flush_interval and self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_locked(self):
+        """Write all pending changes in one backend save. Callers must hold the lock."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._dirty_writes:
+            return
+        if not self._persist(self._coalesce(self._pending_changes)):
+            # Keep the changes; the next write or flush retries them
+            logger.warning(
+                f"{self._dirty_writes} state writes are not saved yet; will retry"
+            )
+            self._schedule_flush()
+            return
+        self.write_stats["flushes"] += 1
+        self.write_stats["coalesced_writes"] += self._dirty_writes - 1
+        self._pending_changes = []
+        self._dirty_writes = 0
+
+    @staticmethod
+    def _coalesce(changes: List[tuple]) -> List[tuple]:
+        """
+        Drop repeated company/stats/setting records; backends write their
+        latest value anyway.
+        """
+        seen = {}
+        coalesced = []
+        for change in changes:
+            if change[0] == "clear":
+                seen.clear()
+            elif change[0] == "company":
+                # One record per company, covering every field updated
+                key = change[:2]
+                if key in seen:
+                    index = seen[key]
+                    fields = set(coalesced[index][2]) | set(change[2])
+                    coalesced[index] = (*key, tuple(sorted(fields)))
+                    continue
+                seen[key] = len(coalesced)
+            elif change[0] not in ("interaction", "trim", "status"):
+                if change in seen:
+                    continue
+                seen[change] = len(coalesced)
+            coalesced.append(change)
+        return coalesced
+
+    def flush(self):
+        """Write any pending changes to storage now."""
+        with self.lock:
+            self._flush_locked()
+
+    def get_write_stats(self) -> Dict[str, int]:
+        """
+        Get persistence counters.
+
+        Returns:
+            Dict with the number of writes, backend flushes, writes coalesced
+            into another flush, and writes still pending
+        """
+        with self.lock:
+            return {**self.write_stats, "pending": self._dirty_writes}
+
+    def close(self):
+        """Flush pending changes and release the storage backend."""
+        with self.lock:
+            self._flush_locked()
+            self.backend.close()
+            if self._version_seen is not None:
+                self._version_seen[0].close()
+                self._version_seen = None
+        if self.write_behind:
+            atexit.unregister(self.flush)
+
+    def _publish(self, **parts):
+        """
+        Publish a new state snapshot. Callers must hold the lock.
+
+        Snapshots are never modified after publication, with one exception:
+        updating an existing company swaps its entry in the shared companies
+        mapping (a single atomic assignment of a new company dict), so a
+        write doesn't copy every company. Adding or removing companies, and
+        every stats/settings change, builds new dicts and swaps the
+        top-level reference. Either way readers can use ``self.state``
+        without locking; company dicts themselves are never modified.
+        """
+        self.state = {**self.state, **parts, "last_updated": datetime.now().isoformat()}
+
     def get_company_state(self, company_name: str) -> Dict[str, Any]:
         """
         Get state information for a specific company.
-        
+
         Args:
-            company_name: Name of the company
-            
+            company_name: Name of the company (any spelling or alias)
+
         Returns:
-            Dict with company state or empty dict if not found
+            Dict with company state (a copy the caller may modify) or empty
+            dict if not found
         """
-        with self.lock:
-            return self.state["companies"].get(company_name, {})
-    
+        return copy.deepcopy(
+            self.state["companies"].get(self.resolve_company(company_name), {})
+        )
+
     def update_company_state(self, company_name: str, updates: Dict[str, Any]):
         """
         Update state for a specific company.
-        
+
         Args:
-            company_name: Name of the company
+            company_name: Name of the company (any spelling or alias)
             updates: Dictionary of state updates
         """
         with self.lock:
-            # Create company entry if it doesn't exist
-            if company_name not in self.state["companies"]:
-                self.state["companies"][company_name] = {
+            state = self.state
+            company_name = self.resolve_company(company_name)
+            if company_name not in state["companies"]:
+                self._aliases.setdefault(
+                    company_identity_key(company_name) or company_name, company_name
+                )
+
+            # Copy the company entry (creating it if it doesn't exist)
+            old_company = state["companies"].get(company_name)
+            company_state = dict(
+                old_company
+                or {
                     "created_at": datetime.now().isoformat(),
                     "status": "Not Applied",
-                    "interactions": []
+                    "interactions": [],
                 }
-            
-            # Update company state
-            company_state = self.state["companies"][company_name]
+            )
+            old_status = company_state.get("status")
             company_state.update(updates)
-            
+            changes = [("company", company_name, tuple(sorted(updates)))]
+            stats = state["stats"]
+            interaction = None
+            archived = []
+
             # Add to interactions if it's a new interaction type
             if "last_interaction" in updates and "last_interaction_date" in updates:
                 interaction = {
                     "type": updates["last_interaction"],
                     "date": updates["last_interaction_date"]
                 }
-                
+
                 # Add additional details if available
                 for key in ["details", "notes"]:
                     if key in updates:
                         interaction[key] = updates[key]
-                
-                # Add to interactions list
-                if "interactions" not in company_state:
-                    company_state["interactions"] = []
-                
-                company_state["interactions"].append(interaction)
-            
+
+                # Add to a copy of the interactions list
+                company_state["interactions"] = company_state.get(
+                    "interactions", []
+                ) + [interaction]
+                changes.append(("interaction", company_name, interaction))
+
+                # Move interactions beyond the hot limit to the archive
+                if (
+                    self.max_interactions
+                    and len(company_state["interactions"]) > self.max_interactions
+                ):
+                    archived = self._archive_overflow(company_state)
+                    changes[0] = (
+                        "company",
+                        company_name,
+                        tuple(sorted({*updates, "archived_interactions"})),
+                    )
+                    changes.append(("trim", company_name, self.max_interactions))
+
             # Update application status if needed
             if "status" in updates:
-                old_status = company_state.get("status")
                 new_status = updates["status"]
-                
+
                 # Update application stats based on status changes
                 if old_status != new_status:
-                    if new_status == "Applied" and old_status in [None, "Not Applied"]:
-                        self.state["stats"]["applications_sent"] += 1
-                    elif new_status == "Interview" and old_status != "Interview":
-                        self.state["stats"]["interviews_scheduled"] += 1
-                    elif new_status == "Offer" and old_status != "Offer":
-                        self.state["stats"]["offers_received"] += 1
-                    elif new_status == "Rejected" and old_status != "Rejected":
-                        self.state["stats"]["rejections"] += 1
-            
-            # Save changes to disk
-            self._save_state()
-    
+                    stats = dict(stats)
+                    funnel_transition(stats, old_status, new_status)
+                    changes.append(("status", company_name, old_status, new_status))
+
+            # Before the mapping changes, so a lazy index build that misses
+            # this update stays pending
+            stale_indexes = self.indexes.begin_update()
+            companies = state["companies"]
+            if old_company is None:
+                # A new key publishes a new mapping (readers may be iterating)
+                companies = companies.copy()
+            companies[company_name] = company_state
+            self._publish(companies=companies, stats=stats)
+            if stale_indexes:
+                # Not built since the last load; build from the latest snapshot instead
+                self.indexes.rebuild(companies)
+            else:
+                self.indexes.update_company(
+                    company_name, old_company, company_state, interaction
+                )
+                if archived:
+                    self.indexes.drop_interactions(company_name, archived)
+
+            # Save changes to disk; archived interactions are written under
+            # the same inter-process lock as the state that no longer has them
+            if archived:
+                with self.file_lock:
+                    start = company_state["archived_interactions"] - len(archived)
+                    self.archive.append(company_name, start, archived)
+                    self._save_state(changes)
+            else:
+                self._save_state(changes)
+
+    def _archive_overflow(self, company_state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Move a company's oldest interactions beyond the hot limit out of
+        company_state. Callers must hold the lock and own company_state, and
+        append the returned interactions to the archive.
+
+        Returns:
+            The interactions to archive
+        """
+        interactions = company_state["interactions"]
+        overflow = interactions[: -self.max_interactions]
+        company_state["interactions"] = interactions[-self.max_interactions :]
+        company_state["archived_interactions"] = company_state.get(
+            "archived_interactions", 0
+        ) + len(overflow)
+        return overflow
+
+    def iter_interactions(
+        self, company_name: str, page_size: int = DEFAULT_INTERACTION_PAGE_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through a company's full interaction history, archived and hot.
+
+        Args:
+            company_name: Name of the company (any spelling or alias)
+            page_size: Interactions per page
+
+        Yields:
+            Lists of up to page_size interactions, oldest first
+        """
+        company_name = self.resolve_company(company_name)
+        company = self.state["companies"].get(company_name)
+        if company is None:
+            return
+        page = []
+        archived = self.archive.iter_interactions(
+            company_name, company.get("archived_interactions", 0)
+        )
+        for interaction in itertools.chain(archived, company.get("interactions", [])):
+            page.append(interaction)
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
     def get_all_companies(self) -> Dict[str, Dict[str, Any]]:
         """
         Get state information for all companies.
-        
+
         Returns:
-            Dict mapping company names to their state information
+            Dict mapping company names to their state information (copies
+            the caller may modify)
         """
-        with self.lock:
-            return self.state["companies"].copy()
-    
+        return copy.deepcopy(dict(self.state["companies"]))
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get application statistics.
@@ -186,9 +813,8 @@ class StateManager:
         Returns:
             Dict with application statistics
         """
-        with self.lock:
-            return self.state["stats"].copy()
-    
+        return self.state["stats"].copy()
+
     def update_stats(self, updates: Dict[str, Any]):
         """
         Update application statistics.
@@ -197,9 +823,9 @@ class StateManager:
             updates: Dictionary of stat updates
         """
         with self.lock:
-            self.state["stats"].update(updates)
-            self._save_state()
-    
+            self._publish(stats={**self.state["stats"], **updates})
+            self._save_state([("stats",)])
+
     def get_setting(self, key: str, default: Any = None) -> Any:
         """
         Get a setting value.
@@ -211,9 +837,8 @@ class StateManager:
         Returns:
             Setting value or default
         """
-        with self.lock:
-            return self.state["settings"].get(key, default)
-    
+        return self.state["settings"].get(key, default)
+
     def update_setting(self, key: str, value: Any):
         """
         Update a setting value.
@@ -223,22 +848,161 @@ class StateManager:
             value: Setting value
         """
         with self.lock:
-            self.state["settings"][key] = value
-            self._save_state()
-    
+            self._publish(settings={**self.state["settings"], key: value})
+            self._save_state([("setting", key)])
+
     def clear_state(self):
         """Clear all state data."""
         with self.lock:
-            self.state = {
-                "version": self.state.get("version", "1.0"),
-                "last_updated": datetime.now().isoformat(),
-                "companies": {},
-                "stats": {
-                    "applications_sent": 0,
-                    "interviews_scheduled": 0,
-                    "offers_received": 0,
-                    "rejections": 0
-                },
-                "settings": {}
-            }
-            self._save_state()
\ No newline at end of file
+            self._publish(companies={}, stats=empty_stats(), settings={}, aliases={})
+            self._rebuild_indexes()
+            with self.file_lock:
+                self.archive.clear()
+                self._save_state([("clear",), ("stats",)])
+
+    # Queries over the secondary indexes; like the getters they don't lock,
+    # and each runs in time proportional to its result.
+
+    def companies_by_status(self, status: str) -> List[str]:
+        """
+        Get companies with a given application status.
+
+        Args:
+            status: Status (e.g. "Applied")
+
+        Returns:
+            Sorted company names
+        """
+        return self.indexes.companies_by_status(status)
+
+    def companies_by_interaction_type(self, interaction_type: str) -> List[str]:
+        """
+        Get companies with at least one interaction of a given type.
+
+        Args:
+            interaction_type: Interaction type (e.g. "call", "email")
+
+        Returns:
+            Sorted company names
+        """
+        return self.indexes.companies_by_interaction_type(interaction_type)
+
+    def companies_without_contact_since(
+        self, days: float, include_never: bool = True
+    ) -> List[str]:
+        """
+        Get companies with no interaction in the last ``days`` days.
+
+        Args:
+            days: Number of days
+            include_never: Also include companies with no interaction date at all
+
+        Returns:
+            Company names, longest without contact first (never-contacted ones last)
+        """
+        return self.indexes.companies_without_contact_since(days, include_never)
+
+    def recent_interactions(self, n: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the most recent interactions across all companies.
+
+        Args:
+            n: Maximum number of interactions
+
+        Returns:
+            Interactions, newest first, each with a "company" key added
+        """
+        return self.indexes.recent_interactions(n)
+
+    # Async variants. Reads are lock-free and return immediately; mutations are
+    # queued to a single writer task, which applies them in order off the event loop.
+
+    async def _submit(self, func, *args):
+        """Queue a mutation for the writer task and wait for it to be applied."""
+        loop = asyncio.get_running_loop()
+        if self._writer is None or self._writer_loop is not loop or self._writer.done():
+            self._writer_queue = asyncio.Queue()
+            self._writer_loop = loop
+            self._writer = loop.create_task(
+                self._run_writer(self._writer_queue), name="state-writer"
+            )
+        future = loop.create_future()
+        await self._writer_queue.put((func, args, future))
+        return await future
+
+    async def _run_writer(self, queue: asyncio.Queue):
+        """Apply queued mutations one at a time until a None sentinel arrives."""
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            func, args, future = item
+            try:
+                result = await asyncio.to_thread(func, *args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    async def aget_company_state(self, company_name: str) -> Dict[str, Any]:
+        """Async variant of get_company_state."""
+        return self.get_company_state(company_name)
+
+    async def aget_all_companies(self) -> Dict[str, Dict[str, Any]]:
+        """Async variant of get_all_companies."""
+        return self.get_all_companies()
+
+    async def aget_stats(self) -> Dict[str, Any]:
+        """Async variant of get_stats."""
+        return self.get_stats()
+
+    async def aget_setting(self, key: str, default: Any = None) -> Any:
+        """Async variant of get_setting."""
+        return self.get_setting(key, default)
+
+    async def aiter_interactions(
+        self, company_name: str, page_size: int = DEFAULT_INTERACTION_PAGE_SIZE
+    ):
+        """Async iter_interactions; archive pages are read off the event loop."""
+        pages = self.iter_interactions(company_name, page_size)
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                return
+            yield page
+
+    async def aadd_company_alias(self, alias: str, company_name: str):
+        """Async variant of add_company_alias."""
+        await self._submit(self.add_company_alias, alias, company_name)
+
+    async def aupdate_company_state(self, company_name: str, updates: Dict[str, Any]):
+        """Async variant of update_company_state."""
+        await self._submit(self.update_company_state, company_name, updates)
+
+    async def aupdate_stats(self, updates: Dict[str, Any]):
+        """Async variant of update_stats."""
+        await self._submit(self.update_stats, updates)
+
+    async def aupdate_setting(self, key: str, value: Any):
+        """Async variant of update_setting."""
+        await self._submit(self.update_setting, key, value)
+
+    async def aclear_state(self):
+        """Async variant of clear_state."""
+        await self._submit(self.clear_state)
+
+    async def aflush(self):
+        """Async variant of flush."""
+        await self._submit(self.flush)
+
+    async def aclose(self):
+        """Async variant of close; also stops the writer task."""
+        if self._writer is not None and not self._writer.done():
+            await self._submit(self.close)
+            await self._writer_queue.put(None)
+            await self._writer
+            self._writer = None
+        else:
+            await asyncio.to_thread(self.close)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Serialization for the JobTracker state backends.
+
+Uses orjson when it is installed and the stdlib json module otherwise; both
+write compact output. LazyCompanies holds company entries as stored payloads
+and decodes each one the first time it is accessed.
+"""
+
+import json
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode an object as a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def loads(data) -> Any:
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _Pending:
+    """A company entry that hasn't been decoded yet."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+
+class LazyCompanies(MutableMapping):
+    """
+    Mapping of company names to entries, decoded on first access.
+
+    Follows the state snapshot rules: once published it is never modified,
+    apart from replacing an entry's payload with its decoded value (which
+    readers can't tell apart). copy() is as cheap as copying a dict and
+    doesn't decode anything.
+    """
+
+    def __init__(
+        self, decode: Callable[[Any], Dict[str, Any]], entries: Dict[str, Any] = None
+    ):
+        """
+        Initialize the mapping.
+
+        Args:
+            decode: Turns a stored payload into a company dict
+            entries: Name -> company dict or _Pending payload
+        """
+        self._decode = decode
+        self._entries = entries if entries is not None else {}
+
+    @classmethod
+    def from_payloads(
+        cls, decode: Callable[[Any], Dict[str, Any]], payloads: Dict[str, Any]
+    ) -> "LazyCompanies":
+        """Build the mapping from name -> stored payload."""
+        return cls(
+            decode, {name: _Pending(payload) for name, payload in payloads.items()}
+        )
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        value = self._entries[name]
+        if isinstance(value, _Pending):
+            value = self._decode(value.payload)
+            self._entries[name] = value
+        return value
+
+    def __setitem__(self, name: str, value: Dict[str, Any]):
+        self._entries[name] = value
+
+    def __delitem__(self, name: str):
+        del self._entries[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def copy(self) -> "LazyCompanies":
+        return LazyCompanies(self._decode, dict(self._entries))
+
+    def decoded_count(self) -> int:
+        """Number of entries decoded so far."""
+        return sum(not isinstance(value, _Pending) for value in self._entries.values())
+
+    def payload_items(self, encode: Callable[[Dict[str, Any]], Any]) -> Iterator:
+        """
+        Iterate (name, payload), re-encoding only decoded entries.
+
+        Args:
+            encode: Turns a company dict into a payload in the stored format
+        """
+        for name, value in self._entries.items():
+            yield name, value.payload if isinstance(value, _Pending) else encode(value)
+
+    def __repr__(self) -> str:
+        return f"LazyCompanies({len(self)} companies, {self.decoded_count()} decoded)"
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+State events for the JobTracker state manager.
+
+Converts change records (see state_backends) into self-contained events and
+replays events into a state document. Company entries and the stats funnel
+are materialized views over the events: the funnel is derived from status
+transitions rather than stored counters.
+"""
+
+from typing import Any, Dict, Optional
+
+Event = Dict[str, Any]
+
+
+def empty_stats() -> Dict[str, int]:
+    """Funnel counters for a fresh state."""
+    return {
+        "applications_sent": 0,
+        "interviews_scheduled": 0,
+        "offers_received": 0,
+        "rejections": 0,
+    }
+
+
+def funnel_transition(
+    stats: Dict[str, int], old_status: Optional[str], new_status: Optional[str]
+):
+    """
+    Count a status transition in the application funnel.
+
+    Args:
+        stats: Funnel counters, updated in place
+        old_status: Previous status (None for a new company)
+        new_status: New status
+    """
+    if old_status == new_status:
+        return
+    if new_status == "Applied" and old_status in [None, "Not Applied"]:
+        stats["applications_sent"] += 1
+    elif new_status == "Interview":
+        stats["interviews_scheduled"] += 1
+    elif new_status == "Offer":
+        stats["offers_received"] += 1
+    elif new_status == "Rejected":
+        stats["rejections"] += 1
+
+
+# Funnel counters a record in each status has (most likely) been counted in
+FUNNEL_COUNTERS = {
+    "Applied": ("applications_sent",),
+    "Interview": ("applications_sent", "interviews_scheduled"),
+    "Offer": ("applications_sent", "interviews_scheduled", "offers_received"),
+    "Rejected": ("applications_sent", "rejections"),
+}
+
+
+def funnel_merge(
+    stats: Dict[str, int], status: Optional[str], other_status: Optional[str]
+):
+    """
+    Uncount the funnel steps two records of the same company both counted,
+    when they are merged into one.
+
+    Args:
+        stats: Funnel counters, updated in place
+        status: Status of the record kept
+        other_status: Status of the record merged into it
+    """
+    other_counters = FUNNEL_COUNTERS.get(other_status, ())
+    for counter in FUNNEL_COUNTERS.get(status, ()):
+        if counter in other_counters and stats.get(counter, 0) > 0:
+            stats[counter] -= 1
+
+
+def change_to_event(state: Dict[str, Any], change: tuple) -> Event:
+    """
+    Capture a change record as an event, with the values it refers to.
+
+    Args:
+        state: Current state document
+        change: Change record
+
+    Returns:
+        Event dict
+    """
+    kind = change[0]
+    if kind == "company":
+        company = state["companies"].get(change[1])
+        if company is None:
+            return {"op": "company_removed", "name": change[1]}
+        data = {key: value for key, value in company.items() if key != "interactions"}
+        return {"op": "company", "name": change[1], "data": data}
+    if kind == "interaction":
+        return {"op": "interaction", "name": change[1], "data": change[2]}
+    if kind == "rename":
+        merged = state["companies"].get(change[2], {})
+        return {
+            "op": "rename",
+            "name": change[1],
+            "to": change[2],
+            "interactions": merged.get("interactions", []),
+        }
+    if kind == "alias":
+        key = change[1]
+        if key in state.get("aliases", {}):
+            return {"op": "alias", "key": key, "company": state["aliases"][key]}
+        return {"op": "alias_removed", "key": key}
+    if kind == "trim":
+        return {"op": "trim", "name": change[1], "keep": change[2]}
+    if kind == "status":
+        return {"op": "status", "name": change[1], "from": change[2], "to": change[3]}
+    if kind == "stats":
+        return {"op": "stats", "data": dict(state["stats"])}
+    if kind == "setting":
+        key = change[1]
+        if key in state["settings"]:
+            return {"op": "setting", "key": key, "value": state["settings"][key]}
+        return {"op": "setting_removed", "key": key}
+    if kind == "clear":
+        return {"op": "clear"}
+    raise ValueError(f"Unknown change record: {change!r}")
+
+
+def apply_event(state: Dict[str, Any], event: Event):
+    """
+    Apply one event to a state document in place.
+
+    Args:
+        state: State document with companies, stats and settings
+        event: Event dict
+    """
+    op = event["op"]
+    if op == "company":
+        company = state["companies"].setdefault(event["name"], {"interactions": []})
+        company.update(event["data"])
+    elif op == "company_removed":
+        state["companies"].pop(event["name"], None)
+    elif op == "interaction":
+        company = state["companies"].setdefault(event["name"], {"interactions": []})
+        company.setdefault("interactions", []).append(event["data"])
+    elif op == "rename":
+        state["companies"].pop(event["name"], None)
+        company = state["companies"].setdefault(event["to"], {"interactions": []})
+        company["interactions"] = list(event["interactions"])
+    elif op == "alias":
+        state.setdefault("aliases", {})[event["key"]] = event["company"]
+    elif op == "alias_removed":
+        state.setdefault("aliases", {}).pop(event["key"], None)
+    elif op == "trim":
+        company = state["companies"].get(event["name"])
+        if company is not None:
+            company["interactions"] = company.get("interactions", [])[-event["keep"] :]
+    elif op == "status":
+        funnel_transition(state["stats"], event["from"], event["to"])
+    elif op == "stats":
+        state["stats"] = dict(event["data"])
+    elif op == "setting":
+        state["settings"][event["key"]] = event["value"]
+    elif op == "setting_removed":
+        state["settings"].pop(event["key"], None)
+    elif op == "clear":
+        state["companies"] = {}
+        state["stats"] = empty_stats()
+        state["settings"] = {}
+        state["aliases"] = {}
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Secondary indexes over tracked companies for the JobTracker state manager.
+
+Indexes are built on the first query after a (re)load and then maintained
+incrementally as companies change, so queries run in time proportional to
+their result. The status and type sets are copy-on-write; the sorted lists
+are updated in place (bisect insert and delete, one element each) under
+the state manager's writer lock, so an update costs O(log n) comparisons
+instead of a copy of the whole list. Queries never lock: a query racing an
+update may miss or include the one company being updated.
+
+Writers update the companies mapping in place, so a lazy build may read a
+company mid-update. Every writer bumps a generation counter first, and a
+build only clears the pending snapshot if no writer ran while it built.
+"""
+
+import bisect
+import threading
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+def date_key(value: Any) -> Optional[float]:
+    """
+    Convert an interaction date to a sortable timestamp.
+
+    Accepts ISO dates/datetimes (as written for calls) and RFC 2822 dates
+    (as found in email headers).
+
+    Args:
+        value: Date string
+
+    Returns:
+        POSIX timestamp, or None if the value isn't a recognizable date
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return parsed.timestamp()
+
+
+class StateIndexes:
+    """Indexes by status, by last interaction date and by interaction type."""
+
+    def __init__(self):
+        self._build_lock = threading.Lock()
+        # Guards _pending and _generation, which writers and builds both change
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.clear()
+
+    def clear(self):
+        """Drop every index entry."""
+        self._by_status: Dict[str, FrozenSet[str]] = {}
+        self._by_type: Dict[str, FrozenSet[str]] = {}
+        # (timestamp, name), sorted; plus each company's current key
+        self._last_contact: List[Tuple[float, str]] = []
+        self._last_contact_of: Dict[str, float] = {}
+        self._never_contacted: FrozenSet[str] = frozenset()
+        # (timestamp, sequence, name, interaction), sorted
+        self._interactions: List[Tuple[float, int, str, Dict[str, Any]]] = []
+        self._sequence = 0
+        # Companies to build from on first use
+        self._pending: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def rebuild(self, companies: Dict[str, Dict[str, Any]]):
+        """Rebuild all indexes from a companies snapshot when they are next used."""
+        with self._lock:
+            self._pending = companies
+            self._generation += 1
+
+    @property
+    def stale(self) -> bool:
+        """Whether the indexes wait for a rebuild (updates just swap the snapshot)."""
+        return self._pending is not None
+
+    def begin_update(self) -> bool:
+        """
+        Announce a company update, before the companies mapping changes.
+
+        Returns:
+            Whether the indexes are stale: if so, call rebuild() with the
+            updated mapping, otherwise update_company()
+        """
+        with self._lock:
+            self._generation += 1
+            return self._pending is not None
+
+    def _ensure_built(self):
+        if self._pending is None:
+            return
+        with self._build_lock:
+            with self._lock:
+                companies, generation = self._pending, self._generation
+            if companies is not None:
+                self._build(companies, generation)
+
+    def _build(self, companies: Dict[str, Dict[str, Any]], generation: int):
+        # Built aside and swapped in, so concurrent queries never see a partial index
+        self._sequence = 0
+        last_contact_of: Dict[str, float] = {}
+        by_status: Dict[str, set] = {}
+        by_type: Dict[str, set] = {}
+        last_contact = []
+        never_contacted = set()
+        interactions = []
+        for name, company in companies.items():
+            by_status.setdefault(company.get("status"), set()).add(name)
+            key = date_key(company.get("last_interaction_date"))
+            if key is None:
+                never_contacted.add(name)
+            else:
+                last_contact.append((key, name))
+                last_contact_of[name] = key
+            for interaction in company.get("interactions", []):
+                by_type.setdefault(interaction.get("type"), set()).add(name)
+                interactions.append(self._interaction_entry(name, interaction))
+
+        self._last_contact_of = last_contact_of
+        self._by_status = {
+            status: frozenset(names) for status, names in by_status.items()
+        }
+        self._by_type = {kind: frozenset(names) for kind, names in by_type.items()}
+        self._last_contact = sorted(last_contact)
+        self._never_contacted = frozenset(never_contacted)
+        self._interactions = sorted(interactions, key=lambda entry: entry[:2])
+        # A writer may have changed the snapshot meanwhile; then it stays
+        # pending and the next query builds again
+        with self._lock:
+            if self._generation == generation:
+                self._pending = None
+
+    def _interaction_entry(self, name: str, interaction: Dict[str, Any]):
+        self._sequence += 1
+        return (
+            date_key(interaction.get("date")) or 0.0,
+            self._sequence,
+            name,
+            interaction,
+        )
+
+    def update_company(
+        self,
+        name: str,
+        old: Optional[Dict[str, Any]],
+        new: Dict[str, Any],
+        interaction: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Reflect one company update in the indexes.
+
+        Args:
+            name: Company name
+            old: Company state before the update (None if new)
+            new: Company state after the update
+            interaction: Interaction appended by the update, if any
+
+        Only valid while the indexes aren't stale.
+        """
+        old_status = old.get("status") if old else None
+        if old is None or old_status != new.get("status"):
+            if old is not None:
+                self._by_status[old_status] = self._by_status.get(
+                    old_status, frozenset()
+                ) - {name}
+            status = new.get("status")
+            self._by_status[status] = self._by_status.get(status, frozenset()) | {name}
+
+        key = date_key(new.get("last_interaction_date"))
+        old_key = self._last_contact_of.get(name)
+        if old is None or key != old_key:
+            last_contact = self._last_contact
+            if old_key is not None:
+                del last_contact[bisect.bisect_left(last_contact, (old_key, name))]
+                del self._last_contact_of[name]
+            if key is None:
+                self._never_contacted = self._never_contacted | {name}
+            else:
+                bisect.insort(last_contact, (key, name))
+                self._last_contact_of[name] = key
+                self._never_contacted = self._never_contacted - {name}
+
+        if interaction is not None:
+            kind = interaction.get("type")
+            if name not in self._by_type.get(kind, frozenset()):
+                self._by_type[kind] = self._by_type.get(kind, frozenset()) | {name}
+            entry = self._interaction_entry(name, interaction)
+            # Sequence numbers are unique, so entries never compare past them
+            self._interactions.insert(
+                bisect.bisect(self._interactions, entry[:2]), entry
+            )
+
+    def drop_interactions(self, name: str, interactions: List[Dict[str, Any]]):
+        """
+        Remove interactions (e.g. archived ones) from the recency index.
+
+        Args:
+            name: Company name
+            interactions: The interaction dicts, as indexed
+
+        Only valid while the indexes aren't stale.
+        """
+        entries = self._interactions
+        for interaction in interactions:
+            key = date_key(interaction.get("date")) or 0.0
+            i = bisect.bisect_left(entries, (key,))
+            while i < len(entries) and entries[i][0] == key:
+                if entries[i][2] == name and entries[i][3] is interaction:
+                    del entries[i]
+                    break
+                i += 1
+
+    def companies_by_status(self, status: str) -> List[str]:
+        """Names of companies with a status."""
+        self._ensure_built()
+        return sorted(self._by_status.get(status, ()))
+
+    def companies_by_interaction_type(self, interaction_type: str) -> List[str]:
+        """Names of companies with at least one interaction of a type."""
+        self._ensure_built()
+        return sorted(self._by_type.get(interaction_type, ()))
+
+    def companies_without_contact_since(
+        self, days: float, include_never: bool = True
+    ) -> List[str]:
+        """Names of companies last contacted more than ``days`` ago, oldest first."""
+        self._ensure_built()
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+        last_contact = self._last_contact
+        stale = [
+            name
+            for _, name in last_contact[: bisect.bisect_left(last_contact, (cutoff,))]
+        ]
+        if include_never:
+            stale.extend(sorted(self._never_contacted))
+        return stale
+
+    def recent_interactions(self, n: int) -> List[Dict[str, Any]]:
+        """The ``n`` most recent interactions across companies, newest first."""
+        self._ensure_built()
+        interactions = self._interactions
+        return [
+            {"company": name, **interaction}
+            for _, _, name, interaction in reversed(
+                interactions[max(len(interactions) - n, 0) :]
+            )
+        ]
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tool schema cache for JobTracker application.
+Keeps the Anthropic tool payload built from an MCP server's tool list on disk,
+so LLM tool loops don't list and re-serialize tools on every call.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("job-tracker.tool-cache")
+
+# Default time-to-live of a cache entry in seconds
+DEFAULT_TTL = float(os.environ.get("MCP_TOOL_CACHE_TTL", str(24 * 60 * 60)))
+
+
+class ToolSchemaCache:
+    """Disk-backed cache of tool payloads keyed by server command and version."""
+
+    def __init__(self, cache_dir: str = None, ttl: float = DEFAULT_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache files (default: ~/.job-tracker/tool_cache)
+            ttl: Seconds before an entry is considered stale
+        """
+        if not cache_dir:
+            cache_dir = os.path.join(
+                os.path.expanduser("~"), ".job-tracker", "tool_cache"
+            )
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        # key -> (created_at, tools); tools lists are shared with callers as-is
+        self._memory: Dict[str, tuple] = {}
+
+    @staticmethod
+    def make_key(
+        command: str, args: List[str], server_name: str, server_version: str
+    ) -> str:
+        """
+        Build a cache key for a server.
+
+        Args:
+            command: Command used to start the server
+            args: Command arguments
+            server_name: Name reported by the server on initialize
+            server_version: Version reported by the server on initialize
+
+        Returns:
+            Hex digest identifying the server build
+        """
+        raw = json.dumps([command, list(args or []), server_name, server_version])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _fresh(self, created_at: float) -> bool:
+        return time.time() - created_at < self.ttl
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the cached tool payload.
+
+        Args:
+            key: Cache key from ``make_key``
+
+        Returns:
+            The tool payload, or None if missing or expired
+        """
+        entry = self._memory.get(key)
+        if entry and self._fresh(entry[0]):
+            return entry[1]
+
+        try:
+            with open(self._path(key), "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable tool cache entry {key}: {e}")
+            return None
+
+        created_at = data.get("created_at", 0)
+        if not self._fresh(created_at):
+            return None
+        self._memory[key] = (created_at, data.get("tools", []))
+        return self._memory[key][1]
+
+    def put(self, key: str, tools: List[Dict[str, Any]]):
+        """
+        Store a tool payload in memory and on disk.
+
+        Args:
+            key: Cache key from ``make_key``
+            tools: Anthropic tool payload
+        """
+        created_at = time.time()
+        self._memory[key] = (created_at, tools)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_file = f"{self._path(key)}.tmp"
+            with open(temp_file, "w") as f:
+                json.dump({"created_at": created_at, "tools": tools}, f)
+            os.replace(temp_file, self._path(key))
+        except Exception as e:
+            logger.error(f"Error writing tool cache entry {key}: {e}")
+
+    def invalidate(self, key: str = None):
+        """
+        Drop a cache entry, or every entry when no key is given.
+
+        Args:
+            key: Cache key to drop
+        """
+        keys = (
+            [key]
+            if key
+            else list(self._memory)
+            + [name[: -len(".json")] for name in self._list_files()]
+        )
+        for k in set(keys):
+            self._memory.pop(k, None)
+            try:
+                os.remove(self._path(k))
+            except FileNotFoundError:
+                pass
+
+    def _list_files(self) -> List[str]:
+        try:
+            return [
+                name for name in os.listdir(self.cache_dir) if name.endswith(".json")
+            ]
+        except FileNotFoundError:
+            return []
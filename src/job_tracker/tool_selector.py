@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tool selection for JobTracker application.
+Ranks MCP tools against a task so only the relevant ones are sent to the LLM.
+"""
+
+import hashlib
+import logging
+import math
+import re
+from typing import Any, Dict, Iterable, List, Pattern, Sequence, Tuple
+
+logger = logging.getLogger("job-tracker.tool-selector")
+
+# Number of hash buckets in the local embedding space
+EMBEDDING_DIMS = 1024
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def embed(text: str, dims: int = EMBEDDING_DIMS) -> Dict[int, float]:
+    """
+    Embed text as a sparse, L2-normalized hashed bag of words and character trigrams.
+
+    Args:
+        text: Text to embed
+        dims: Number of hash buckets
+
+    Returns:
+        Mapping of bucket index to weight
+    """
+    vector: Dict[int, float] = {}
+    for token in TOKEN_PATTERN.findall(text.lower().replace("_", " ")):
+        features = [token]
+        padded = f" {token} "
+        features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+        for feature in features:
+            bucket = (
+                int.from_bytes(
+                    hashlib.blake2b(feature.encode(), digest_size=4).digest(), "little"
+                )
+                % dims
+            )
+            # Whole words count more than their trigrams
+            vector[bucket] = vector.get(bucket, 0.0) + (
+                2.0 if feature == token else 1.0
+            )
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm:
+        for bucket in vector:
+            vector[bucket] /= norm
+    return vector
+
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """Cosine similarity of two normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(bucket, 0.0) for bucket, weight in a.items())
+
+
+class ToolSelector:
+    """Scores tools against a task using regex rules and a cached embedding index."""
+
+    def __init__(self, rules: Iterable[Tuple[str, Sequence[str], float]] = ()):
+        """
+        Initialize the selector.
+
+        Args:
+            rules: (pattern, tool names, boost) triples; when the pattern matches
+                the task, the named tools get the boost added to their score
+        """
+        self.rules: List[Tuple[Pattern, Sequence[str], float]] = [
+            (re.compile(pattern, re.IGNORECASE), names, boost)
+            for pattern, names, boost in rules
+        ]
+        # (name, description) -> embedding, so each tool is embedded once
+        self._index: Dict[Tuple[str, str], Dict[int, float]] = {}
+
+    def _tool_vector(self, tool: Dict[str, Any]) -> Dict[int, float]:
+        key = (tool["name"], tool.get("description") or "")
+        vector = self._index.get(key)
+        if vector is None:
+            vector = embed(f"{key[0]} {key[1]}")
+            self._index[key] = vector
+        return vector
+
+    def rank(
+        self, task: str, tools: List[Dict[str, Any]]
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Score every tool against the task.
+
+        Args:
+            task: Task description or prompt
+            tools: Anthropic tool payload
+
+        Returns:
+            (score, tool) pairs, best first
+        """
+        boosts: Dict[str, float] = {}
+        for pattern, names, boost in self.rules:
+            if pattern.search(task):
+                for name in names:
+                    boosts[name] = boosts.get(name, 0.0) + boost
+
+        task_vector = embed(task)
+        scored = [
+            (
+                boosts.get(tool["name"], 0.0)
+                + cosine(task_vector, self._tool_vector(tool)),
+                tool,
+            )
+            for tool in tools
+        ]
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return scored
+
+    def select(
+        self, task: str, tools: List[Dict[str, Any]], top_k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Pick the top-k tools for a task.
+
+        Args:
+            task: Task description or prompt
+            tools: Anthropic tool payload
+            top_k: Maximum number of tools to return
+
+        Returns:
+            The best scoring tools, best first
+        """
+        if len(tools) <= top_k:
+            return tools
+        selected = [tool for _, tool in self.rank(task, tools)[:top_k]]
+        logger.debug("Selected tools: %s", [tool["name"] for tool in selected])
+        return selected
@@ -0,0 +1,78 @@
+import pytest
+
+from job_tracker.email_cache import EmailCache
+from job_tracker.gmail_client import GmailClient
+from job_tracker.state import StateManager
+
+
+class FakeGmail(GmailClient):
+    """
+    GmailClient talking to an in-memory mailbox instead of an MCP server.
+
+    Searches return every message in the mailbox, or, with answers, the
+    results of the first answer whose term appears in the query. Metadata
+    fetches return a message without its body; full fetches are recorded
+    in downloads. before_call, if set, is awaited before every tool call.
+    With history set, the server also offers list_history, returning it.
+    """
+
+    def __init__(self, mailbox=None, answers=None, **kwargs):
+        super().__init__(**kwargs)
+        self.mailbox = mailbox if mailbox is not None else {}
+        self.answers = answers
+        self.calls = []
+        self.queries = []
+        self.downloads = []
+        self.before_call = None
+        self.history = None
+
+    async def ensure_connected(self):
+        return True
+
+    async def get_tools(self, refresh=False):
+        tools = [{"name": "search_emails"}, {"name": "get_email"}]
+        if self.history is not None:
+            tools.append({"name": "list_history"})
+        return tools
+
+    async def invoke_tool(self, tool_name, arguments=None):
+        self.calls.append((tool_name, arguments))
+        if self.before_call is not None:
+            await self.before_call(tool_name, arguments)
+        if tool_name == "search_emails":
+            self.queries.append(arguments["query"])
+            if self.answers is None:
+                return {"emails": [{"id": message_id} for message_id in self.mailbox]}
+            for term, emails in self.answers.items():
+                if term in arguments["query"]:
+                    return {"emails": emails}
+            return {"emails": []}
+        if tool_name == "list_history":
+            return self.history
+        message = self.mailbox[arguments["message_id"]]
+        if arguments.get("format") == "metadata":
+            return {key: value for key, value in message.items() if key != "body"}
+        self.downloads.append(arguments["message_id"])
+        return message
+
+
+@pytest.fixture
+def state(tmp_path):
+    return StateManager(str(tmp_path / "state.json"), backend="json")
+
+
+@pytest.fixture
+def email_cache(tmp_path):
+    return EmailCache(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def make_gmail(state, email_cache):
+    """Build a FakeGmail using the test's state and cache (state=None for none)."""
+
+    def make(mailbox=None, answers=None, **kwargs):
+        kwargs.setdefault("state", state)
+        kwargs.setdefault("cache", email_cache)
+        return FakeGmail(mailbox, answers, **kwargs)
+
+    return make
@@ -0,0 +1,51 @@
+from job_tracker.company_index import (
+    CompanyPageIndex,
+    company_identity_key,
+    normalize_company_name,
+)
+
+
+def test_normalize_company_name():
+    assert normalize_company_name("Acme Org") == "acme"
+    assert normalize_company_name("Acme, Inc.") == "acme"
+    assert normalize_company_name("ACME") == "acme"
+    assert normalize_company_name("Johnson & Johnson") == "johnson and johnson"
+    assert normalize_company_name("Company") == "company"
+
+
+def test_company_identity_key_keeps_distinguishing_words():
+    assert company_identity_key("Acme, Inc.") == company_identity_key("acme") == "acme"
+    assert company_identity_key("Acme Group") == "acme group"
+    assert company_identity_key("Acme Co") == "acme co"
+
+
+def test_lookup_matches_spelling_variants(tmp_path):
+    index = CompanyPageIndex(str(tmp_path / "index.json"))
+    index.add("Acme Org", "page-1")
+
+    assert index.lookup("Acme, Inc.") == "page-1"
+    assert index.lookup("acme") == "page-1"
+    assert index.lookup("Globex") is None
+
+
+def test_fuzzy_lookup(tmp_path):
+    index = CompanyPageIndex(str(tmp_path / "index.json"))
+    index.add("Initech Solutions", "page-1")
+    index.add("Initrode", "page-2")
+
+    assert index.lookup("Initech Solution") == "page-1"
+    assert index.lookup("Umbrella") is None
+
+
+def test_index_persists(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = CompanyPageIndex(path)
+    index.add("Acme", "page-1")
+    index.mark_seeded()
+
+    reloaded = CompanyPageIndex(path)
+    assert reloaded.lookup("acme inc") == "page-1"
+    assert reloaded.seeded_at is not None
+
+    reloaded.remove("Acme")
+    assert CompanyPageIndex(path).lookup("acme") is None
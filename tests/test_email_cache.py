@@ -0,0 +1,162 @@
+import asyncio
+
+from job_tracker.email_cache import EmailCache
+
+
+def test_cache_round_trip(tmp_path):
+    cache = EmailCache(str(tmp_path), memory_size=1)
+    cache.put("18c0ffee", {"id": "18c0ffee", "subject": "Interview"})
+    cache.put("18beef", {"id": "18beef", "subject": "Offer"})
+
+    assert "18c0ffee" in cache
+    assert EmailCache(str(tmp_path)).get("18c0ffee")["subject"] == "Interview"
+    cache.invalidate("18c0ffee")
+    assert cache.get("18c0ffee") is None
+    assert cache.get("../../etc/passwd") is None
+
+
+def test_sync_fetches_only_new_messages(make_gmail, state):
+    mailbox = {
+        "m1": {"id": "m1", "subject": "Interview"},
+        "m2": {"id": "m2", "subject": "Offer"},
+    }
+    gmail = make_gmail(mailbox)
+
+    async def run():
+        first = await gmail.sync_emails()
+        for email in first:
+            gmail.mark_processed(email["id"])
+        await gmail.finish_sync()
+        mailbox["m3"] = {"id": "m3", "subject": "Next steps after your interview"}
+        gmail.calls.clear()
+        second = await gmail.sync_emails()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert [email["id"] for email in first] == ["m1", "m2"]
+    assert [email["id"] for email in second] == ["m3"]
+    # Metadata for triage, then the full message
+    assert [name for name, _ in gmail.calls] == [
+        "search_emails",
+        "get_email",
+        "get_email",
+    ]
+    assert gmail.calls[1][1]["format"] == "metadata"
+    assert "after:" in gmail.calls[0][1]["query"]
+    assert state.get_setting("gmail_sync")["synced_at"] > 0
+
+
+def test_sync_retries_unprocessed_messages(make_gmail, state):
+    mailbox = {
+        "m1": {"id": "m1", "subject": "Interview"},
+        "m2": {"id": "m2", "subject": "Offer"},
+    }
+    gmail = make_gmail(mailbox)
+
+    async def run():
+        # m2 fails to process (e.g. Notion is down)
+        first = await gmail.sync_emails()
+        gmail.mark_processed("m1")
+        await gmail.finish_sync()
+        pending = state.get_setting("gmail_sync")["pending"]
+
+        # Later searches no longer reach back to m2; the cursor still has it
+        del mailbox["m1"], mailbox["m2"]
+        second = await gmail.sync_emails()
+        gmail.mark_processed("m2")
+        await gmail.finish_sync()
+        return first, pending, second
+
+    first, pending, second = asyncio.run(run())
+    assert [email["id"] for email in first] == ["m1", "m2"]
+    assert pending == {"m2": 1}
+    assert [email["id"] for email in second] == ["m2"]
+    assert state.get_setting("gmail_sync")["pending"] == {}
+
+
+def test_sync_cursor_waits_for_finish(make_gmail, state):
+    gmail = make_gmail({"m1": {"id": "m1", "subject": "Interview"}})
+
+    assert [email["id"] for email in asyncio.run(gmail.sync_emails())] == ["m1"]
+    assert state.get_setting("gmail_sync") is None
+    # Without finish_sync the next sync covers the same messages again
+    assert [email["id"] for email in asyncio.run(gmail.sync_emails())] == ["m1"]
+
+
+def test_history_label_changes_are_not_new_mail(make_gmail, state, email_cache):
+    mailbox = {
+        "m1": {"id": "m1", "subject": "Interview"},
+        "m2": {"id": "m2", "subject": "Offer"},
+    }
+    gmail = make_gmail(mailbox)
+    state.update_setting("gmail_sync", {"history_id": "100", "synced_at": 1.0})
+
+    async def run():
+        gmail.history = {
+            "history": [{"id": "101", "messagesAdded": [{"message": {"id": "m1"}}]}],
+            "historyId": "101",
+        }
+        first = await gmail.sync_emails()
+        for email in first:
+            gmail.mark_processed(email["id"])
+        await gmail.finish_sync()
+
+        # m1 is read and archived; m2 arrives
+        gmail.history = {
+            "history": [
+                {
+                    "id": "102",
+                    "messages": [{"id": "m1"}],
+                    "labelsRemoved": [
+                        {"message": {"id": "m1"}, "labelIds": ["UNREAD", "INBOX"]}
+                    ],
+                },
+                {
+                    "id": "103",
+                    "messages": [{"id": "m2"}],
+                    "messagesAdded": [{"message": {"id": "m2"}}],
+                },
+            ],
+            "historyId": "103",
+        }
+        second = await gmail.sync_emails()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert [email["id"] for email in first] == ["m1"]
+    assert [email["id"] for email in second] == ["m2"]
+    assert email_cache.status("m1") == "processed"
+    assert "m1" not in email_cache
+    assert not any(name == "search_emails" for name, _ in gmail.calls)
+
+
+def test_get_emails_is_bounded_and_reports_failures(make_gmail, email_cache):
+    mailbox = {f"m{i}": {"id": f"m{i}"} for i in range(10)}
+    mailbox["m5"] = {"error": "not found"}
+    in_flight = []
+
+    email_cache.put("m9", {"id": "m9", "cached": True})
+    gmail = make_gmail(mailbox, state=None)
+
+    async def slow(tool_name, arguments):
+        in_flight.append(1)
+        assert len(in_flight) <= 3
+        await asyncio.sleep(0.01 if arguments["message_id"] != "m0" else 0.05)
+        in_flight.pop()
+
+    gmail.before_call = slow
+
+    async def run():
+        return [
+            item
+            async for item in gmail.get_emails(
+                [f"m{i}" for i in range(10)], concurrency=3
+            )
+        ]
+
+    results = asyncio.run(run())
+    assert results[0] == ("m9", {"id": "m9", "cached": True}, None)
+    assert sorted(email_id for email_id, _, _ in results) == sorted(mailbox)
+    assert [email_id for email_id, email, error in results if error] == ["m5"]
+    # Completion order: the slow first message isn't waited for
+    assert [email_id for email_id, _, _ in results].index("m0") > 3
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from job_tracker.email_extraction import extract_body_key_points, extract_company
+from job_tracker.gmail_client import GmailClient
+
+BODY = """Hi Sam,
+
+Thank you for your application for the Senior Backend Engineer role. Your
+interview has been scheduled for March 14th, 2026 at 10:30 AM.
+Next steps will be a technical screen with two engineers.
+Please confirm your availability by replying to this email.
+
+Best,
+Jane Doe
+Acme Robotics, Inc.
+"""
+
+
+def test_key_points_and_company():
+    points = extract_body_key_points(BODY)
+    assert "Scheduled: March 14th, 2026 at 10:30 AM" in points
+    assert "Position: the Senior Backend Engineer role" in points
+    assert "Next steps: a technical screen with two engineers" in points
+    assert "Next steps: confirm your availability by replying to this email" in points
+
+    assert extract_company(BODY, "") == "Acme Robotics"
+    assert extract_company("I'm working with Globex on hiring", "") == "Globex"
+    assert extract_company("", "Interview with Initech next week") == "Initech"
+    assert extract_company("nothing here", "hello") is None
+
+
+def test_overlapping_rules_all_match():
+    body = (
+        "Your interview for the position of Staff Engineer, is scheduled for March 3."
+    )
+    assert extract_body_key_points(body) == [
+        "Scheduled: March 3",
+        "Position: Staff Engineer",
+    ]
+    # Matches straddling a chunk boundary are found once
+    padded = "x" * 4090 + " " + body
+    assert extract_body_key_points(padded) == extract_body_key_points(body)
+
+
+def test_gmail_client_uses_engine():
+    gmail = GmailClient()
+    email = {"from": "jane@gmail.com", "subject": "Your application", "body": BODY}
+    assert asyncio.run(gmail.extract_company_from_email(email)) == "Acme Robotics"
+    points = asyncio.run(gmail.extract_key_points(email))
+    assert points[-1] == "From: jane@gmail.com"
+
+
+def test_adversarial_bodies_stay_within_budget():
+    bodies = [
+        "Quarterly Update From The Team\n" * 5000,
+        "role " + "word " * 50000,
+        "interview " * 30000,
+        "please " * 30000,
+        "a" * 200000 + "day",
+    ]
+    for body in bodies:
+        start = time.perf_counter()
+        extract_body_key_points(body, budget=0.02)
+        extract_company(body, body[:500], budget=0.02)
+        assert time.perf_counter() - start < 0.5
@@ -0,0 +1,87 @@
+import asyncio
+
+from job_tracker.email_search import merge_ranked, plan_company_queries
+
+
+def test_plan_covers_every_keyword():
+    keywords = [f"kw{i}" for i in range(10)] + ["job opportunity"]
+    queries = plan_company_queries(
+        ["Acme", "acme labs"], keywords, ["acme.com"], keywords_per_query=4
+    )
+
+    keyword_queries = [
+        query for query, weight in queries if not query.startswith("from:")
+    ]
+    assert len(keyword_queries) == 3
+    for keyword in keywords[:-1]:
+        assert (
+            sum(
+                keyword + " " in query or keyword + "}" in query
+                for query in keyword_queries
+            )
+            == 1
+        )
+    assert '"job opportunity"' in keyword_queries[-1]
+    assert all(query.startswith('{Acme "acme labs"} ') for query in keyword_queries)
+    assert queries[-1][0] == 'from:{@acme.com Acme "acme labs"} newer_than:3m'
+
+
+def test_merge_ranks_by_weight_and_dedups():
+    results = [
+        ([{"id": "a"}, {"id": "b"}], 1.0),
+        ([{"id": "c"}, {"id": "b"}], 1.0),
+        ([{"id": "d"}], 2.0),
+    ]
+    assert [email["id"] for email in merge_ranked(results, 10)] == ["d", "b", "a", "c"]
+    assert [email["id"] for email in merge_ranked(results, 2)] == ["d", "b"]
+
+
+def test_search_company_emails_merges_planned_queries(make_gmail, state):
+    state.update_company_state(
+        "Acme Inc", {"status": "Applied", "email_domains": ["acme.io"]}
+    )
+    state.add_company_alias("Roadrunner Labs", "Acme Inc")
+    gmail = make_gmail(
+        answers={"@acme.io": [{"id": "m2"}], "salary": [{"id": "m1"}, {"id": "m2"}]}
+    )
+
+    first = asyncio.run(gmail.search_company_emails("ACME", limit=5))
+    assert [email["id"] for email in first] == ["m2", "m1"]
+    assert len(gmail.queries) > 1
+    assert all("roadrunner labs" in query for query in gmail.queries)
+    keywords = " ".join(gmail.queries)
+    assert all(keyword in keywords for keyword in gmail.job_keywords)
+
+    # Repeat searches for any spelling come from the plan cache
+    gmail.queries.clear()
+    assert asyncio.run(gmail.search_company_emails("Acme", limit=5)) == first
+    assert gmail.queries == []
+
+
+def test_search_cache_follows_new_aliases_and_domains(make_gmail, state):
+    state.update_company_state("Acme", {"status": "Applied"})
+    gmail = make_gmail(answers={})
+
+    asyncio.run(gmail.search_company_emails("Acme"))
+    state.add_company_alias("Roadrunner", "Acme")
+    gmail.queries.clear()
+    asyncio.run(gmail.search_company_emails("Acme"))
+    assert gmail.queries and all("roadrunner" in query for query in gmail.queries)
+
+    state.update_company_state("Acme", {"email_domains": ["acme.io"]})
+    gmail.queries.clear()
+    asyncio.run(gmail.search_company_emails("Acme"))
+    assert any("@acme.io" in query for query in gmail.queries)
+
+
+def test_sender_match_alone_ranks_below_a_keyword_match():
+    queries = plan_company_queries(["Acme"], ["interview"], ["acme.com"])
+    results = [
+        ([{"id": "keyword"}, {"id": "both"}], queries[0][1]),
+        ([{"id": "newsletter"}, {"id": "both"}], queries[1][1]),
+    ]
+    assert [email["id"] for email in merge_ranked(results, 3)] == [
+        "both",
+        "keyword",
+        "newsletter",
+    ]
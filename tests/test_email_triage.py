@@ -0,0 +1,62 @@
+import asyncio
+
+from job_tracker.email_triage import EmailTriage
+
+
+def test_triage_scores_keywords_senders_and_labels():
+    triage = EmailTriage(
+        ["interview", "offer", "job opportunity"], lambda name: name == "acme"
+    )
+
+    assert triage.passes({"subject": "Your interview on Monday"})
+    assert triage.passes({"snippet": "an exciting job opportunity"})
+    assert not triage.passes(
+        {"subject": "Offering 50% off today", "from": "deals@shop.com"}
+    )
+    assert triage.passes(
+        {"subject": "Quick question", "from": "Jane <jane@careers.acme.com>"}
+    )
+    assert triage.passes({"subject": "Hi", "from": "jane@acme.co.uk"})
+    assert not triage.passes(
+        {"subject": "Interview tips", "labels": ["CATEGORY_PROMOTIONS"]}
+    )
+
+
+def test_sync_downloads_only_relevant_bodies(make_gmail, state, email_cache):
+    state.update_company_state("Globex", {"status": "Applied"})
+    mailbox = {
+        "m1": {
+            "id": "m1",
+            "from": "news@shop.com",
+            "subject": "Weekly deals",
+            "body": "x" * 1000,
+        },
+        "m2": {
+            "id": "m2",
+            "from": "hr@globex.com",
+            "subject": "Hello",
+            "body": "Let's talk",
+        },
+        "m3": {
+            "id": "m3",
+            "from": "a@b.com",
+            "subject": "Interview invitation",
+            "body": "...",
+        },
+        "m4": {"id": "m4", "from": "a@b.com", "subject": "Lunch?", "body": "..."},
+    }
+    gmail = make_gmail(mailbox)
+
+    emails = asyncio.run(gmail.sync_emails())
+    assert sorted(email["id"] for email in emails) == ["m2", "m3"]
+    assert sorted(gmail.downloads) == ["m2", "m3"]
+
+    # Triaged-out messages are recorded, so later syncs don't look at them again
+    assert email_cache.status("m1") == email_cache.status("m4") == "rejected"
+    for email in emails:
+        gmail.mark_processed(email["id"])
+    asyncio.run(gmail.finish_sync())
+    assert state.get_setting("gmail_sync")["pending"] == {}
+    gmail.calls.clear()
+    assert asyncio.run(gmail.sync_emails()) == []
+    assert [name for name, _ in gmail.calls] == ["search_emails"]
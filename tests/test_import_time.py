@@ -0,0 +1,51 @@
+"""
+Import-time budget for the CLI entry point.
+
+Every job-tracker invocation imports job_tracker.main before doing anything,
+so heavy dependencies must stay out of its import graph.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+# Cumulative import time allowed for job_tracker.main (override for slow CI boxes)
+IMPORT_BUDGET_US = int(os.environ.get("JOB_TRACKER_IMPORT_BUDGET_MS", "1000")) * 1000
+
+# Modules that should only load when transcription or the LLM path runs
+HEAVY_MODULES = {"whisper", "torch", "anthropic"}
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)")
+
+
+def import_times(module: str) -> dict:
+    """Run ``python -X importtime`` and return cumulative microseconds per module."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert proc.returncode == 0, proc.stderr
+    times = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            times[match.group(2)] = int(match.group(1))
+    return times
+
+
+def test_main_import_within_budget():
+    # Best of three runs; the first also warms the bytecode cache
+    best = min(import_times("job_tracker.main")["job_tracker.main"] for _ in range(3))
+    assert best <= IMPORT_BUDGET_US, (
+        f"importing job_tracker.main took {best / 1000:.0f}ms "
+        f"(budget {IMPORT_BUDGET_US / 1000:.0f}ms)"
+    )
+
+
+def test_main_does_not_import_heavy_modules():
+    imported = {name.split(".")[0] for name in import_times("job_tracker.main")}
+    assert not imported & HEAVY_MODULES
@@ -0,0 +1,92 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from job_tracker import main
+from job_tracker.main import COMMAND_SERVERS, JobTrackerApp
+from job_tracker.mcp_client import MCPSessionManager
+
+
+class FakeManager(MCPSessionManager):
+    """
+    Session manager whose servers start after a delay per server (None: the
+    server fails to start), recording the servers started and aborted.
+    """
+
+    delays = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.started = []
+        self.aborted = []
+
+    async def get_session(self, server_key):
+        self.started.append(server_key)
+        delay = self.delays.get(server_key, 0)
+        if delay is None:
+            return None
+        await asyncio.sleep(delay)
+        self._sessions[server_key] = object()
+        return self._sessions[server_key]
+
+    async def abort(self, server_key):
+        self.aborted.append(server_key)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    # Transcription must never be set up just to connect
+    monkeypatch.setitem(sys.modules, "whisper", None)
+    monkeypatch.setattr(main, "MCPSessionManager", FakeManager)
+    app = JobTrackerApp()
+    yield app
+    asyncio.run(app.cleanup())
+
+
+def test_servers_connect_concurrently_with_their_own_timeouts(app, monkeypatch):
+    monkeypatch.setattr(
+        FakeManager, "delays", {"notion": 0.05, "gmail": None, "audio": 5}
+    )
+
+    async def run():
+        start = time.perf_counter()
+        connected = await app.connect(("notion", "gmail", "audio"), timeout=0.3)
+        return connected, time.perf_counter() - start
+
+    connected, elapsed = asyncio.run(run())
+    assert connected
+    assert app.connections == {"notion": True, "gmail": False, "audio": False}
+    # The slow server costs its own timeout, not the others' time on top
+    assert elapsed < 1
+    assert 0.05 <= app.connect_times["notion"] < 0.3
+    assert app.connect_times["gmail"] < 0.3
+    assert app.connect_times["audio"] >= 0.3
+    # Its startup is abandoned, so later use doesn't wait on it without limit
+    assert app.mcp.aborted == ["audio"]
+
+
+def test_connect_fails_only_when_every_server_fails(app, monkeypatch):
+    monkeypatch.setattr(FakeManager, "delays", {"notion": None, "gmail": None})
+
+    assert not asyncio.run(app.connect(("notion", "gmail")))
+    assert app.connections == {"notion": False, "gmail": False}
+    assert app.mcp.aborted == []
+
+
+@pytest.mark.parametrize("command", sorted(COMMAND_SERVERS))
+def test_commands_start_only_the_servers_they_need(app, command):
+    servers = COMMAND_SERVERS[command]
+
+    assert asyncio.run(app.connect(servers))
+    assert sorted(app.mcp.started) == sorted(servers)
+    # The audio client (and with it transcription) is only set up for audio
+    assert (app._audio is not None) == ("audio" in servers)
+
+
+def test_email_does_not_start_audio(app):
+    asyncio.run(app.connect(COMMAND_SERVERS["email"]))
+    assert "audio" not in app.mcp.started
+    assert app._audio is None
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from job_tracker import mcp_client
+from job_tracker.mcp_client import MCPSessionManager, parse_tool_result
+from job_tracker.tool_cache import ToolSchemaCache
+
+
+class FakeServer:
+    """Stands in for stdio_client and ClientSession, counting server starts."""
+
+    def __init__(self):
+        self.sessions = []
+        self.fail_next = False
+        self.hold_initialize = None
+
+    @asynccontextmanager
+    async def stdio_client(self, params):
+        yield "read", "write"
+
+    def session(self, read, write):
+        session = FakeSession(self)
+        self.sessions.append(session)
+        return session
+
+
+class FakeSession:
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+    async def initialize(self):
+        if self.server.hold_initialize is not None:
+            await self.server.hold_initialize.wait()
+        if self.server.fail_next:
+            self.server.fail_next = False
+            raise ConnectionError("server exited during startup")
+        return SimpleNamespace(serverInfo=SimpleNamespace(name="fake", version="1.0"))
+
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeServer()
+    monkeypatch.setattr(mcp_client, "stdio_client", fake.stdio_client)
+    monkeypatch.setattr(mcp_client, "ClientSession", fake.session)
+    return fake
+
+
+@pytest.fixture
+def manager(tmp_path):
+    config = tmp_path / "mcp_config.json"
+    config.write_text(
+        json.dumps({"mcpServers": {"gmail": {"command": "node", "args": ["gmail.js"]}}})
+    )
+    return MCPSessionManager(str(config), ToolSchemaCache(str(tmp_path / "tools")))
+
+
+def test_sessions_start_once_and_are_shared(server, manager):
+    async def run():
+        sessions = await asyncio.gather(
+            *(manager.get_session("gmail") for _ in range(3))
+        )
+        assert len(server.sessions) == 1
+        assert all(session is server.sessions[0] for session in sessions)
+        assert manager.is_running("gmail")
+        assert manager.server_info("gmail").name == "fake"
+        assert await manager.get_session("gmail") is sessions[0]
+        assert await manager.get_session("unknown") is None
+        await manager.aclose()
+        assert server.sessions[0].closed
+
+    asyncio.run(run())
+
+
+def test_stop_closes_the_session_and_next_use_restarts(server, manager):
+    async def run():
+        first = await manager.get_session("gmail")
+        await manager.stop("gmail")
+        assert first.closed and not manager.is_running("gmail")
+
+        second = await manager.get_session("gmail")
+        assert second is not first and len(server.sessions) == 2
+        await manager.aclose()
+
+    asyncio.run(run())
+
+
+def test_stop_during_startup(server, manager, caplog):
+    async def run():
+        server.hold_initialize = asyncio.Event()
+        starting = asyncio.create_task(manager.get_session("gmail"))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        stopping = asyncio.create_task(manager.stop("gmail"))
+        await asyncio.sleep(0)
+        server.hold_initialize.set()
+        await stopping
+        await starting
+        assert server.sessions[0].closed and not manager.is_running("gmail")
+
+    with caplog.at_level(logging.ERROR, logger="job-tracker.mcp"):
+        asyncio.run(run())
+    assert caplog.records == []
+
+
+def test_crashed_server_is_restarted(server, manager):
+    async def run():
+        server.fail_next = True
+        assert await manager.get_session("gmail") is None
+        first = await manager.get_session("gmail")
+        assert first is not None
+
+        # The runner dies while the session is in use
+        manager._runners["gmail"].cancel()
+        await asyncio.sleep(0)
+        assert not manager.is_running("gmail")
+        second = await manager.get_session("gmail")
+        assert second is not None and second is not first
+        assert len(server.sessions) == 3
+        await manager.aclose()
+
+    asyncio.run(run())
+
+
+def test_hung_startup_is_abandoned(server, manager):
+    async def run():
+        manager.startup_timeout = 0.05
+        server.hold_initialize = asyncio.Event()
+        waiters = [manager.get_session("gmail") for _ in range(2)]
+        assert await asyncio.gather(*waiters) == [None, None]
+        assert server.sessions[0].closed and not manager.is_running("gmail")
+
+        # The next use starts the server again instead of waiting on the hung one
+        server.hold_initialize = None
+        assert await manager.get_session("gmail") is not None
+        assert len(server.sessions) == 2
+        await manager.aclose()
+
+    asyncio.run(run())
+
+
+def text_result(text, is_error=False):
+    return SimpleNamespace(content=[SimpleNamespace(text=text)], isError=is_error)
+
+
+def test_parse_tool_result():
+    assert parse_tool_result(text_result('{"emails": []}')) == {"emails": []}
+    assert parse_tool_result(text_result("[1, 2]")) == {"items": [1, 2]}
+    assert parse_tool_result(text_result("Sent")) == {"text": "Sent"}
+    assert parse_tool_result(text_result("quota exceeded", is_error=True)) == {
+        "error": "quota exceeded"
+    }
+    assert parse_tool_result(SimpleNamespace(content=None, isError=True)) == {
+        "error": "Tool call failed"
+    }
@@ -0,0 +1,81 @@
+from job_tracker.note_sections import PageOutline, classify_section, note_to_blocks
+
+
+def heading(block_id, text, level=1):
+    block_type = f"heading_{level}"
+    return {
+        "id": block_id,
+        "type": block_type,
+        block_type: {"rich_text": [{"plain_text": text}]},
+    }
+
+
+def paragraph(block_id):
+    return {"id": block_id, "type": "paragraph", "paragraph": {"rich_text": []}}
+
+
+def test_outline_tracks_section_ends():
+    outline = PageOutline(
+        [
+            heading("h1", "Interactions"),
+            heading("h2", "Calls", level=2),
+            paragraph("p1"),
+            heading("h3", "Emails", level=2),
+            paragraph("p2"),
+            heading("h4", "Offer"),
+            paragraph("p3"),
+        ]
+    )
+
+    assert outline.headings() == ["Interactions", "Calls", "Emails", "Offer"]
+    assert outline.section_end("Calls") == "p1"
+    assert outline.section_end("Interactions") == "p2"
+    assert outline.section_end("Offer") == "p3"
+
+    outline.record_append("Emails", "new")
+    assert outline.section_end("Emails") == "new"
+    assert outline.section_end("Interactions") == "new"
+    assert outline.section_end("Calls") == "p1"
+
+
+def test_classify_prefers_section_named_after_note_kind():
+    headings = ["Interactions", "Phone Calls", "Emails"]
+
+    assert classify_section("Call Notes - 2025-01-01\nKey Points:", headings) == (
+        "Phone Calls",
+        1.0,
+    )
+    assert classify_section("Email - 2025-01-01\nFrom: a@b.com", headings) == (
+        "Emails",
+        1.0,
+    )
+
+
+def test_classify_falls_back_to_generic_section():
+    heading_name, confidence = classify_section(
+        "Call Notes - 2025-01-01", ["Interactions", "Offer"]
+    )
+
+    assert heading_name == "Interactions"
+    assert 0.5 < confidence < 1.0
+
+
+def test_classify_without_matching_section_has_no_confidence():
+    assert classify_section("Call Notes - 2025-01-01", []) == (None, 0.0)
+    assert classify_section("Call Notes - 2025-01-01", ["Benefits"]) == (None, 0.0)
+
+
+def test_note_to_blocks():
+    blocks = note_to_blocks("Email - today\nKey Points:\n- first\n\n" + "x" * 4500)
+
+    assert [block["type"] for block in blocks] == [
+        "paragraph",
+        "paragraph",
+        "bulleted_list_item",
+        "paragraph",
+    ]
+    assert blocks[0]["paragraph"]["rich_text"][0]["annotations"] == {"bold": True}
+    assert blocks[2]["bulleted_list_item"]["rich_text"][0]["text"]["content"] == "first"
+    assert [
+        len(item["text"]["content"]) for item in blocks[3]["paragraph"]["rich_text"]
+    ] == [2000, 2000, 500]
@@ -0,0 +1,325 @@
+import asyncio
+import copy
+import inspect
+from types import SimpleNamespace
+
+from job_tracker.company_index import CompanyPageIndex
+from job_tracker.notion_client import NotionClient
+
+
+def titled(page_id, title, **fields):
+    return {
+        "id": page_id,
+        "properties": {"Name": {"type": "title", "title": [{"plain_text": title}]}},
+        **fields,
+    }
+
+
+class FakeNotion(NotionClient):
+    """
+    NotionClient whose tools are answered by a handler per tool name
+    (a handler may be a coroutine function).
+    """
+
+    def __init__(self, handlers, **kwargs):
+        super().__init__(**kwargs)
+        self.handlers = handlers
+        self.calls = []
+
+    async def ensure_connected(self):
+        return True
+
+    async def invoke_tool(self, tool_name, arguments=None):
+        self.calls.append((tool_name, arguments))
+        result = self.handlers[tool_name](arguments)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+def make_index(tmp_path):
+    index = CompanyPageIndex(str(tmp_path / "index.json"))
+    index.mark_seeded()
+    return index
+
+
+def test_search_without_title_match_is_not_indexed(tmp_path):
+    index = make_index(tmp_path)
+    notion = FakeNotion(
+        {
+            "notion_search": lambda args: {
+                "results": [titled("p1", "Meeting notes mentioning Acme")]
+            }
+        },
+        company_index=index,
+    )
+
+    assert asyncio.run(notion.get_company_page_id("Acme")) is None
+    assert len(index) == 0
+
+
+def test_deleted_page_is_evicted_and_searched_again(tmp_path):
+    index = make_index(tmp_path)
+    index.add("Acme", "old")
+    heading = {
+        "id": "h1",
+        "type": "heading_2",
+        "heading_2": {"rich_text": [{"plain_text": "Emails"}]},
+    }
+
+    def blocks(args):
+        if args["block_id"] == "old":
+            return {"error": "Could not find block with ID: old (object_not_found)"}
+        return {"results": [heading]}
+
+    notion = FakeNotion(
+        {
+            "notion_retrieve_block_children": blocks,
+            "notion_search": lambda args: {
+                "results": [titled("other", "Acme news"), titled("new", "Acme Inc")]
+            },
+            "notion_append_block_children": lambda args: {"results": [{"id": "b1"}]},
+        },
+        company_index=index,
+    )
+
+    note = "Email - 2025-01-01\n- Interview scheduled"
+    result = asyncio.run(notion.add_content_to_company_page("Acme", note))
+    assert result == "Appended 2 blocks under section 'Emails'"
+    assert index.lookup("Acme") == "new"
+    assert "old" not in [entry["page_id"] for entry in index.pages.values()]
+    appends = [args for name, args in notion.calls if name.startswith("notion_append")]
+    assert [args["block_id"] for args in appends] == ["new"]
+
+
+def test_indexed_page_is_used_without_a_request(tmp_path):
+    index = make_index(tmp_path)
+    index.add("Acme", "p1")
+    notion = FakeNotion({}, company_index=index)
+
+    async def run():
+        return [await notion.get_company_page_id("Acme") for _ in range(3)]
+
+    assert asyncio.run(run()) == ["p1"] * 3
+    assert notion.calls == []
+
+
+def test_partial_append_failure_does_not_fall_back_to_llm():
+    heading = {
+        "id": "h1",
+        "type": "heading_2",
+        "heading_2": {"rich_text": [{"plain_text": "Emails"}]},
+    }
+    appended = []
+
+    def append(args):
+        if appended:
+            return {"error": "rate limited"}
+        appended.append(len(args["children"]))
+        return {"results": [{"id": "b1"}]}
+
+    notion = FakeNotion(
+        {
+            "notion_retrieve_block_children": lambda args: {"results": [heading]},
+            "notion_append_block_children": append,
+        },
+        company_index=CompanyPageIndex("/nonexistent/index.json"),
+    )
+
+    async def no_llm(page_id, text_content):
+        raise AssertionError("fell back to the LLM")
+
+    notion.dynamic_append_content = no_llm
+    note = "Email - 2025-01-01\n" + "\n".join(f"- point {i}" for i in range(150))
+
+    result = asyncio.run(notion.append_content("page", note))
+    assert result.startswith("Appended 100 of 151 blocks under section 'Emails'")
+    assert appended == [100]
+    # The failed batch was retried once
+    assert [name for name, _ in notion.calls].count("notion_append_block_children") == 3
+
+
+def test_template_error_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setenv("NOTION_DATABASE_ID", "db")
+    notion = FakeNotion(
+        {
+            "notion_retrieve_database": lambda args: {
+                "properties": {"Name": {"type": "title"}}
+            },
+            "notion_create_database_item": lambda args: {"id": "p1"},
+            "notion_append_block_children": lambda args: {"error": "validation_error"},
+        },
+        company_index=make_index(tmp_path),
+    )
+
+    page = asyncio.run(notion.create_company_page("Acme"))
+    assert page["id"] == "p1"
+    assert page["template_error"] == "validation_error"
+
+
+def test_concurrent_spellings_create_one_page(tmp_path, monkeypatch):
+    monkeypatch.setenv("NOTION_DATABASE_ID", "db")
+
+    async def create(args):
+        await asyncio.sleep(0.01)
+        return {"id": "p1"}
+
+    notion = FakeNotion(
+        {
+            "notion_search": lambda args: {"results": []},
+            "notion_retrieve_database": lambda args: {
+                "properties": {"Name": {"type": "title"}}
+            },
+            "notion_create_database_item": create,
+            "notion_append_block_children": lambda args: {"results": []},
+        },
+        company_index=make_index(tmp_path),
+    )
+
+    async def run():
+        return await asyncio.gather(
+            notion.get_or_create_company("Acme Inc"),
+            notion.get_or_create_company("ACME, Inc."),
+        )
+
+    pages = asyncio.run(run())
+    assert [page["id"] for page in pages] == ["p1", "p1"]
+    names = [name for name, _ in notion.calls]
+    assert names.count("notion_search") == 1
+    assert names.count("notion_create_database_item") == 1
+    assert notion.company_index.lookup("acme") == "p1"
+
+
+def test_page_is_created_under_notion_page_id(tmp_path, monkeypatch):
+    monkeypatch.delenv("NOTION_DATABASE_ID", raising=False)
+    monkeypatch.setenv("NOTION_PAGE_ID", "parent-1")
+    databases = []
+
+    def search(args):
+        if args["filter"]["value"] == "database":
+            return {"results": databases}
+        return {"results": []}
+
+    def create_database(args):
+        assert args["parent"] == {"type": "page_id", "page_id": "parent-1"}
+        database = {
+            "id": "db1",
+            "title": [{"plain_text": "Job Applications"}],
+            "parent": {"type": "page_id", "page_id": "parent1"},
+            "properties": {
+                name: {"type": next(iter(prop))}
+                for name, prop in args["properties"].items()
+            },
+        }
+        databases.append(database)
+        return database
+
+    handlers = {
+        "notion_search": search,
+        "notion_create_database": create_database,
+        "notion_retrieve_database": lambda args: databases[0],
+        "notion_create_database_item": lambda args: {"id": "p1"},
+        "notion_append_block_children": lambda args: {"results": []},
+    }
+    notion = FakeNotion(handlers, company_index=make_index(tmp_path))
+    assert asyncio.run(notion.create_company_page("Acme"))["id"]
+    assert asyncio.run(notion.create_company_page("Globex"))["id"]
+    # A later run finds the database instead of creating another one
+    again = FakeNotion(handlers, company_index=make_index(tmp_path))
+    assert asyncio.run(again.create_company_page("Initech"))["id"]
+
+    calls = notion.calls + again.calls
+    assert [name for name, _ in calls].count("notion_create_database") == 1
+    items = [args for name, args in calls if name == "notion_create_database_item"]
+    assert [args["database_id"] for args in items] == ["db1"] * 3
+    assert items[0]["properties"]["Position"] == {
+        "rich_text": [{"text": {"content": "Unknown"}}]
+    }
+    assert items[0]["properties"]["Name"]["title"][0]["text"]["content"] == "Acme"
+
+
+def test_bulk_add_runs_concurrently_and_isolates_errors(tmp_path):
+    in_flight = []
+    peak = []
+
+    class StubNotion(NotionClient):
+        async def add_content_to_company_page(self, company_name, content):
+            in_flight.append(company_name)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(company_name)
+            if company_name == "Globex":
+                raise ConnectionError("Notion is down")
+            return {"id": f"page-{company_name}", "content": content}
+
+    notion = StubNotion(company_index=make_index(tmp_path))
+    contents = {"Acme": "a", "Globex": "b", "Initech": "c"}
+    results = asyncio.run(notion.add_content_to_company_pages(contents))
+
+    assert max(peak) == 3
+    assert list(results) == ["Acme", "Globex", "Initech"]
+    assert results["Acme"] == {"id": "page-Acme", "content": "a"}
+    assert isinstance(results["Globex"], ConnectionError)
+    assert results["Initech"]["id"] == "page-Initech"
+
+
+def test_tool_uses_of_a_turn_run_together_and_answer_in_one_message(tmp_path):
+    def tool_use(tool_id, name):
+        return SimpleNamespace(type="tool_use", id=tool_id, name=name, input={})
+
+    replies = [
+        [tool_use("t1", "notion_slow"), tool_use("t2", "notion_failing")],
+        [SimpleNamespace(type="text", text="Done")],
+    ]
+    requests = []
+
+    async def create(**kwargs):
+        # The client appends to the same list later; keep what was sent
+        requests.append(copy.copy(kwargs["messages"]))
+        return SimpleNamespace(content=replies[len(requests) - 1])
+
+    in_flight = []
+    peak = []
+
+    async def call_tool(name, arguments):
+        in_flight.append(name)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.05 if name == "notion_slow" else 0.01)
+        in_flight.remove(name)
+        if name == "notion_failing":
+            raise ConnectionError("Notion is down")
+        return SimpleNamespace(content=[SimpleNamespace(text="ok")], isError=False)
+
+    llm = SimpleNamespace(
+        client=SimpleNamespace(messages=SimpleNamespace(create=create))
+    )
+    notion = NotionClient(llm=llm, company_index=make_index(tmp_path))
+    notion.session = SimpleNamespace(call_tool=call_tool)
+
+    async def get_tools():
+        return []
+
+    notion.get_tools = get_tools
+    notion.filter_tools = lambda task, tools: tools
+
+    result = asyncio.run(notion.dynamic_append_content("p1", "Interview on Monday"))
+    assert result.endswith("Done")
+    assert max(peak) == 2
+    # One user message answers both calls, in the order the model made them
+    assert len(requests) == 2
+    answer = requests[1][-1]
+    assert answer["role"] == "user"
+    assert answer["content"] == [
+        {
+            "type": "tool_result",
+            "tool_use_id": "t1",
+            "content": [{"type": "text", "text": "ok"}],
+            "is_error": False,
+        },
+        {
+            "type": "tool_result",
+            "tool_use_id": "t2",
+            "content": "Notion is down",
+            "is_error": True,
+        },
+    ]
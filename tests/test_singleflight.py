@@ -0,0 +1,47 @@
+import asyncio
+
+from job_tracker.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_flight():
+    calls = []
+
+    async def lookup(name):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        return f"page-{name}"
+
+    async def run():
+        flights = SingleFlight()
+        results = await asyncio.gather(
+            *(flights.do("acme", lookup, "acme") for _ in range(10)),
+            flights.do("globex", lookup, "globex"),
+        )
+        assert not flights.in_flight("acme")
+        return results
+
+    results = asyncio.run(run())
+    assert results == ["page-acme"] * 10 + ["page-globex"]
+    assert sorted(calls) == ["acme", "globex"]
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        await asyncio.sleep(0)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return "ok"
+
+    async def run():
+        flights = SingleFlight()
+        first = await asyncio.gather(
+            flights.do("k", flaky), flights.do("k", flaky), return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in first)
+        assert await flights.do("k", flaky) == "ok"
+
+    asyncio.run(run())
+    assert len(attempts) == 2
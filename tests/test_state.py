@@ -0,0 +1,699 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from job_tracker import state_codec, state_index
+from job_tracker.state import StateManager
+from job_tracker.state_backends import EventLogStateBackend, SQLiteStateBackend
+from job_tracker.state_codec import LazyCompanies
+from job_tracker.state_index import StateIndexes
+
+STATE_FILES = {"json": "state.json", "sqlite": "state.db", "eventlog": "state.log"}
+
+
+@pytest.fixture(params=sorted(STATE_FILES))
+def state_path(request, tmp_path):
+    return request.param, str(tmp_path / STATE_FILES[request.param])
+
+
+def test_company_updates_round_trip(state_path):
+    backend, path = state_path
+    state = StateManager(path, backend=backend)
+    state.update_company_state(
+        "Acme", {"last_interaction": "email", "last_interaction_date": "2025-03-01"}
+    )
+    state.update_company_state("Acme", {"status": "Applied"})
+    state.update_setting("theme", {"dark": True})
+    state.close()
+
+    reloaded = StateManager(path, backend=backend)
+    company = reloaded.get_company_state("Acme")
+    assert company["status"] == "Applied"
+    assert company["interactions"] == [{"type": "email", "date": "2025-03-01"}]
+    assert reloaded.get_stats()["applications_sent"] == 1
+    assert reloaded.get_setting("theme") == {"dark": True}
+
+
+def test_clear_state(state_path):
+    backend, path = state_path
+    state = StateManager(path, backend=backend)
+    state.update_company_state("Acme", {"status": "Applied"})
+    state.clear_state()
+    state.close()
+
+    reloaded = StateManager(path, backend=backend)
+    assert reloaded.get_all_companies() == {}
+    assert reloaded.get_stats()["applications_sent"] == 0
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "eventlog"])
+def test_migrates_legacy_json(tmp_path, backend):
+    legacy = {
+        "version": "1.0",
+        "companies": {
+            "Acme": {
+                "status": "Interview",
+                "interactions": [{"type": "call", "date": "2025-01-02"}],
+            }
+        },
+        "stats": {
+            "applications_sent": 3,
+            "interviews_scheduled": 1,
+            "offers_received": 0,
+            "rejections": 0,
+        },
+        "settings": {"k": "v"},
+    }
+    (tmp_path / "state.json").write_text(json.dumps(legacy))
+
+    state = StateManager(str(tmp_path / STATE_FILES[backend]), backend=backend)
+
+    assert state.get_company_state("Acme") == legacy["companies"]["Acme"]
+    assert state.get_stats() == legacy["stats"]
+    assert state.get_setting("k") == "v"
+    assert not os.path.exists(tmp_path / "state.json")
+    assert os.path.exists(tmp_path / "state.json.migrated")
+
+
+def test_failed_migration_keeps_legacy_json(tmp_path, monkeypatch):
+    legacy = {
+        "companies": {"Acme": {"status": "Applied", "interactions": [{"type": "call"}]}}
+    }
+    (tmp_path / "state.json").write_text(json.dumps(legacy))
+
+    def fail(self, state, change):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(SQLiteStateBackend, "_apply", fail)
+        backend = SQLiteStateBackend(
+            str(tmp_path / "state.db"), str(tmp_path / "state.json")
+        )
+        assert backend.load() is None
+        backend.close()
+    assert os.path.exists(tmp_path / "state.json")
+    assert not os.path.exists(tmp_path / "state.json.migrated")
+
+    # The next load retries the migration
+    state = StateManager(str(tmp_path / "state.db"), backend="sqlite")
+    assert state.get_company_state("Acme") == legacy["companies"]["Acme"]
+    assert os.path.exists(tmp_path / "state.json.migrated")
+
+
+def test_event_log_compacts_and_replays_tail(tmp_path):
+    path = str(tmp_path / "state.log")
+    state = StateManager(path, backend=EventLogStateBackend(path, compact_every=10))
+    for i in range(12):
+        state.update_company_state(
+            "Acme",
+            {
+                "last_interaction": "email",
+                "last_interaction_date": f"2025-01-{i + 1:02d}",
+            },
+        )
+    state.update_company_state("Acme", {"status": "Applied"})
+    state.update_company_state("Acme", {"status": "Interview"})
+    state.update_stats({"offers_received": 7})
+    state.close()
+
+    backend = EventLogStateBackend(path, compact_every=10)
+    reloaded = StateManager(path, backend=backend)
+    assert backend.snapshot_seq > 0 and backend.seq - backend.snapshot_seq < 10
+    assert len(reloaded.get_company_state("Acme")["interactions"]) == 12
+    assert reloaded.get_stats() == {**state.get_stats(), "offers_received": 7}
+    assert reloaded.get_stats()["interviews_scheduled"] == 1
+
+
+def test_event_log_ignores_torn_tail(tmp_path):
+    path = str(tmp_path / "state.log")
+    state = StateManager(path, backend="eventlog")
+    state.update_company_state("Acme", {"status": "Applied"})
+    state.close()
+    with open(path, "a") as f:
+        f.write('{"seq": 99, "op": "compa')
+
+    state = StateManager(path, backend="eventlog")
+    assert state.get_company_state("Acme")["status"] == "Applied"
+    state.update_company_state("Globex", {"status": "Applied"})
+    state.close()
+    assert sorted(StateManager(path, backend="eventlog").get_all_companies()) == [
+        "Acme",
+        "Globex",
+    ]
+
+
+def test_event_log_skips_corrupt_middle_line(tmp_path):
+    path = str(tmp_path / "state.log")
+    state = StateManager(path, backend="eventlog")
+    state.update_company_state("Acme", {"status": "Applied"})
+    state.update_company_state("Globex", {"status": "Applied"})
+    state.close()
+    with open(path) as f:
+        lines = f.readlines()
+    # Damage a line in the middle of the log
+    lines.insert(len(lines) // 2, '{"seq": 50, "op": "compa\n')
+    with open(path, "w") as f:
+        f.writelines(lines)
+    size = os.path.getsize(path)
+
+    # The events after the corrupt line still apply, and nothing is truncated
+    reloaded = StateManager(path, backend="eventlog")
+    assert sorted(reloaded.get_all_companies()) == ["Acme", "Globex"]
+    assert os.path.getsize(path) == size
+
+
+def test_write_behind_coalesces_writes(tmp_path):
+    path = str(tmp_path / "state.json")
+    state = StateManager(path, backend="json", flush_threshold=10)
+    for i in range(25):
+        state.update_company_state(f"Company {i}", {"status": "Applied"})
+
+    assert state.get_write_stats() == {
+        "writes": 25,
+        "flushes": 2,
+        "coalesced_writes": 18,
+        "merges": 0,
+        "pending": 5,
+    }
+    assert len(StateManager(path, backend="json").get_all_companies()) == 20
+
+    state.close()
+    assert len(StateManager(path, backend="json").get_all_companies()) == 25
+
+
+def test_write_behind_flushes_on_interval(tmp_path):
+    path = str(tmp_path / "state.db")
+    state = StateManager(path, backend="sqlite", flush_interval=0.05)
+    state.update_company_state("Acme", {"status": "Applied"})
+    state.update_company_state(
+        "Acme", {"last_interaction": "call", "last_interaction_date": "2025-01-01"}
+    )
+    assert state.get_write_stats()["pending"] == 2
+
+    time.sleep(0.3)
+    assert state.get_write_stats()["pending"] == 0
+    assert StateManager(path, backend="sqlite").get_company_state("Acme")[
+        "interactions"
+    ] == [{"type": "call", "date": "2025-01-01"}]
+    state.close()
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "eventlog"])
+def test_failed_save_is_retried(tmp_path, monkeypatch, backend):
+    path = str(tmp_path / STATE_FILES[backend])
+    state = StateManager(path, backend=backend)
+    state.update_company_state("Acme", {"status": "Applied"})
+
+    with monkeypatch.context() as m:
+        m.setattr(state.backend, "save", lambda state, changes: False)
+        state.update_company_state("Globex", {"status": "Applied"})
+    assert state.get_write_stats()["flushes"] == 1
+    assert state.get_write_stats()["pending"] == 1
+    version = state.version
+
+    # The next write saves the failed change along with its own
+    state.update_company_state("Initech", {"status": "Applied"})
+    assert state.get_write_stats()["pending"] == 0
+    assert state.get_write_stats()["flushes"] == 2
+    assert state.version == version + 1
+    state.close()
+
+    reloaded = StateManager(path, backend=backend)
+    assert sorted(reloaded.get_all_companies()) == ["Acme", "Globex", "Initech"]
+    assert reloaded.get_stats()["applications_sent"] == 3
+
+
+def test_reads_return_snapshots(tmp_path):
+    state = StateManager(str(tmp_path / "state.json"), backend="json")
+    state.update_company_state(
+        "Acme", {"last_interaction": "email", "last_interaction_date": "2025-01-01"}
+    )
+    before = state.get_company_state("Acme")
+    companies_before = state.get_all_companies()
+
+    state.update_company_state(
+        "Acme", {"last_interaction": "call", "last_interaction_date": "2025-01-02"}
+    )
+    state.update_company_state("Globex", {"status": "Applied"})
+
+    assert len(before["interactions"]) == 1
+    assert list(companies_before) == ["Acme"]
+    assert len(state.get_company_state("Acme")["interactions"]) == 2
+
+
+def test_async_updates_are_serialized(tmp_path):
+    path = str(tmp_path / "state.db")
+
+    async def run():
+        state = StateManager(path, backend="sqlite")
+        await asyncio.gather(
+            *(
+                state.aupdate_company_state(
+                    f"Company {i % 5}",
+                    {
+                        "last_interaction": "email",
+                        "last_interaction_date": f"2025-01-{i + 1:02d}",
+                    },
+                )
+                for i in range(20)
+            )
+        )
+        await state.aupdate_company_state("Company 0", {"status": "Applied"})
+        await state.aupdate_setting("k", 1)
+        assert (await state.aget_stats())["applications_sent"] == 1
+        await state.aclose()
+
+    asyncio.run(run())
+
+    reloaded = StateManager(path, backend="sqlite")
+    companies = reloaded.get_all_companies()
+    assert sorted(companies) == [f"Company {i}" for i in range(5)]
+    assert all(len(company["interactions"]) == 4 for company in companies.values())
+    assert reloaded.get_setting("k") == 1
+
+
+def test_reads_return_independent_copies(tmp_path):
+    state = StateManager(str(tmp_path / "state.json"), backend="json")
+    state.update_company_state(
+        "Acme", {"last_interaction": "email", "last_interaction_date": "2025-01-01"}
+    )
+
+    company = state.get_company_state("Acme")
+    company["interactions"].append({"type": "call"})
+    state.get_all_companies()["Acme"]["interactions"].clear()
+    assert len(state.get_company_state("Acme")["interactions"]) == 1
+
+    # Updating an existing company swaps its entry, not the whole mapping
+    companies = state.state["companies"]
+    state.update_company_state("Acme", {"status": "Applied"})
+    assert state.state["companies"] is companies
+    state.update_company_state("Globex", {"status": "Applied"})
+    assert state.state["companies"] is not companies and "Globex" not in companies
+
+
+def test_query_indexes(tmp_path):
+    path = str(tmp_path / "state.json")
+    today = datetime.now().date()
+    state = StateManager(path, backend="json")
+    state.update_company_state(
+        "Acme",
+        {
+            "last_interaction": "email",
+            "last_interaction_date": str(today - timedelta(days=40)),
+        },
+    )
+    state.update_company_state("Acme", {"status": "Applied"})
+    state.update_company_state(
+        "Globex",
+        {
+            "last_interaction": "call",
+            "last_interaction_date": str(today - timedelta(days=2)),
+        },
+    )
+    state.update_company_state("Globex", {"status": "Interview"})
+    state.update_company_state("Initech", {"status": "Applied"})
+    state.update_company_state(
+        "Umbrella",
+        {
+            "last_interaction": "email",
+            "last_interaction_date": str(today - timedelta(days=60)),
+        },
+    )
+
+    def check(manager):
+        assert manager.companies_by_status("Applied") == ["Acme", "Initech"]
+        assert manager.companies_by_status("Interview") == ["Globex"]
+        assert manager.companies_by_interaction_type("email") == ["Acme", "Umbrella"]
+        assert manager.companies_without_contact_since(30) == [
+            "Umbrella",
+            "Acme",
+            "Initech",
+        ]
+        assert manager.companies_without_contact_since(30, include_never=False) == [
+            "Umbrella",
+            "Acme",
+        ]
+        assert [(i["company"], i["type"]) for i in manager.recent_interactions(2)] == [
+            ("Globex", "call"),
+            ("Acme", "email"),
+        ]
+
+    check(state)
+    state.close()
+    state = StateManager(path, backend="json")
+    check(state)
+
+    # Contact moves a company out of the stale range
+    state.update_company_state(
+        "Umbrella", {"last_interaction": "call", "last_interaction_date": str(today)}
+    )
+    assert state.companies_without_contact_since(30, include_never=False) == ["Acme"]
+    assert state.recent_interactions(1)[0]["company"] == "Umbrella"
+
+    state.clear_state()
+    assert state.companies_by_status("Applied") == []
+    assert state.recent_interactions(5) == []
+
+
+def test_incremental_indexes_match_a_rebuild(tmp_path):
+    state = StateManager(
+        str(tmp_path / "state.json"), backend="json", max_interactions=3
+    )
+    state.companies_by_status("Applied")
+    for i in range(60):
+        # Repeated dates, so dropped interactions share their sort keys
+        state.update_company_state(
+            f"Company {i % 7}",
+            {
+                "last_interaction": f"type {i % 3}",
+                "last_interaction_date": f"2025-01-{i % 5 + 1:02d}",
+            },
+        )
+
+    rebuilt = StateIndexes()
+    rebuilt.rebuild(state.get_all_companies())
+
+    def entries(indexes):
+        # Interactions on the same date may come in either order
+        return sorted(
+            tuple(sorted(i.items())) for i in indexes.recent_interactions(100)
+        )
+
+    assert entries(state.indexes) == entries(rebuilt)
+    assert len(entries(state.indexes)) == 21
+    assert state.indexes.companies_without_contact_since(
+        0
+    ) == rebuilt.companies_without_contact_since(0)
+
+
+def test_index_build_racing_an_update_is_redone(tmp_path, monkeypatch):
+    path = str(tmp_path / "state.json")
+    writer = StateManager(path, backend="json")
+    for name in ("Acme", "Globex"):
+        writer.update_company_state(name, {"status": "Applied"})
+    state = StateManager(path, backend="json")
+    assert state.indexes.stale
+
+    # The build pauses after reading Acme while a writer updates it in place
+    reading, updated = threading.Event(), threading.Event()
+    date_key = state_index.date_key
+
+    def paused_date_key(value):
+        if threading.current_thread().name == "query" and not reading.is_set():
+            reading.set()
+            updated.wait(5)
+        return date_key(value)
+
+    monkeypatch.setattr(state_index, "date_key", paused_date_key)
+    query = threading.Thread(
+        target=state.companies_by_status, args=("Applied",), name="query"
+    )
+    query.start()
+    assert reading.wait(5)
+    state.update_company_state("Acme", {"status": "Interview"})
+    updated.set()
+    query.join()
+
+    assert state.indexes.stale
+    assert state.companies_by_status("Interview") == ["Acme"]
+    assert state.companies_by_status("Applied") == ["Globex"]
+
+
+def test_concurrent_managers_merge(state_path):
+    backend, path = state_path
+    first = StateManager(path, backend=backend)
+    second = StateManager(path, backend=backend)
+
+    first.update_company_state(
+        "Acme", {"last_interaction": "email", "last_interaction_date": "2025-01-01"}
+    )
+    first.update_company_state("Acme", {"status": "Applied"})
+    second.update_company_state(
+        "Acme", {"last_interaction": "call", "last_interaction_date": "2025-01-02"}
+    )
+    second.update_company_state("Globex", {"status": "Applied"})
+    second.update_setting("k", 2)
+    first.update_setting("j", 1)
+
+    assert first.get_write_stats()["merges"] == 1
+    assert second.get_write_stats()["merges"] == 1
+    first.close()
+    second.close()
+
+    reloaded = StateManager(path, backend=backend)
+    assert sorted(reloaded.get_all_companies()) == ["Acme", "Globex"]
+    assert reloaded.get_company_state("Acme")["status"] == "Applied"
+    assert [i["type"] for i in reloaded.get_company_state("Acme")["interactions"]] == [
+        "email",
+        "call",
+    ]
+    assert reloaded.get_stats()["applications_sent"] == 2
+    assert reloaded.get_setting("j") == 1 and reloaded.get_setting("k") == 2
+
+
+def test_unchanged_version_file_is_not_reread(tmp_path, monkeypatch):
+    path = str(tmp_path / "state.json")
+    state = StateManager(path, backend="json")
+    state.update_company_state("Acme", {"status": "Applied"})
+
+    reads = []
+    real_open = open
+
+    def tracking_open(file, mode="r", *args, **kwargs):
+        if str(file).endswith(".version") and "r" in mode:
+            reads.append(file)
+        return real_open(file, mode, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    state.update_company_state("Acme", {"status": "Interview"})
+    assert reads == []
+
+    other = StateManager(path, backend="json")
+    other.update_company_state("Globex", {"status": "Applied"})
+    reads.clear()
+    state.update_company_state("Acme", {"status": "Offer"})
+    assert len(reads) == 1
+    assert state.get_write_stats()["merges"] == 1
+    other.close()
+    state.close()
+
+
+def test_refresh_picks_up_other_writers(tmp_path):
+    path = str(tmp_path / "state.json")
+    reader = StateManager(path, backend="json")
+    writer = StateManager(path, backend="json")
+    assert not reader.refresh()
+
+    writer.update_company_state("Acme", {"status": "Interview"})
+    assert reader.refresh()
+    assert reader.companies_by_status("Interview") == ["Acme"]
+
+
+def test_interaction_history_is_bounded_and_archived(state_path):
+    backend, path = state_path
+    state = StateManager(path, backend=backend, max_interactions=3)
+    for day in range(1, 11):
+        state.update_company_state(
+            "Acme",
+            {
+                "last_interaction": "email",
+                "last_interaction_date": f"2025-01-{day:02d}",
+            },
+        )
+
+    company = state.get_company_state("Acme")
+    assert [i["date"] for i in company["interactions"]] == [
+        "2025-01-08",
+        "2025-01-09",
+        "2025-01-10",
+    ]
+    assert company["archived_interactions"] == 7
+    assert [i["date"] for i in state.recent_interactions(10)] == [
+        "2025-01-10",
+        "2025-01-09",
+        "2025-01-08",
+    ]
+    state.close()
+
+    reloaded = StateManager(path, backend=backend, max_interactions=3)
+    assert len(reloaded.get_company_state("Acme")["interactions"]) == 3
+    pages = list(reloaded.iter_interactions("Acme", page_size=4))
+    assert [len(page) for page in pages] == [4, 4, 2]
+    assert [i["date"] for page in pages for i in page] == [
+        f"2025-01-{day:02d}" for day in range(1, 11)
+    ]
+
+    reloaded.clear_state()
+    assert list(reloaded.iter_interactions("Acme")) == []
+
+
+def test_archive_is_written_under_the_file_lock(tmp_path):
+    path = str(tmp_path / "state.json")
+    state = StateManager(path, backend="json", max_interactions=1)
+    saves = []
+    append = state.archive.append
+
+    def checked_append(*args):
+        saves.append(state.file_lock._depth)
+        append(*args)
+
+    state.archive.append = checked_append
+    for day in (1, 2, 3):
+        state.update_company_state(
+            "Acme",
+            {
+                "last_interaction": "email",
+                "last_interaction_date": f"2025-01-{day:02d}",
+            },
+        )
+    assert saves == [1, 1]
+    state.close()
+
+
+def test_company_spellings_share_one_record(state_path):
+    backend, path = state_path
+    state = StateManager(path, backend=backend)
+    state.update_company_state(
+        "Acme", {"last_interaction": "email", "last_interaction_date": "2025-01-01"}
+    )
+    state.update_company_state("ACME, Inc.", {"status": "Applied"})
+    state.add_company_alias("Roadrunner Labs", "acme")
+    state.update_company_state(
+        "Roadrunner Labs",
+        {"last_interaction": "call", "last_interaction_date": "2025-01-02"},
+    )
+
+    assert list(state.get_all_companies()) == ["Acme"]
+    assert state.resolve_company("acme corp") == "Acme"
+    assert state.get_company_state("ACME")["status"] == "Applied"
+    state.close()
+
+    reloaded = StateManager(path, backend=backend)
+    assert reloaded.resolve_company("Roadrunner Labs") == "Acme"
+    assert [i["type"] for i in reloaded.get_company_state("acme")["interactions"]] == [
+        "email",
+        "call",
+    ]
+
+
+def test_duplicate_records_merge_only_on_request(state_path):
+    backend, path = state_path
+    legacy = {
+        "companies": {
+            "Acme": {
+                "created_at": "2025-01-01",
+                "status": "Applied",
+                "interactions": [{"type": "email", "date": "2025-01-03"}],
+            },
+            "ACME Inc": {
+                "created_at": "2025-01-02",
+                "status": "Applied",
+                "last_interaction_date": "2025-01-04",
+                "last_interaction": "call",
+                "interactions": [{"type": "call", "date": "2025-01-04"}],
+            },
+            "Acme Group": {
+                "created_at": "2025-01-02",
+                "status": "Interview",
+                "interactions": [],
+            },
+        },
+        "stats": {
+            "applications_sent": 3,
+            "interviews_scheduled": 1,
+            "offers_received": 0,
+            "rejections": 0,
+        },
+    }
+    (Path(path).parent / "state.json").write_text(json.dumps(legacy))
+
+    state = StateManager(path, backend=backend)
+    assert sorted(state.get_all_companies()) == ["ACME Inc", "Acme", "Acme Group"]
+    assert state.resolve_company("Acme Group") == "Acme Group"
+
+    state.merge_companies("ACME Inc", "Acme")
+    company = state.get_company_state("Acme")
+    assert sorted(state.get_all_companies()) == ["Acme", "Acme Group"]
+    assert company["status"] == "Applied" and company["last_interaction"] == "call"
+    assert [i["date"] for i in company["interactions"]] == ["2025-01-03", "2025-01-04"]
+    # Both records counted the application
+    assert state.get_stats()["applications_sent"] == 2
+    assert state.resolve_company("ACME Inc") == "Acme"
+    state.close()
+
+    reloaded = StateManager(path, backend=backend)
+    assert reloaded.get_all_companies() == state.get_all_companies()
+    assert reloaded.get_stats() == state.get_stats()
+
+
+def test_merge_interleaves_archived_interactions(state_path):
+    backend, path = state_path
+    state = StateManager(path, backend=backend, max_interactions=2)
+    for company, days in (("Acme", (1, 3, 5, 7)), ("Roadrunner", (2, 4, 6, 8))):
+        for day in days:
+            state.update_company_state(
+                company,
+                {
+                    "last_interaction": "email",
+                    "last_interaction_date": f"2025-01-{day:02d}",
+                },
+            )
+
+    state.merge_companies("Roadrunner", "Acme")
+    dates = [f"2025-01-{day:02d}" for day in range(1, 9)]
+    company = state.get_company_state("Acme")
+    assert [i["date"] for i in company["interactions"]] == dates[-2:]
+    assert [
+        i["date"] for page in state.iter_interactions("Acme") for i in page
+    ] == dates
+    state.close()
+
+    reloaded = StateManager(path, backend=backend, max_interactions=2)
+    assert [
+        i["date"] for page in reloaded.iter_interactions("roadrunner") for i in page
+    ] == dates
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "eventlog"])
+def test_lazy_load_decodes_companies_on_access(tmp_path, backend):
+    path = str(tmp_path / STATE_FILES[backend])
+    kwargs = {"compact_every": 5} if backend == "eventlog" else {}
+    backend_class = (
+        EventLogStateBackend if backend == "eventlog" else SQLiteStateBackend
+    )
+    state = StateManager(path, backend=backend_class(path, **kwargs))
+    for i in range(20):
+        state.update_company_state(
+            f"Company {i}",
+            {"last_interaction": "email", "last_interaction_date": "2025-01-01"},
+        )
+    state.update_company_state("Company 3", {"status": "Applied"})
+    state.close()
+
+    reloaded = StateManager(path, backend=backend_class(path, lazy=True, **kwargs))
+    companies = reloaded.state["companies"]
+    assert isinstance(companies, LazyCompanies)
+    assert reloaded.get_company_state("company 3")["status"] == "Applied"
+    assert companies.decoded_count() < 20
+
+    assert reloaded.companies_by_status("Applied") == ["Company 3"]
+    assert len(reloaded.get_all_companies()) == 20
+
+
+def test_codec_without_orjson(tmp_path, monkeypatch):
+    monkeypatch.setattr(state_codec, "orjson", None)
+    path = str(tmp_path / "state.json")
+    state = StateManager(path, backend="json")
+    state.update_company_state("Acme", {"status": "Applied", "notes": "café"})
+    state.close()
+
+    assert "\n" not in (tmp_path / "state.json").read_text()
+    assert (
+        StateManager(path, backend="json").get_company_state("Acme")["notes"] == "café"
+    )
@@ -0,0 +1,43 @@
+from job_tracker.tool_cache import ToolSchemaCache
+
+TOOLS = [
+    {
+        "name": "notion_search",
+        "description": "Search",
+        "input_schema": {"type": "object"},
+    }
+]
+
+
+def test_entries_persist_across_instances(tmp_path):
+    key = ToolSchemaCache.make_key("node", ["index.js"], "notion", "1.0.0")
+    ToolSchemaCache(str(tmp_path)).put(key, TOOLS)
+
+    assert ToolSchemaCache(str(tmp_path)).get(key) == TOOLS
+
+
+def test_key_changes_with_server_version():
+    old = ToolSchemaCache.make_key("node", ["index.js"], "notion", "1.0.0")
+    new = ToolSchemaCache.make_key("node", ["index.js"], "notion", "1.1.0")
+
+    assert old != new
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = ToolSchemaCache(str(tmp_path), ttl=0)
+    cache.put("key", TOOLS)
+
+    assert cache.get("key") is None
+
+
+def test_invalidate(tmp_path):
+    cache = ToolSchemaCache(str(tmp_path))
+    cache.put("a", TOOLS)
+    cache.put("b", TOOLS)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == TOOLS
+
+    cache.invalidate()
+    assert ToolSchemaCache(str(tmp_path)).get("b") is None
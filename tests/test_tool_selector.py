@@ -0,0 +1,57 @@
+from job_tracker.tool_selector import ToolSelector, cosine, embed
+
+NOTION_TOOLS = [
+    {"name": name, "description": description, "input_schema": {"type": "object"}}
+    for name, description in [
+        (
+            "notion_append_block_children",
+            "Append new children blocks to a specified parent block",
+        ),
+        ("notion_retrieve_block", "Retrieve a block from Notion"),
+        ("notion_retrieve_block_children", "Retrieve the children of a block"),
+        ("notion_delete_block", "Delete a block in Notion"),
+        ("notion_retrieve_page", "Retrieve a page from Notion"),
+        (
+            "notion_update_page_properties",
+            "Update properties of a page or an item in a database",
+        ),
+        ("notion_list_all_users", "List all users in the Notion workspace"),
+        ("notion_create_database", "Create a database in Notion"),
+        ("notion_query_database", "Query a database in Notion"),
+        ("notion_create_comment", "Create a comment in Notion"),
+        ("notion_search", "Search pages or databases by title"),
+    ]
+]
+
+
+def test_embedding_similarity():
+    assert (
+        cosine(
+            embed("retrieve block children"), embed("retrieve the children of a block")
+        )
+        > 0.5
+    )
+    assert cosine(embed("retrieve block children"), embed("list workspace users")) < 0.2
+
+
+def test_select_returns_top_k_most_relevant():
+    selector = ToolSelector()
+
+    selected = selector.select("create a comment on the page", NOTION_TOOLS, top_k=3)
+
+    assert len(selected) == 3
+    assert selected[0]["name"] == "notion_create_comment"
+
+
+def test_rules_boost_matching_tools():
+    selector = ToolSelector([(r"\bnotes?\b", ("notion_append_block_children",), 1.0)])
+
+    selected = selector.select("Add these call notes", NOTION_TOOLS, top_k=1)
+
+    assert [tool["name"] for tool in selected] == ["notion_append_block_children"]
+
+
+def test_small_tool_lists_are_returned_unchanged():
+    assert (
+        ToolSelector().select("anything", NOTION_TOOLS[:2], top_k=5) == NOTION_TOOLS[:2]
+    )